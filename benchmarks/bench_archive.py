@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark e conferência do arquivo de páginas (config/archive.py)
+
+Grava páginas sintéticas em um arquivo temporário, primeiro sem dicionário e
+depois com o dicionário treinado nelas, e mede a taxa de compactação de cada
+fase, o tempo de gravação e o de leitura aleatória por URL (mmap +
+descompactação de um único registro). Confere se toda página lida é idêntica
+à gravada e se a busca por data devolve a versão certa. Por fim, vários
+processos gravam ao mesmo tempo no mesmo diretório (como --worker com
+--archive) e todos os registros precisam ser lidos de volta intactos.
+
+Sai com código 1 se alguma página divergir.
+
+Uso:
+    python benchmarks/bench_archive.py
+    python benchmarks/bench_archive.py --pages 500 --products 120
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.archive import PageArchive, zstandard
+from synthetic_pages import FORMATOS, gerar_pagina
+
+def gravar_em_paralelo(pasta: str, processo: int, paginas) -> None:
+    """Um dos processos gravadores concorrentes"""
+    arquivo = PageArchive(pasta)
+    arquivo.enable()
+    for url, html in paginas:
+        arquivo.add(f"{url}?p={processo}", html)
+
+def conferir_processos(pasta: str, paginas, processos: int) -> list:
+    """Divergências após `processos` processos gravarem as páginas no mesmo diretório"""
+    gravadores = [multiprocessing.Process(target=gravar_em_paralelo, args=(pasta, i, paginas))
+                  for i in range(processos)]
+    for gravador in gravadores:
+        gravador.start()
+    for gravador in gravadores:
+        gravador.join()
+    leitor = PageArchive(pasta)
+    erros = []
+    for i in range(processos):
+        for url, html in paginas:
+            registro = leitor.get(f"{url}?p={i}")
+            try:
+                lido = leitor.read(registro) if registro else None
+            except Exception as e:
+                lido = f"erro: {e}"
+            if lido != html:
+                erros.append(f"{url}?p={i}: registro gravado em paralelo lido corrompido")
+    leitor.close()
+    return erros
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200, help='Páginas gravadas em cada fase')
+    parser.add_argument('--products', type=int, default=20, help='Produtos relacionados por página sintética')
+    parser.add_argument('--reads', type=int, default=1000, help='Leituras aleatórias medidas')
+    parser.add_argument('--processes', type=int, default=4, help='Processos gravando ao mesmo tempo')
+    args = parser.parse_args()
+
+    paginas = [(f"https://www.corpoevidasuplementos.com.br/produto-{i}",
+                gerar_pagina(1 + i % 4, FORMATOS[i % len(FORMATOS)], args.products, i)[0])
+               for i in range(args.pages)]
+    bruto = sum(len(html.encode('utf-8')) for _, html in paginas)
+    pasta = tempfile.mkdtemp(prefix='bench_archive_')
+    erros = []
+    try:
+        arquivo = PageArchive(pasta)
+        arquivo.enable()
+        print(f"{'='*80}")
+        print(f">>> {len(paginas)} páginas ({bruto / 1024:.0f} KB), codec {'zstd' if zstandard else 'deflate'}")
+        print('='*80)
+        print(f"  {'fase':<16}{'KB gravados':>13}{'taxa':>8}{'ms/página':>11}")
+        for fase, instante in (('sem dicionário', 1000.0), ('com dicionário', 2000.0)):
+            if instante == 2000.0:
+                arquivo.train_dictionary()
+            inicio = time.perf_counter()
+            registros = [arquivo.add(url, html, timestamp=instante) for url, html in paginas]
+            ms = (time.perf_counter() - inicio) / len(paginas) * 1000
+            gravados = sum(registro.length for registro in registros)
+            print(f"  {fase:<16}{gravados / 1024:>13.0f}{bruto / gravados:>7.1f}x{ms:>11.2f}")
+
+        leitor = PageArchive(pasta)
+        for url, html in paginas:
+            if leitor.read(leitor.get(url)) != html or leitor.read(leitor.get(url, at=1500.0)) != html:
+                erros.append(f"{url}: página lida difere da gravada")
+            if leitor.get(url, at=1500.0).timestamp != 1000.0 or leitor.get(url, at=500.0) is not None:
+                erros.append(f"{url}: busca por data devolveu a versão errada")
+        sorteio = random.Random(0)
+        urls = [sorteio.choice(paginas)[0] for _ in range(args.reads)]
+        inicio = time.perf_counter()
+        for url in urls:
+            leitor.read(leitor.get(url))
+        us = (time.perf_counter() - inicio) / len(urls) * 1e6
+        print(f"\n  Leitura aleatória por URL: {us:.0f} µs/página")
+        leitor.close()
+
+        paralelo = os.path.join(pasta, 'paralelo')
+        erros_paralelo = conferir_processos(paralelo, paginas, args.processes)
+        print(f"  {args.processes} processos x {len(paginas)} páginas no mesmo diretório: "
+              f"{len(erros_paralelo)} registros corrompidos")
+        erros += erros_paralelo
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    if erros:
+        print("\n❌ Divergências:")
+        for mensagem in erros[:20]:
+            print(f"   • {mensagem}")
+        sys.exit(1)
+    print("\n✅ Todas as páginas lidas conferem com as gravadas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bytes transferidos por página com e sem perfil persistente do navegador
+
+Sobe a loja simulada com JS e CSS estáticos cacheáveis e abre N páginas de
+produto com fetch_product_html (um driver por página, como na coleta), uma
+vez com perfis descartáveis e outra com o pool de perfis persistentes
+(config.profiles) em uma pasta temporária. Para cada página mostra os bytes
+transferidos pela rede e os recursos servidos pelo cache (Resource Timing),
+e o total de requisições de recursos estáticos recebidas pela loja.
+
+Com o perfil persistente, a partir da segunda página os estáticos devem vir
+do cache; o script sai com código 1 se isso não acontecer. Requer Chrome ou
+Firefox instalado.
+
+Uso:
+    python benchmarks/bench_browser_cache.py
+    python benchmarks/bench_browser_cache.py --pages 10 --static-kb 500
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import metrics, scraper
+from config.profiles import profiles
+from mock_storefront import MockStorefront, StorefrontConfig, slug_produto
+
+def abrir_paginas(urls):
+    """(bytes pela rede, recursos do cache) de cada página"""
+    resultados = []
+    for url in urls:
+        bytes_antes = metrics.TRANSFER_BYTES.value(kind='product')
+        cache_antes = metrics.CACHE_HITS.value()
+        scraper.fetch_product_html(url)
+        resultados.append((metrics.TRANSFER_BYTES.value(kind='product') - bytes_antes,
+                           metrics.CACHE_HITS.value() - cache_antes))
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=5, help='Páginas de produto abertas em cada modo')
+    parser.add_argument('--static-kb', type=int, default=300, help='Tamanho do JS e do CSS estáticos')
+    args = parser.parse_args()
+
+    scraper.console.quiet = True
+    pasta = tempfile.mkdtemp(prefix='bench_browser_cache_')
+    erros = []
+    try:
+        with MockStorefront(StorefrontConfig(catalog=args.pages, page_kb=40, static_kb=args.static_kb)) as loja:
+            urls = [f"{loja.base_url}/{slug_produto(i)}" for i in range(args.pages)]
+            print(f"{'='*80}")
+            print(f">>> {args.pages} páginas, JS + CSS de {args.static_kb} KB cada")
+            print('='*80)
+            for modo in ('perfil descartável', 'perfil persistente'):
+                if modo == 'perfil persistente':
+                    profiles.enable(os.path.join(pasta, 'browser_profile'))
+                estaticos_antes = loja.contadores.get('static', 0)
+                try:
+                    resultados = abrir_paginas(urls)
+                except Exception as e:
+                    sys.exit(f"❌ Não foi possível abrir o navegador: {e}")
+                estaticos = loja.contadores.get('static', 0) - estaticos_antes
+                por_pagina = ' '.join(f"{b / 1024:.0f}" for b, _ in resultados)
+                print(f"  {modo:<20} KB/página: {por_pagina}")
+                print(f"  {'':<20} recursos do cache: {sum(c for _, c in resultados)}, "
+                      f"requisições de estáticos: {estaticos}")
+                if modo == 'perfil persistente' and len(resultados) > 1:
+                    seguintes = statistics.mean(b for b, _ in resultados[1:])
+                    if estaticos > 2 or seguintes >= resultados[0][0]:
+                        erros.append(f"com perfil persistente: {estaticos} requisições de estáticos, "
+                                     f"{seguintes / 1024:.0f} KB/página após a primeira")
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    if erros:
+        print("\n❌ Divergências:")
+        for mensagem in erros:
+            print(f"   • {mensagem}")
+        sys.exit(1)
+    print("\n✅ Com o perfil persistente os estáticos vêm do cache após a primeira página")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark e conferência do relatório de mudanças (config/diff.py)
+
+Replica dados/produtos.csv até N linhas (nomes distintos por cópia), gera uma
+"nova coleta" com produtos removidos, incluídos e valores alterados em
+posições conhecidas e confere se diff_snapshots encontra exatamente essas
+mudanças, medindo o tempo de cada comparação. Confere também o caso da coleta
+real: o CSV novo ainda traz os removidos (save_incremental não apaga linhas)
+e eles só aparecem no relatório pela lista de URLs da coleta.
+
+Sai com código 1 se o relatório divergir do esperado.
+
+Uso:
+    python benchmarks/bench_diff.py
+    python benchmarks/bench_diff.py --rows 1000,20000,100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+
+import numpy as np
+import pandas as pd
+
+from config.diff import COLUNAS_COMPARADAS, diff_snapshots, summarize
+
+def snapshots(base: pd.DataFrame, linhas: int, seed: int):
+    """(antigo, novo, linhas removidas, mudanças esperadas {'added', 'removed', 'values_changed'})"""
+    copias = -(-linhas // len(base))
+    antigo = pd.concat([base.assign(NOME_PRODUTO=base['NOME_PRODUTO'] + f' #{i}') for i in range(copias)],
+                       ignore_index=True).iloc[:linhas]
+    # Uma página por linha, para a lista de URLs da coleta identificar cada removido
+    antigo = antigo.assign(URL=[f"https://loja.exemplo/produto-{k}?sabor=unico" for k in range(len(antigo))])
+    rng = np.random.default_rng(seed)
+    n = max(1, linhas // 100)
+    removidos = rng.choice(len(antigo), n, replace=False)
+    novo = antigo.drop(index=removidos)
+    incluidos = antigo.iloc[:n].assign(NOME_PRODUTO=lambda d: d['NOME_PRODUTO'] + ' (novo)',
+                                       URL=lambda d: d['URL'].str.replace('produto-', 'novo-'))
+    novo = pd.concat([novo, incluidos], ignore_index=True)
+    colunas = [c for c in COLUNAS_COMPARADAS if c in novo.columns]
+    novo[colunas] = novo[colunas].astype(float)
+    alterados = rng.choice(len(novo) - n, n, replace=False)
+    for posicao, coluna in zip(alterados, rng.choice(colunas, n)):
+        indice = novo.columns.get_loc(coluna)
+        novo.iat[posicao, indice] = np.nan_to_num(novo.iat[posicao, indice]) + 1.5
+    return antigo, novo, antigo.iloc[removidos], {'added': n, 'removed': n, 'values_changed': n}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.path.join(RAIZ, 'dados', 'produtos.csv'))
+    parser.add_argument('--rows', default='1000,20000,50000', help='Linhas de cada coleta comparada')
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.csv)
+    erros = []
+    print(f"  {'linhas':>8}{'incluídos':>11}{'removidos':>11}{'valores':>9}{'ms':>9}")
+    for seed, linhas in enumerate(int(n) for n in args.rows.split(',')):
+        antigo, novo, removidos, esperado = snapshots(base, linhas, seed)
+        inicio = time.perf_counter()
+        relatorio = diff_snapshots(antigo, novo)
+        ms = (time.perf_counter() - inicio) * 1000
+        resumo = summarize(relatorio)
+        for chave, valor in esperado.items():
+            if resumo[chave] != valor:
+                erros.append(f"{linhas} linhas: {chave} = {resumo[chave]}, esperado {valor}")
+        acumulado = pd.concat([novo, removidos], ignore_index=True)
+        urls = novo['URL'].str.split('?', n=1).str[0]
+        pela_coleta = summarize(diff_snapshots(antigo, acumulado, urls=urls))
+        if pela_coleta != resumo:
+            erros.append(f"{linhas} linhas: com as URLs da coleta {pela_coleta}, esperado {resumo}")
+        print(f"  {linhas:>8}{resumo['added']:>11}{resumo['removed']:>11}{resumo['values_changed']:>9}{ms:>9.1f}")
+
+    if erros:
+        print("\n❌ Divergências:")
+        for mensagem in erros:
+            print(f"   • {mensagem}")
+        sys.exit(1)
+    print("\n✅ Todas as mudanças encontradas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark ponta a ponta contra a loja simulada (mock_storefront.py)
+
+Mede URLs/s na descoberta (páginas de busca) e páginas/s no scraping dos
+produtos para cada motor e nível de concorrência, sem acessar a loja real.
+
+Motores:
+    - http:     config.fetcher.fetch_html + config.scraper.extract_from_html
+    - selenium: config.url_collector.collect_product_urls e
+                config.scraper.extract_nutritional_info (requer navegador)
+
+Uso:
+    python benchmarks/bench_e2e.py --concurrency 1,4,16 --catalog 300 --latency-ms 50
+    python benchmarks/bench_e2e.py --engines http,selenium --concurrency 1,2 --limit 20
+    python benchmarks/bench_e2e.py --concurrency 4,auto --error-rate 0.05 --error-status 429 --retry-after 1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+from config import scraper
+from config.concurrency import AIMDController, run_adaptive
+from config.fetcher import fetch_html, raise_for_status
+from config.retry import Throttled
+from config.url_collector import SEARCH_KEYWORDS
+from mock_storefront import MockStorefront, StorefrontConfig
+
+def descobrir_http(base_url: str) -> List[str]:
+    """Percorre a busca paginada via HTTP, como collect_product_urls faz com o navegador"""
+    urls, pagina, tentativas = [], 1, 0
+    while True:
+        resposta = fetch_html(f"{base_url}/advanced_search_result.php?keywords={SEARCH_KEYWORDS}&page={pagina}")
+        if resposta.status != 200 and tentativas < 5:
+            tentativas += 1  # erro simulado: tenta a mesma página novamente
+            continue
+        tentativas = 0
+        links = BeautifulSoup(resposta.html, 'html.parser').select('a.produto')
+        if not links:
+            break
+        urls.extend(a['href'] for a in links if a.get('href', '').startswith(base_url))
+        pagina += 1
+    return list(dict.fromkeys(urls))
+
+def descobrir_selenium(base_url: str) -> List[str]:
+    from config.url_collector import collect_product_urls
+    with tempfile.TemporaryDirectory() as pasta:
+        saida = os.path.join(pasta, 'product_urls.json')
+        collect_product_urls(base_url, saida)
+        with open(saida, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+def scrape_http(url: str) -> bool:
+    resposta = fetch_html(url)
+    raise_for_status(resposta)
+    return scraper.extract_from_html(resposta.html, url) is not None
+
+def scrape_selenium(url: str) -> bool:
+    return scraper.extract_nutritional_info(url) is not None
+
+MOTORES = {
+    'http': (descobrir_http, scrape_http),
+    'selenium': (descobrir_selenium, scrape_selenium),
+}
+
+def medir_scraping(funcao, urls: List[str], concorrencia: str, maximo: int = 16) -> Dict[str, float]:
+    if concorrencia == 'auto':
+        return medir_adaptativo(funcao, urls, maximo)
+    concorrencia = int(concorrencia)
+    latencias, falhas = [], 0
+
+    def tarefa(url):
+        inicio = time.perf_counter()
+        try:
+            ok = funcao(url)
+        except Exception:
+            ok = False
+        return ok, (time.perf_counter() - inicio) * 1000
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        for ok, latencia in executor.map(tarefa, urls):
+            latencias.append(latencia)
+            falhas += 0 if ok else 1
+    total = time.perf_counter() - inicio
+    return {
+        'pages_per_s': len(urls) / total,
+        'p50_ms': statistics.median(latencias),
+        'falhas': falhas,
+    }
+
+def medir_adaptativo(funcao, urls: List[str], maximo: int) -> Dict[str, float]:
+    """Scraping com concorrência AIMD; URLs recusadas (429/5xx) voltam para o fim da fila"""
+    controller = AIMDController(initial=2, maximum=maximo)
+    pendentes, latencias, falhas, limites = list(urls), [], 0, []
+    def tarefa(url):
+        inicio = time.perf_counter()
+        return funcao(url), (time.perf_counter() - inicio) * 1000
+
+    inicio = time.perf_counter()
+    for _ in range(5):
+        recusadas = []
+        for url, resultado, erro in run_adaptive(tarefa, pendentes, controller):
+            limites.append(controller.limit)
+            if isinstance(erro, Throttled):
+                recusadas.append(url)
+                continue
+            if erro is not None or not resultado[0]:
+                falhas += 1
+            if resultado is not None:
+                latencias.append(resultado[1])
+        if not recusadas:
+            break
+        pendentes = recusadas
+    falhas += len(recusadas)
+    total = time.perf_counter() - inicio
+    return {
+        'pages_per_s': len(urls) / total,
+        'p50_ms': statistics.median(latencias) if latencias else 0.0,
+        'falhas': falhas,
+        'mean_limit': statistics.mean(limites) if limites else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--engines', default='http', help='Motores separados por vírgula (http,selenium)')
+    parser.add_argument('--concurrency', default='1,4,8,auto',
+                        help="Níveis de concorrência separados por vírgula ('auto' = controle AIMD)")
+    parser.add_argument('--limit', type=int, help='Máximo de produtos raspados por medição')
+    parser.add_argument('--catalog', type=int, default=120)
+    parser.add_argument('--latency-ms', type=float, default=30.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--retry-after', type=int, help='Retry-After enviado junto com os erros simulados')
+    parser.add_argument('--max-concurrency', type=int, default=16, help='Teto do nível auto')
+    parser.add_argument('--page-kb', type=int, default=60)
+    parser.add_argument('--json', help='Grava os resultados neste arquivo JSON')
+    args = parser.parse_args()
+
+    scraper.console.quiet = True
+    config = StorefrontConfig(catalog=args.catalog, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              error_rate=args.error_rate, error_status=args.error_status,
+                              retry_after=args.retry_after, page_kb=args.page_kb)
+    niveis = args.concurrency.split(',')
+    resultados = []
+    with MockStorefront(config) as loja:
+        print(f"{'='*80}")
+        print(f">>> Loja simulada em {loja.base_url}: {args.catalog} produtos, "
+              f"latência {args.latency_ms:.0f}+{args.jitter_ms:.0f} ms, erros {args.error_rate:.0%}")
+        print('='*80)
+        print(f"  {'motor':<10}{'conc.':>6}{'URLs/s':>10}{'páginas/s':>12}{'p50 (ms)':>10}{'falhas':>8}")
+        for motor in args.engines.split(','):
+            descobrir, raspar = MOTORES[motor]
+            inicio = time.perf_counter()
+            urls = descobrir(loja.base_url)
+            urls_por_s = len(urls) / (time.perf_counter() - inicio)
+            alvo = urls[:args.limit] if args.limit else urls
+            for concorrencia in niveis:
+                r = medir_scraping(raspar, alvo, concorrencia, args.max_concurrency)
+                resultados.append({'engine': motor, 'concurrency': concorrencia, 'urls_per_s': urls_por_s,
+                                   'urls': len(urls), **r})
+                print(f"  {motor:<10}{concorrencia:>6}{urls_por_s:>10.1f}{r['pages_per_s']:>12.1f}"
+                      f"{r['p50_ms']:>10.1f}{r['falhas']:>8}")
+        print(f"\n  → Requisições atendidas pela loja: {loja.contadores}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
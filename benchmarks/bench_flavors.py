@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Conferência e benchmark da extração de produtos com vários sabores
+
+Roda extract_from_html sobre páginas com vários sabores (debug/page.html e
+páginas sintéticas em tabela, parágrafo e texto corrido) e confere, sabor a
+sabor, a porção e os valores de cada nutriente com os esperados. Também
+conta quantas árvores do BeautifulSoup são montadas e quantas vezes cada
+tabela nutricional é lida por página: o esperado é uma de cada.
+
+Confere ainda que um bloco de informações sem nenhum valor (página
+renderizada pela metade) não vira uma linha zerada e que o nome do produto
+vem do h1, mesmo com JSON-LD e itemprop="name" de marca ou breadcrumb.
+
+Sai com código 1 se algum valor divergir ou se alguma página for lida mais
+de uma vez.
+
+Uso:
+    python benchmarks/bench_flavors.py
+    python benchmarks/bench_flavors.py --sabores 1,3,8,12 --repeats 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import scraper
+from synthetic_pages import FORMATOS, NUTRIENTES, gerar_pagina
+
+PAGINA_CAPTURADA = os.path.join(RAIZ, 'debug', 'page.html')
+
+# Rótulo do gerador sintético -> coluna do CSV
+COLUNA = {
+    'Valor Energético': 'CALORIAS (kcal)', 'Carboidratos': 'CARBOIDRATOS (g)', 'Açúcares': 'ACUCARES (g)',
+    'Proteínas': 'PROTEINAS (g)', 'Gorduras Totais': 'GORDURAS_TOTAIS (g)',
+    'Gorduras Saturadas': 'GORDURAS_SATURADAS (g)', 'Fibra Alimentar': 'FIBRAS (g)', 'Sódio': 'SODIO (mg)',
+}
+
+# Valores conferidos à mão nas três tabelas de debug/page.html
+ESPERADO_CAPTURADA = [
+    {'sabor': 'Natural Vanilla', 'PORCAO (g)': '30', 'CALORIAS (kcal)': '91', 'CARBOIDRATOS (g)': '4.0',
+     'PROTEINAS (g)': '22', 'FIBRAS (g)': '1.2', 'SODIO (mg)': '66'},
+    {'sabor': 'Dark Chocolate', 'PORCAO (g)': '30', 'CALORIAS (kcal)': '93', 'CARBOIDRATOS (g)': '3.5',
+     'PROTEINAS (g)': '22', 'FIBRAS (g)': '1.2', 'SODIO (mg)': '58'},
+    {'sabor': 'Neutro', 'PORCAO (g)': '26', 'CALORIAS (kcal)': '92', 'CARBOIDRATOS (g)': '0',
+     'PROTEINAS (g)': '23', 'SODIO (mg)': '44'},
+]
+
+def fixtures(niveis: List[int]) -> List[Tuple[str, str, List[Dict[str, str]]]]:
+    """(nome, html, valores esperados por sabor)"""
+    with open(PAGINA_CAPTURADA, 'r', encoding='iso-8859-1') as f:
+        casos = [('debug/page.html', f.read(), ESPERADO_CAPTURADA)]
+    seed = 100
+    for n_sabores in niveis:
+        for formato in FORMATOS:
+            html, sabores = gerar_pagina(n_sabores, formato, 120, seed)
+            esperados = [{'sabor': s['sabor'], 'PORCAO (g)': s['porcao'],
+                          **{COLUNA[rotulo]: s[rotulo].replace(',', '.') for rotulo, _, _ in NUTRIENTES}}
+                         for s in sabores]
+            casos.append((f"sintetica_{n_sabores}s_{formato}", html, esperados))
+            seed += 1
+    return casos
+
+# Página com nome de produto, mas sem tabela no bloco de informações
+PAGINA_SEM_TABELA = (
+    '<html><body><h1 itemprop="name">Produto sem tabela</h1>'
+    '<div class="bloco_texto" id="informacoes"><p>Sem tabela aqui</p></div></body></html>'
+)
+
+# Nome do JSON-LD e itemprop="name" aninhados antes do h1 não podem renomear o produto
+PAGINA_NOMES = (
+    '<html><head><script type="application/ld+json">{"@type": "Product", "name": "Nome do JSON-LD"}</script>'
+    '</head><body><nav><a itemprop="name" href="/">Início</a></nav>'
+    '<div itemprop="brand"><span itemprop="name">Pura Vida</span></div>'
+    '<h1 itemprop="name">Produto do h1</h1><div itemprop="category">Proteínas</div>'
+    '<div class="bloco_texto" id="informacoes"><p>Proteínas: 20 g</p></div></body></html>'
+)
+
+def conferir(nome: str, df, esperados: List[Dict[str, str]]) -> List[str]:
+    """Mensagens de divergência entre as linhas extraídas e os valores esperados"""
+    if df is None:
+        return [f"{nome}: nenhuma linha extraída"]
+    if len(df) != len(esperados):
+        return [f"{nome}: {len(df)} linhas, esperadas {len(esperados)}"]
+    erros = []
+    for (_, linha), esperado in zip(df.iterrows(), esperados):
+        if not linha['NOME_PRODUTO'].endswith(f" - {esperado['sabor']}"):
+            erros.append(f"{nome}: sabor {linha['NOME_PRODUTO']!r}, esperado {esperado['sabor']!r}")
+        for coluna, valor in esperado.items():
+            if coluna != 'sabor' and float(linha[coluna]) != float(valor):
+                erros.append(f"{nome} [{esperado['sabor']}] {coluna}: {linha[coluna]} != {valor}")
+    return erros
+
+def contar_leituras(html: str) -> Tuple[int, int, int]:
+    """(árvores montadas, leituras de tabela, tabelas distintas) em uma extração"""
+    arvores = Counter()
+    leituras = Counter()
+    soup_original = scraper.BeautifulSoup
+    ler_tabela_original = scraper._Secao.ler_tabela
+
+    def soup_contado(*args, **kwargs):
+        arvores['soup'] += 1
+        return soup_original(*args, **kwargs)
+
+    def ler_tabela_contado(secao, tabela):
+        leituras[id(tabela)] += 1
+        return ler_tabela_original(secao, tabela)
+
+    scraper.BeautifulSoup = soup_contado
+    scraper._Secao.ler_tabela = ler_tabela_contado
+    try:
+        scraper.extract_from_html(html, 'https://www.corpoevidasuplementos.com.br/fixture')
+    finally:
+        scraper.BeautifulSoup = soup_original
+        scraper._Secao.ler_tabela = ler_tabela_original
+    return arvores['soup'], sum(leituras.values()), len(leituras)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sabores', default='1,3,8', help='Quantidades de sabores das páginas sintéticas')
+    parser.add_argument('--repeats', type=int, default=3, help='Passadas pelas páginas na medição')
+    args = parser.parse_args()
+
+    scraper.console.quiet = True
+    casos = fixtures([int(n) for n in args.sabores.split(',')])
+    url = 'https://www.corpoevidasuplementos.com.br/fixture'
+    print(f"{'='*80}")
+    print(f">>> {len(casos)} páginas com vários sabores, {args.repeats} passadas")
+    print('='*80)
+
+    erros = []
+    print(f"  {'página':<28}{'sabores':>8}{'árvores':>9}{'tabelas lidas':>15}{'ms/página':>11}")
+    for nome, html, esperados in casos:
+        df = scraper.extract_from_html(html, url)
+        erros += conferir(nome, df, esperados)
+        arvores, leituras, tabelas = contar_leituras(html)
+        if arvores != 1 or leituras != tabelas:
+            erros.append(f"{nome}: {arvores} árvores e {leituras} leituras de {tabelas} tabelas")
+        inicio = time.perf_counter()
+        for _ in range(args.repeats):
+            scraper.extract_from_html(html, url)
+        ms = (time.perf_counter() - inicio) / args.repeats * 1000
+        print(f"  {nome:<28}{0 if df is None else len(df):>8}{arvores:>9}{f'{leituras}/{tabelas}':>15}{ms:>11.1f}")
+
+    if scraper.extract_from_html(PAGINA_SEM_TABELA, url) is not None:
+        erros.append("bloco sem valores nutricionais gerou uma linha em vez de None")
+    df = scraper.extract_from_html(PAGINA_NOMES, url)
+    if df is None or list(df['NOME_PRODUTO']) != ['Produto do h1'] or list(df['CATEGORIA']) != ['Proteínas']:
+        erros.append("nome/categoria não vieram do h1/div de microdata: "
+                     f"{None if df is None else list(df[['NOME_PRODUTO', 'CATEGORIA']].iloc[0])}")
+
+    if erros:
+        print("\n❌ Divergências:")
+        for mensagem in erros:
+            print(f"   • {mensagem}")
+        sys.exit(1)
+    print("\n✅ Todos os sabores conferem; cada página foi lida uma única vez")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de crescimento de memória do parser em coletas longas
+
+Processa N páginas sintéticas com extract_from_html e acompanha o RSS do
+processo. Depois do aquecimento (primeiras páginas), o RSS deve ficar abaixo
+de um teto fixo; caso contrário o script falha (código 1).
+
+Uso:
+    python benchmarks/bench_memory.py --pages 1000 --ceiling-mb 30
+    python benchmarks/bench_memory.py --pages 300 --tracemalloc 100   # mostra os maiores crescimentos
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import scraper
+from config.memory import memory, process_rss
+from synthetic_pages import FORMATOS, gerar_pagina
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=1000, help='Quantidade de páginas processadas')
+    parser.add_argument('--warmup', type=int, default=100, help='Páginas de aquecimento antes da referência de RSS')
+    parser.add_argument('--ceiling-mb', type=float, default=30.0, help='Crescimento máximo de RSS após o aquecimento')
+    parser.add_argument('--page-kb', type=int, default=40, help='Tamanho aproximado de cada página')
+    parser.add_argument('--tracemalloc', type=int, metavar='N', help='Snapshot do tracemalloc a cada N páginas')
+    args = parser.parse_args()
+
+    scraper.console.quiet = True
+    # Páginas distintas (sabores, formatos e tamanhos variados) reutilizadas em ciclo
+    corpus = [gerar_pagina(1 + i % 6, FORMATOS[i % 3], args.page_kb + (i % 4) * 20, i)[0] for i in range(24)]
+
+    if args.tracemalloc:
+        memory.enable(args.tracemalloc, output_file=None)
+
+    print(f"{'='*80}")
+    print(f">>> {args.pages} páginas, teto de crescimento {args.ceiling_mb:.0f} MB após {args.warmup} páginas")
+    print('='*80)
+    referencia = None
+    pico = 0.0
+    inicio = time.perf_counter()
+    for i in range(1, args.pages + 1):
+        url = f"https://www.corpoevidasuplementos.com.br/pagina-{i}"
+        scraper.extract_from_html(corpus[i % len(corpus)], url)
+        memory.tick(url)
+        if i == args.warmup:
+            referencia = process_rss()['rss_mb']
+        if i % 100 == 0 or i == args.pages:
+            rss = process_rss()['rss_mb']
+            pico = max(pico, rss)
+            crescimento = f"+{rss - referencia:.1f} MB" if referencia is not None else "aquecendo"
+            print(f"  → {i:5d} páginas | RSS {rss:7.1f} MB ({crescimento}) | "
+                  f"{i / (time.perf_counter() - inicio):.1f} páginas/s")
+
+    if referencia is None:
+        print("\n⚠ Páginas insuficientes para passar do aquecimento")
+        return
+    crescimento = pico - referencia
+    if crescimento > args.ceiling_mb:
+        print(f"\n❌ RSS cresceu {crescimento:.1f} MB após o aquecimento (teto {args.ceiling_mb:.0f} MB)")
+        sys.exit(1)
+    print(f"\n✅ RSS estável: +{crescimento:.1f} MB após o aquecimento (teto {args.ceiling_mb:.0f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das funções de extração de config/scraper.py
+
+Executa o parser sobre debug/page.html e sobre um corpus de páginas sintéticas
+(variando número de sabores, formato dos nutrientes e tamanho da página) e
+reporta páginas/s, latência por página e alocações (pico e memória retida
+após a coleta de lixo, via tracemalloc).
+
+Os resultados podem ser gravados como baseline em JSON; nas execuções
+seguintes o script falha (código 1) se o throughput de alguma função cair
+mais do que o limite configurado em relação à baseline.
+
+Páginas/s absolutas dependem da máquina. Por isso cada página medida é
+intercalada com uma operação de calibração fixa (parsing de um HTML sintético
+e regex, sem código do projeto), e a comparação usa o throughput relativo a
+ela ('relative' na baseline: páginas por operação de calibração). Uma
+baseline gravada em outra máquina continua valendo; uma baseline antiga, sem
+calibração, precisa ser regravada com --save-baseline.
+
+Uso:
+    python benchmarks/bench_parser.py                    # compara com a baseline
+    python benchmarks/bench_parser.py --save-baseline    # grava nova baseline
+    python benchmarks/bench_parser.py --threshold 0.3 --repeats 5
+"""
+
+import argparse
+import gc
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+from config import scraper
+from config.structured_data import extract_structured_data
+from synthetic_pages import gerar_corpus
+
+BASELINE_PADRAO = os.path.join(RAIZ, 'benchmarks', 'baselines', 'parser.json')
+PAGINA_CAPTURADA = os.path.join(RAIZ, 'debug', 'page.html')
+
+# HTML fixo da operação de calibração: tabela parecida com a das páginas de produto
+_HTML_CALIBRACAO = '<div id="informacoes">' + ''.join(
+    f'<table><tr><td>Nutriente {i}</td><td>{i * 1.5:.1f} g</td><td>{i % 7}%</td></tr></table>'
+    for i in range(40)) + '</div>'
+_NUMERO = re.compile(r'(\d+[\.,]?\d*)')
+
+def operacao_calibracao() -> None:
+    """Trabalho fixo, sem código do projeto, usado como régua da máquina"""
+    soup = BeautifulSoup(_HTML_CALIBRACAO, 'html.parser')
+    sum(len(_NUMERO.findall(td.get_text())) for td in soup.find_all('td'))
+    soup.decompose()
+
+def carregar_corpus() -> List[Tuple[str, str]]:
+    with open(PAGINA_CAPTURADA, 'r', encoding='iso-8859-1') as f:
+        corpus = [('debug/page.html', f.read())]
+    return corpus + gerar_corpus()
+
+def _bloco_info(html: str):
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup, soup.find('div', {'class': 'bloco_texto', 'id': 'informacoes'})
+
+def funcoes_benchmark() -> Dict[str, Tuple[Callable, Callable]]:
+    """
+    Retorna {nome: (preparar, executar)}. `preparar(html)` roda fora da medição
+    (ex.: montar a árvore) e devolve os argumentos de `executar`.
+    """
+    url = 'https://www.corpoevidasuplementos.com.br/benchmark'
+    return {
+        'extract_from_html': (
+            lambda html: (html,),
+            lambda html: scraper.extract_from_html(html, url),
+        ),
+        'extract_structured_data': (
+            lambda html: (html,),
+            extract_structured_data,
+        ),
+        'extract_nutritional_info_flavors': (
+            lambda html: (_bloco_info(html)[1],),
+            lambda info_div: scraper.extract_nutritional_info_flavors(info_div, 'Produto', 'Categoria', url),
+        ),
+    }
+
+def medir(corpus: List[Tuple[str, str]], preparar: Callable, executar: Callable, repeats: int) -> Dict[str, float]:
+    """Mede latência por página e throughput agregado, além de alocações em uma passada extra"""
+    argumentos = [preparar(html) for _, html in corpus]
+    latencias = []
+    calibracao = 0.0
+    gc.collect()
+    for _ in range(repeats):
+        for args in argumentos:
+            # Uma operação de calibração intercalada com cada página: as duas
+            # medições passam pelas mesmas variações de carga da máquina
+            inicio = time.perf_counter()
+            operacao_calibracao()
+            meio = time.perf_counter()
+            executar(*args)
+            calibracao += meio - inicio
+            latencias.append((time.perf_counter() - meio) * 1000)
+    total = sum(latencias) / 1000
+
+    picos, retidos = [], []
+    tracemalloc.start()
+    for args in argumentos:
+        gc.collect()
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+        resultado = executar(*args)
+        picos.append((tracemalloc.get_traced_memory()[1] - antes) / 1024)
+        del resultado
+        gc.collect()
+        retidos.append((tracemalloc.get_traced_memory()[0] - antes) / 1024)
+    tracemalloc.stop()
+
+    latencias.sort()
+    return {
+        'pages_per_s': round(len(latencias) / total, 2),
+        # Páginas por operação de calibração: comparável entre máquinas
+        'relative': round(calibracao / total, 4),
+        'calibration_ops_per_s': round(len(latencias) / calibracao, 1),
+        'p50_ms': round(statistics.median(latencias), 3),
+        'p95_ms': round(latencias[int(0.95 * (len(latencias) - 1))], 3),
+        'max_ms': round(latencias[-1], 3),
+        'alloc_peak_kb_mean': round(statistics.mean(picos), 1),
+        'alloc_peak_kb_max': round(max(picos), 1),
+        'retained_kb_mean': round(statistics.mean(retidos), 1),
+    }
+
+def comparar(resultados: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+             threshold: float) -> List[str]:
+    """Retorna as mensagens de regressão de throughput relativo (à calibração) acima do limite"""
+    regressoes = []
+    for nome, atual in resultados.items():
+        anterior = baseline.get(nome)
+        if not anterior or 'relative' not in anterior:
+            continue
+        limite = anterior['relative'] * (1 - threshold)
+        if atual['relative'] < limite:
+            regressoes.append(
+                f"{nome}: {atual['relative']:.4f} × calibração < {limite:.4f} "
+                f"(baseline {anterior['relative']:.4f}, limite -{threshold:.0%}; "
+                f"{atual['pages_per_s']:.1f} páginas/s)"
+            )
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=3, help='Passadas pelo corpus por função')
+    parser.add_argument('--baseline', default=BASELINE_PADRAO, help='Arquivo JSON da baseline')
+    parser.add_argument('--save-baseline', action='store_true', help='Grava os resultados como nova baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Queda máxima de páginas/s tolerada em relação à baseline (padrão: 0.25)')
+    parser.add_argument('--only', help='Executa apenas a função com este nome')
+    args = parser.parse_args()
+
+    # As mensagens do rich por página dominariam a medição
+    scraper.console.quiet = True
+    corpus = carregar_corpus()
+    tamanho_medio = statistics.mean(len(html) for _, html in corpus) / 1024
+    print(f"{'='*80}")
+    print(f">>> Corpus: {len(corpus)} páginas (média {tamanho_medio:.0f} KB), {args.repeats} passadas")
+    print('='*80)
+
+    resultados = {}
+    for nome, (preparar, executar) in funcoes_benchmark().items():
+        if args.only and nome != args.only:
+            continue
+        resultados[nome] = r = medir(corpus, preparar, executar, args.repeats)
+        print(f"  → {nome}")
+        print(f"      {r['pages_per_s']:8.1f} páginas/s ({r['relative']:.4f} × calibração,"
+              f" {r['calibration_ops_per_s']:.0f} operações/s)"
+              f" | p50 {r['p50_ms']:.2f} ms | p95 {r['p95_ms']:.2f} ms"
+              f" | pico {r['alloc_peak_kb_mean']:.0f} KB (máx {r['alloc_peak_kb_max']:.0f} KB)"
+              f" | retido {r['retained_kb_mean']:.1f} KB")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(resultados)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Baseline gravada em {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠ Baseline não encontrada ({args.baseline}); use --save-baseline para criá-la")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if not any('relative' in valores for valores in baseline.values()):
+        print(f"\n⚠ Baseline sem calibração ({args.baseline}); regrave-a com --save-baseline")
+        return
+    regressoes = comparar(resultados, baseline, args.threshold)
+    if regressoes:
+        print("\n❌ Regressão de throughput:")
+        for mensagem in regressoes:
+            print(f"   • {mensagem}")
+        sys.exit(1)
+    print("\n✅ Sem regressões em relação à baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do pipeline em estágios contra a loja simulada
+
+Compara o parsing em threads (limitado pelo GIL) com o parsing em um pool
+de processos, mantendo fixo o número de threads de download. A descoberta e o
+download usam HTTP simples (config.fetcher), como `--fetch-engine http`.
+
+Uso:
+    python benchmarks/bench_pipeline.py --fetch-workers 8 --parse-workers 1,2,4
+    python benchmarks/bench_pipeline.py --catalog 400 --page-kb 120 --engines process
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import scraper
+from config.fetcher import fetch_html, raise_for_status
+from config.pipeline import Pipeline, Stage
+from bench_e2e import descobrir_http
+from mock_storefront import MockStorefront, StorefrontConfig
+
+def medir(base_url: str, engine: str, fetch_workers: int, parse_workers: int) -> dict:
+    pool = None
+    if engine == 'process':
+        pool = ProcessPoolExecutor(parse_workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=scraper.init_parse_worker)
+        # Aquece os processos (import do pandas/bs4) fora da medição
+        list(pool.map(abs, range(parse_workers)))
+    linhas = []
+
+    def baixar(url):
+        resposta = fetch_html(url)
+        raise_for_status(resposta)
+        return url, resposta.html
+
+    def extrair(item):
+        url, html = item
+        if pool is not None:
+            return pool.submit(scraper.parse_to_records, html.encode('utf-8'), url).result()
+        return scraper.parse_to_records(html.encode('utf-8'), url)
+
+    pipeline = Pipeline(lambda: descobrir_http(base_url), [
+        Stage('download', baixar, workers=fetch_workers, maxsize=fetch_workers * 2),
+        Stage('parsing', extrair, workers=parse_workers, maxsize=parse_workers * 2),
+        Stage('gravacao', linhas.extend, workers=1),
+    ])
+    inicio = time.perf_counter()
+    pipeline.run()
+    total = time.perf_counter() - inicio
+    if pool is not None:
+        pool.shutdown()
+    estagios = {linha['stage']: linha for linha in pipeline.stats()}
+    return {
+        'pages_per_s': estagios['parsing']['items'] / total,
+        'rows': len(linhas),
+        'parse_busy_s': estagios['parsing']['busy_s'] / parse_workers,
+        'download_busy_s': estagios['download']['busy_s'] / fetch_workers,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--engines', default='thread,process', help='Motores de parsing (thread,process)')
+    parser.add_argument('--fetch-workers', type=int, default=8)
+    parser.add_argument('--parse-workers', default='1,2,4', help='Níveis de workers de parsing')
+    parser.add_argument('--catalog', type=int, default=120)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--page-kb', type=int, default=80)
+    args = parser.parse_args()
+
+    scraper.console.quiet = True
+    config = StorefrontConfig(catalog=args.catalog, latency_ms=args.latency_ms, page_kb=args.page_kb)
+    with MockStorefront(config) as loja:
+        print(f"{'='*80}")
+        print(f">>> Loja simulada: {args.catalog} produtos de ~{args.page_kb} KB, "
+              f"{args.fetch_workers} threads de download, {os.cpu_count()} núcleos")
+        print('='*80)
+        print(f"  {'parsing':<10}{'workers':>8}{'páginas/s':>12}{'linhas':>8}{'parse/worker (s)':>18}")
+        for engine in args.engines.split(','):
+            for workers in (int(n) for n in args.parse_workers.split(',')):
+                r = medir(loja.base_url, engine, args.fetch_workers, workers)
+                print(f"  {engine:<10}{workers:>8}{r['pages_per_s']:>12.1f}{r['rows']:>8}{r['parse_busy_s']:>18.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark e conferência das consultas do índice colunar (config/query.py)
+
+Carrega dados/produtos.csv replicado N vezes e mede, em microssegundos, as
+consultas de faixa e de top-k do NutrientIndex contra o equivalente em pandas
+(filtro + sort_values sobre o DataFrame). Também confere se os dois devolvem
+as mesmas linhas.
+
+Sai com código 1 se algum resultado divergir.
+
+Uso:
+    python benchmarks/bench_query.py
+    python benchmarks/bench_query.py --scale 1,100,1000 --repeats 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+
+import numpy as np
+import pandas as pd
+
+from config.query import PORCAO, NutrientIndex
+
+CONSULTAS = [
+    ('top 10 proteína/100 g em Whey Protein Isolado', 'top', 'PROTEINAS (g)',
+     {'k': 10, 'category': 'Whey Protein Isolado'}),
+    ('top 10 fibras/100 g', 'top', 'FIBRAS (g)', {'k': 10}),
+    ('sódio <= 100 mg/100 g', 'range', 'SODIO (mg)', {'high': 100.0}),
+    ('10 <= carboidratos <= 50 g/100 g', 'range', 'CARBOIDRATOS (g)', {'low': 10.0, 'high': 50.0}),
+]
+
+def por_100g(df: pd.DataFrame, coluna: str) -> pd.Series:
+    porcao = df[PORCAO].where(df[PORCAO] > 0)
+    return df[coluna] / porcao * 100
+
+def em_pandas(df: pd.DataFrame, tipo: str, coluna: str, parametros: dict) -> set:
+    valores = por_100g(df, coluna)
+    if 'category' in parametros:
+        valores = valores[df['CATEGORIA'] == parametros['category']]
+    valores = valores.dropna()
+    if tipo == 'top':
+        # Empates no k-ésimo valor entram todos, para comparar conjuntos
+        corte = valores.sort_values(ascending=False).iloc[:parametros['k']].min()
+        return set(valores[valores >= corte].index)
+    low, high = parametros.get('low', -np.inf), parametros.get('high', np.inf)
+    return set(valores[(valores >= low) & (valores <= high)].index)
+
+def no_indice(indice: NutrientIndex, tipo: str, coluna: str, parametros: dict):
+    if tipo == 'top':
+        return indice.top(coluna, parametros['k'], parametros.get('category'))
+    return indice.range(coluna, parametros.get('low'), parametros.get('high'))
+
+def medir(funcao, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.path.join(RAIZ, 'dados', 'produtos.csv'))
+    parser.add_argument('--scale', default='1,100', help='Quantas vezes replicar o CSV')
+    parser.add_argument('--repeats', type=int, default=1000, help='Repetições de cada consulta')
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.csv)
+    erros = []
+    for escala in [int(n) for n in args.scale.split(',')]:
+        df = pd.concat([base] * escala, ignore_index=True)
+        inicio = time.perf_counter()
+        indice = NutrientIndex(df)
+        carga = (time.perf_counter() - inicio) * 1000
+        print(f"{'='*80}")
+        print(f">>> {len(df)} linhas (x{escala}): índice montado em {carga:.1f} ms")
+        print('='*80)
+        print(f"  {'consulta':<48}{'linhas':>8}{'índice µs':>11}{'pandas µs':>11}")
+        repeticoes_pandas = max(1, args.repeats // 50)
+        for nome, tipo, coluna, parametros in CONSULTAS:
+            linhas = no_indice(indice, tipo, coluna, parametros)
+            esperado = em_pandas(df, tipo, coluna, parametros)
+            encontrado = set(int(i) for i in linhas)
+            if (tipo == 'range' and encontrado != esperado) or (tipo == 'top' and not encontrado <= esperado):
+                erros.append(f"{nome} (x{escala}): {len(encontrado)} linhas, esperadas {len(esperado)}")
+            us_indice = medir(lambda: no_indice(indice, tipo, coluna, parametros), args.repeats)
+            us_pandas = medir(lambda: em_pandas(df, tipo, coluna, parametros), repeticoes_pandas)
+            print(f"  {nome:<48}{len(linhas):>8}{us_indice:>11.1f}{us_pandas:>11.1f}")
+
+    if erros:
+        print("\n❌ Divergências:")
+        for mensagem in erros:
+            print(f"   • {mensagem}")
+        sys.exit(1)
+    print("\n✅ Índice e pandas devolvem as mesmas linhas")
+
+if __name__ == "__main__":
+    main()
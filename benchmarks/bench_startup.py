@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do tempo de inicialização do main.py
+
+Mede quanto tempo o interpretador leva para importar o main.py (o que
+acontece antes de o menu aparecer) usando `python -X importtime`, lista os
+módulos mais caros e confere que pandas, selenium, bs4 e rich não são
+carregados até que uma opção pesada seja escolhida.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 5] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS_PESADOS = ['pandas', 'numpy', 'selenium', 'webdriver_manager', 'bs4', 'rich']
+
+def medir_importtime(modulo: str = 'main') -> List[Tuple[int, int, str]]:
+    """
+    Executa `python -X importtime -c "import <modulo>"` e retorna
+    uma lista de (self_us, cumulativo_us, nome_do_modulo).
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=RAIZ, capture_output=True, text=True
+    )
+    linhas = []
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        partes = linha[len('import time:'):].split('|')
+        if len(partes) != 3:
+            continue
+        linhas.append((int(partes[0]), int(partes[1]), partes[2].rstrip()))
+    return linhas
+
+def medir_wall_clock(codigo: str, runs: int) -> List[float]:
+    """Mede o tempo total (em ms) de subprocessos executando o código informado"""
+    tempos = []
+    for _ in range(runs):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, check=True,
+                       stdout=subprocess.DEVNULL)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+def modulos_pesados_carregados() -> List[str]:
+    """Retorna quais dependências pesadas ficam em sys.modules após `import main`"""
+    codigo = (
+        "import sys, main; "
+        f"print(','.join(m for m in {MODULOS_PESADOS!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ,
+                          capture_output=True, text=True, check=True)
+    saida = proc.stdout.strip()
+    return saida.split(',') if saida else []
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Repetições para medir o tempo total')
+    parser.add_argument('--top', type=int, default=15, help='Quantidade de módulos exibidos no relatório')
+    args = parser.parse_args()
+
+    linhas = medir_importtime('main')
+    total_main = next((cum for _, cum, nome in linhas if nome.strip() == 'main'), 0)
+    print(f"{'='*80}")
+    print(f">>> -X importtime: import main = {total_main / 1000:.1f} ms")
+    print('='*80)
+    print(f"{'self (ms)':>10} {'cumul. (ms)':>12}  módulo")
+    for self_us, cum_us, nome in sorted(linhas, key=lambda l: l[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:10.2f} {cum_us / 1000:12.2f}  {nome}")
+
+    tempos_vazio = medir_wall_clock('pass', args.runs)
+    tempos_main = medir_wall_clock('import main', args.runs)
+    tempos_pesado = medir_wall_clock('import config.scraper', args.runs)
+    print(f"\n{'='*80}")
+    print(">>> Tempo total do processo (mediana)")
+    print('='*80)
+    print(f"  → python vazio:            {statistics.median(tempos_vazio):8.1f} ms")
+    print(f"  → import main (menu):      {statistics.median(tempos_main):8.1f} ms")
+    print(f"  → import config.scraper:   {statistics.median(tempos_pesado):8.1f} ms")
+
+    carregados = modulos_pesados_carregados()
+    if carregados:
+        print(f"\n❌ Dependências pesadas carregadas no import do main: {', '.join(carregados)}")
+        sys.exit(1)
+    print("\n✅ Nenhuma dependência pesada carregada no import do main")
+
+if __name__ == "__main__":
+    main()
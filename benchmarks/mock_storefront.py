@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Loja simulada local para benchmarks ponta a ponta
+
+Serve a busca `advanced_search_result.php` paginada, com a mesma marcação
+`a.produto`/`span.nome` da loja real, e páginas de produto no formato de
+debug/page.html (geradas por synthetic_pages.py). Tamanho do catálogo,
+latência, taxa de erros e o suporte a respostas 304 são configuráveis. Com
+static_kb > 0 as páginas referenciam JS e CSS estáticos cacheáveis
+(/static/loja.js e /static/loja.css), como os da loja real.
+
+Uso:
+    python benchmarks/mock_storefront.py --port 8765 --catalog 500 --latency-ms 80 --error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import formatdate
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_pages import FORMATOS, gerar_pagina
+
+class StorefrontConfig:
+    """Parâmetros da loja simulada (podem ser alterados com o servidor rodando)"""
+
+    def __init__(self, catalog: int = 200, page_size: int = 24, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 retry_after: Optional[int] = None, conditional: bool = True,
+                 page_kb: int = 120, seed: int = 0, static_kb: int = 0):
+        self.catalog = catalog
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.conditional = conditional
+        self.page_kb = page_kb
+        self.seed = seed
+        self.static_kb = static_kb
+
+def _quantidade_kit(indice: int) -> int:
+    """Um a cada cinco produtos é um kit (2 ou 3 unidades) do produto anterior, como no catálogo real"""
+    return 2 + indice % 2 if indice % 5 == 4 else 0
+
+def slug_produto(indice: int) -> str:
+    quantidade = _quantidade_kit(indice)
+    if quantidade:
+        return f"kit-{quantidade}-un-produto-sintetico-{indice - 1}-pura-vida"
+    return f"produto-sintetico-{indice}-pura-vida"
+
+@lru_cache(maxsize=4096)
+def _pagina_produto(indice: int, page_kb: int, seed: int) -> bytes:
+    # O kit tem o mesmo bloco nutricional do produto base, com outro nome
+    quantidade = _quantidade_kit(indice)
+    base = indice - 1 if quantidade else indice
+    n_sabores = (1, 1, 2, 3, 5)[base % 5]
+    formato = FORMATOS[base % len(FORMATOS)] if base % 7 == 0 else 'tabela'
+    nome = f"Kit {quantidade} un Produto Sintético {base} - Pura vida" if quantidade else None
+    html, _ = gerar_pagina(n_sabores, formato, page_kb, seed + base, nome=nome)
+    return html.encode('iso-8859-1', errors='replace')
+
+@lru_cache(maxsize=8)
+def _recurso_estatico(nome: str, kb: int) -> bytes:
+    linha = f"/* {nome}: recurso estático da loja simulada */\n" if nome.endswith('.css') else f"// {nome}\n"
+    return (linha * (kb * 1024 // len(linha) + 1)).encode('ascii')[:kb * 1024]
+
+# Referências aos recursos estáticos inseridas nas páginas com static_kb > 0
+_TAGS_ESTATICAS = b'<link rel="stylesheet" href="/static/loja.css"><script src="/static/loja.js"></script>'
+
+def _com_estaticos(corpo: bytes) -> bytes:
+    posicao = corpo.find(b'</head>')
+    return corpo[:posicao] + _TAGS_ESTATICAS + corpo[posicao:] if posicao >= 0 else _TAGS_ESTATICAS + corpo
+
+def _pagina_listagem(base: str, config: StorefrontConfig, pagina: int) -> bytes:
+    inicio = (pagina - 1) * config.page_size
+    fim = min(config.catalog, inicio + config.page_size)
+    itens = []
+    for i in range(inicio, fim):
+        itens.append(
+            f'<div class="item"><a class="produto" href="{base}/{slug_produto(i)}">'
+            f'<img src="/img/{i}.jpg"><span class="nome">Produto Sintético {i} - Pura vida</span></a></div>'
+        )
+    corpo = ''.join(itens) if itens else '<p class="nenhum">Nenhum produto encontrado.</p>'
+    html = (f'<html><head><meta charset="iso-8859-1"><title>Busca</title></head><body>'
+            f'<div class="listagem">{corpo}</div></body></html>')
+    return html.encode('iso-8859-1', errors='replace')
+
+def criar_handler(config: StorefrontConfig, contadores: dict):
+    lock = threading.Lock()
+    indices = {slug_produto(i): i for i in range(config.catalog)}
+    inicio_servidor = formatdate(time.time(), usegmt=True)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _contar(self, chave: str) -> None:
+            with lock:
+                contadores[chave] = contadores.get(chave, 0) + 1
+
+        def _enviar(self, status: int, corpo: bytes = b'', cabecalhos: Optional[dict] = None) -> None:
+            self.send_response(status)
+            for nome, valor in (cabecalhos or {}).items():
+                self.send_header(nome, valor)
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            if corpo:
+                self.wfile.write(corpo)
+
+        def do_GET(self):
+            self._contar('requests')
+            atraso = config.latency_ms + random.uniform(0, config.jitter_ms)
+            if atraso > 0:
+                time.sleep(atraso / 1000)
+            if config.error_rate and random.random() < config.error_rate:
+                self._contar(f'status_{config.error_status}')
+                extras = {'Retry-After': str(config.retry_after)} if config.retry_after is not None else {}
+                self._enviar(config.error_status, b'erro simulado', extras)
+                return
+
+            url = urlparse(self.path)
+            base = f"http://{self.headers.get('Host', 'localhost')}"
+            tipo = 'text/html; charset=iso-8859-1'
+            if url.path in ('/static/loja.js', '/static/loja.css') and config.static_kb:
+                self._contar('static')
+                mime = 'text/css' if url.path.endswith('.css') else 'application/javascript'
+                self._enviar(200, _recurso_estatico(url.path, config.static_kb),
+                             {'Content-Type': mime, 'Cache-Control': 'public, max-age=86400'})
+                return
+            if url.path == '/advanced_search_result.php':
+                pagina = int(parse_qs(url.query).get('page', ['1'])[0])
+                self._contar('listing')
+                corpo = _pagina_listagem(base, config, pagina)
+                self._enviar(200, _com_estaticos(corpo) if config.static_kb else corpo, {'Content-Type': tipo})
+                return
+
+            indice = indices.get(url.path.strip('/'))
+            if indice is None:
+                self._contar('status_404')
+                self._enviar(404, b'nao encontrado')
+                return
+            corpo = _pagina_produto(indice, config.page_kb, config.seed)
+            etag = '"' + hashlib.md5(corpo).hexdigest() + '"'
+            if config.conditional and (self.headers.get('If-None-Match') == etag or
+                                       self.headers.get('If-Modified-Since') == inicio_servidor):
+                self._contar('status_304')
+                self._enviar(304, b'', {'ETag': etag, 'Last-Modified': inicio_servidor})
+                return
+            self._contar('product')
+            if config.static_kb:
+                corpo = _com_estaticos(corpo)
+            cabecalhos = {'Content-Type': tipo}
+            if config.conditional:
+                cabecalhos.update({'ETag': etag, 'Last-Modified': inicio_servidor})
+            self._enviar(200, corpo, cabecalhos)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class MockStorefront:
+    """Servidor da loja simulada rodando em uma thread daemon"""
+
+    def __init__(self, config: Optional[StorefrontConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = config or StorefrontConfig()
+        self.contadores: dict = {}
+        self.server = ThreadingHTTPServer((host, port), criar_handler(self.config, self.contadores))
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockStorefront':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--catalog', type=int, default=200, help='Quantidade de produtos no catálogo')
+    parser.add_argument('--page-size', type=int, default=24, help='Produtos por página de busca')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latência fixa por requisição')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Latência extra aleatória (0..jitter)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fração de respostas com erro')
+    parser.add_argument('--error-status', type=int, default=503, help='Status HTTP dos erros simulados')
+    parser.add_argument('--retry-after', type=int, help='Valor do cabeçalho Retry-After nos erros')
+    parser.add_argument('--no-304', action='store_true', help='Ignora If-None-Match/If-Modified-Since')
+    parser.add_argument('--page-kb', type=int, default=120, help='Tamanho aproximado das páginas de produto')
+    parser.add_argument('--static-kb', type=int, default=0, help='Tamanho do JS e do CSS estáticos (0 = sem recursos)')
+    args = parser.parse_args()
+
+    config = StorefrontConfig(args.catalog, args.page_size, args.latency_ms, args.jitter_ms,
+                              args.error_rate, args.error_status, args.retry_after,
+                              not args.no_304, args.page_kb, static_kb=args.static_kb)
+    loja = MockStorefront(config, args.host, args.port)
+    print(f"🛒 Loja simulada em {loja.base_url} ({config.catalog} produtos). Ctrl+C para encerrar.")
+    try:
+        loja.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{loja.contadores}")
+
+if __name__ == "__main__":
+    main()
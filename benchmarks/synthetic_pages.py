@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gerador de páginas de produto sintéticas no formato de debug/page.html
+
+As páginas variam o número de sabores (tabelas nutricionais), o formato em
+que os nutrientes aparecem e o tamanho total do HTML, para que os benchmarks
+do parser cubram mais casos do que a única página capturada.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+FORMATOS = ('tabela', 'paragrafo', 'texto')
+
+SABORES = ['Natural Vanilla', 'Dark Chocolate', 'Neutro', 'Morango', 'Cookies', 'Banana',
+           'Coco', 'Limão', 'Maracujá', 'Café', 'Doce de Leite', 'Frutas Vermelhas']
+
+# (rótulo, unidade, faixa de valores)
+NUTRIENTES: List[Tuple[str, str, Tuple[float, float]]] = [
+    ('Valor Energético', 'kcal', (20, 400)),
+    ('Carboidratos', 'g', (0, 60)),
+    ('Açúcares', 'g', (0, 20)),
+    ('Proteínas', 'g', (0, 40)),
+    ('Gorduras Totais', 'g', (0, 20)),
+    ('Gorduras Saturadas', 'g', (0, 8)),
+    ('Fibra Alimentar', 'g', (0, 10)),
+    ('Sódio', 'mg', (0, 500)),
+]
+
+PARAGRAFO_ENCHIMENTO = (
+    '<p>Proteína é vital para inúmeros processos da construção, manutenção e otimização da saúde. '
+    'E a ciência indica que, para que o organismo tenha acesso ao que precisa, esse grupo alimentar '
+    'deveria ser priorizado em cada refeição.</p>'
+)
+
+def _valor(rng: random.Random, faixa: Tuple[float, float], unidade: str) -> str:
+    valor = rng.uniform(*faixa)
+    if unidade in ('kcal', 'mg'):
+        return str(int(valor))
+    return f"{valor:.1f}".replace('.', ',')
+
+def _bloco_sabor(rng: random.Random, sabor: str, formato: str) -> Tuple[str, Dict[str, str]]:
+    porcao = rng.choice([5, 10, 20, 26, 30, 40])
+    valores = {rotulo: _valor(rng, faixa, unidade) for rotulo, unidade, faixa in NUTRIENTES}
+    partes = [f'<p><strong>INFORMAÇÃO NUTRICIONAL – {sabor}</strong></p>',
+              f'<p>Porção de {porcao} g (1 scoop)</p>']
+    if formato == 'tabela':
+        linhas = ['<tr><td colspan="2"><p><strong>Quantidade por porção</strong></p></td>'
+                  '<td><p><strong>*%VD</strong></p></td></tr>']
+        for rotulo, unidade, _ in NUTRIENTES:
+            valor = valores[rotulo]
+            extra = f' = {int(int(valor) * 4.2)} kj' if unidade == 'kcal' else ''
+            linhas.append(f'<tr><td><p><strong>{rotulo} </strong></p></td>'
+                          f'<td><p>{valor} {unidade}{extra}</p></td><td><p>{rng.randint(0, 50)}%</p></td></tr>')
+        partes.append('<table border="0" cellspacing="0" cellpadding="0"><tbody>' + ''.join(linhas) + '</tbody></table>')
+    elif formato == 'paragrafo':
+        for rotulo, unidade, _ in NUTRIENTES:
+            partes.append(f'<p>{rotulo}: {valores[rotulo]} {unidade}</p>')
+    else:
+        corrido = '; '.join(f'{rotulo.lower()} {valores[rotulo]} {unidade}' for rotulo, unidade, _ in NUTRIENTES)
+        partes.append(f'<p>Cada porção contém {corrido}.</p>')
+    partes.append(f'<p>Aminograma – {sabor}</p><p>Grama por porção: Ácido Glutâmico: 3,95; Leucina: 2,26;</p>')
+    return ''.join(partes), {'porcao': str(porcao), **valores}
+
+def gerar_pagina(n_sabores: int = 1, formato: str = 'tabela', tamanho_kb: int = 100,
+                 seed: int = 0, nome: str = None) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Gera o HTML de uma página de produto e os valores esperados de cada sabor.
+
+    Args:
+        n_sabores: Quantidade de sabores (um bloco "INFORMAÇÃO NUTRICIONAL" por sabor)
+        formato: 'tabela', 'paragrafo' ou 'texto' (texto corrido)
+        tamanho_kb: Tamanho aproximado do HTML final, completado com marcação de layout
+        seed: Semente para valores reproduzíveis
+        nome: Nome do produto (padrão: derivado da semente e do número de sabores)
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}")
+    rng = random.Random(seed)
+    sabores = (SABORES * (n_sabores // len(SABORES) + 1))[:n_sabores]
+    nome = nome or f"Produto Sintético {seed} ({n_sabores} sabores) - Pura vida"
+    blocos, esperados = [], []
+    for sabor in sabores:
+        html_sabor, valores = _bloco_sabor(rng, sabor, formato)
+        blocos.append(f'<p><strong>Ingredientes {sabor}:</strong> Proteína de soro do leite isolada.</p>')
+        blocos.append(html_sabor)
+        esperados.append({'sabor': sabor, **valores})
+
+    cabecalho = (
+        '<html><head><meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">'
+        f'<title>{nome}</title></head><body><div class="dados_produto"><div class="nome">'
+        f'<h1 itemprop="name">{nome}</h1>'
+        '<div class="marca" itemprop="category" content="Whey Protein > Whey Protein Isolado">'
+        '<a href="https://www.corpoevidasuplementos.com.br/whey-protein-isolado">Whey Protein Isolado</a></div>'
+        '</div><span itemprop="price" content="223.07">223,07</span></div>'
+        '<article class="informacoes_produto"><div class="bloco_texto" id="informacoes" itemprop="description">'
+        f'<h2><span></span>Informações sobre {nome}</h2>' + PARAGRAFO_ENCHIMENTO * 3
+    )
+    rodape = '</div></article>'
+    html = cabecalho + ''.join(blocos) + rodape
+    # Completa com marcação de layout (menus, rodapé) até o tamanho desejado
+    item_menu = '<li class="menu"><a href="https://www.corpoevidasuplementos.com.br/categoria">Categoria</a></li>'
+    faltando = tamanho_kb * 1024 - len(html) - len('</body></html>')
+    if faltando > 0:
+        html += '<ul class="menu_rodape">' + item_menu * (faltando // len(item_menu) + 1) + '</ul>'
+    html += '</body></html>'
+    return html, esperados
+
+def gerar_corpus(seed: int = 0) -> List[Tuple[str, str]]:
+    """Corpus padrão do benchmark: combinações de sabores, formatos e tamanhos"""
+    corpus = []
+    for n_sabores in (1, 3, 8):
+        for formato in FORMATOS:
+            for tamanho_kb in (30, 120, 400):
+                html, _ = gerar_pagina(n_sabores, formato, tamanho_kb, seed)
+                corpus.append((f"sintetica_{n_sabores}s_{formato}_{tamanho_kb}kb", html))
+                seed += 1
+    return corpus
@@ -0,0 +1,297 @@
+"""
+Arquivo compactado de todas as páginas baixadas, no estilo WARC.
+
+Cada página vira um registro com cabeçalho WARC (URI, data, codificação,
+tamanho) e corpo compactado individualmente, acrescentado ao fim de arquivos
+de segmento grandes (dados/archive/segment-00000.warc, ...). Um índice à
+parte (index.tsv: data, URL, segmento, offset, tamanho, codec e dicionário)
+permite ler qualquer página pela URL e pela data sem percorrer os segmentos;
+a leitura é feita por mmap, descompactando só o registro pedido.
+
+A compactação usa zstandard quando instalado e, sem ele, deflate (zlib).
+Nos dois casos um dicionário compartilhado, treinado com páginas já
+arquivadas (train_dictionary), captura o cabeçalho, o menu e o rodapé
+repetidos em toda página da loja; cada registro guarda o id do dicionário
+usado, de modo que registros antigos continuam legíveis após um novo treino.
+
+Vários processos (--worker, --shard) podem gravar no mesmo diretório: a
+escolha do segmento, o acréscimo do registro e a linha do índice acontecem
+sob uma trava de arquivo (fcntl.flock em archive.lock), de modo que o offset
+lido com tell() é de fato onde o registro foi escrito.
+
+Assim é barato guardar o histórico de todas as páginas e extrair de novo
+qualquer subconjunto (--reextract) sem voltar ao site.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+import zlib
+from bisect import bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstandard é opcional; sem ele os registros usam deflate
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # sem fcntl (Windows) a trava vale só entre threads do processo
+    fcntl = None
+
+SEGMENT_BYTES = 256 * 1024 * 1024
+DICT_BYTES = {'zstd': 112 * 1024, 'deflate': 32 * 1024}
+
+class Record(NamedTuple):
+    timestamp: float
+    url: str
+    segment: str
+    offset: int
+    length: int
+    codec: str
+    dictionary: str
+
+# Trechos do HTML terminados em '>' (tag e o texto que a precede)
+_TRECHO = re.compile(rb'[^>]*>')
+
+def _treinar_deflate(amostras: List[bytes], tamanho: int) -> bytes:
+    """Trechos presentes em ao menos metade das páginas, os mais comuns no fim"""
+    contagem = Counter()
+    for html in amostras:
+        contagem.update({trecho.strip() for trecho in _TRECHO.findall(html) if len(trecho.strip()) >= 16})
+    minimo = max(2, len(amostras) // 2)
+    partes, total = [], 0
+    for trecho, n in contagem.most_common():
+        if n < minimo:
+            break
+        if total + len(trecho) > tamanho:
+            continue
+        partes.append(trecho)
+        total += len(trecho)
+    # O deflate alcança melhor o que está no fim do dicionário
+    return b''.join(reversed(partes))
+
+class PageArchive:
+    """Segmentos WARC com registros compactados + índice por URL e data"""
+
+    def __init__(self, path: str = 'dados/archive'):
+        self.path = path
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._indice: Optional[Dict[str, List[Record]]] = None
+        self._mapas: Dict[str, mmap.mmap] = {}
+        self._dicionarios: Dict[str, bytes] = {}
+        self._atual: Optional[Tuple[str, str]] = None
+
+    def enable(self, path: Optional[str] = None) -> None:
+        self.path = path or self.path
+        self.enabled = True
+
+    # ---------- escrita ----------
+
+    def _meta(self) -> dict:
+        caminho = os.path.join(self.path, 'dictionary.json')
+        if not os.path.exists(caminho):
+            return {}
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _dicionario(self, ident: str) -> bytes:
+        if ident not in self._dicionarios:
+            with open(os.path.join(self.path, f'dict-{ident}.bin'), 'rb') as f:
+                self._dicionarios[ident] = f.read()
+        return self._dicionarios[ident]
+
+    def _compactar(self, dados: bytes) -> Tuple[bytes, str, str]:
+        if self._atual is None:
+            meta = self._meta()
+            self._atual = (meta.get('codec') or ('zstd' if zstandard else 'deflate'), meta.get('current', '-'))
+        codec, ident = self._atual
+        if codec == 'zstd' and zstandard is None:
+            codec, ident = 'deflate', '-'
+        if codec == 'zstd':
+            dicionario = zstandard.ZstdCompressionDict(self._dicionario(ident)) if ident != '-' else None
+            return zstandard.ZstdCompressor(level=10, dict_data=dicionario).compress(dados), codec, ident
+        if ident != '-':
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=self._dicionario(ident))
+        else:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        return compressor.compress(dados) + compressor.flush(), codec, ident
+
+    def _segmento_atual(self) -> str:
+        segmentos = sorted(n for n in os.listdir(self.path) if n.startswith('segment-') and n.endswith('.warc'))
+        if not segmentos:
+            return 'segment-00000.warc'
+        ultimo = segmentos[-1]
+        if os.path.getsize(os.path.join(self.path, ultimo)) < SEGMENT_BYTES:
+            return ultimo
+        return f"segment-{int(ultimo[8:13]) + 1:05d}.warc"
+
+    @contextmanager
+    def _trava_escrita(self):
+        """Exclusão entre threads e, com fcntl, entre processos que gravam no mesmo diretório"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.path, 'archive.lock'), 'a') as trava:
+                fcntl.flock(trava, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(trava, fcntl.LOCK_UN)
+
+    def add(self, url: str, html: str, timestamp: Optional[float] = None) -> Optional[Record]:
+        """Acrescenta a página ao segmento atual e ao índice (nada se desativado)"""
+        if not self.enabled:
+            return None
+        dados = html.encode('utf-8')
+        momento = timestamp if timestamp is not None else datetime.now(timezone.utc).timestamp()
+        data = datetime.fromtimestamp(momento, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        os.makedirs(self.path, exist_ok=True)
+        corpo, codec, ident = self._compactar(dados)
+        cabecalho = (
+            "WARC/1.0\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"WARC-Date: {data}\r\n"
+            f"WARC-Payload-Digest: sha1:{hashlib.sha1(dados).hexdigest()}\r\n"
+            "Content-Type: text/html; charset=utf-8\r\n"
+            f"Content-Encoding: {codec}\r\n"
+            f"X-Dictionary-ID: {ident}\r\n"
+            f"Content-Length: {len(corpo)}\r\n\r\n"
+        ).encode('utf-8')
+        with self._trava_escrita():
+            segmento = self._segmento_atual()
+            with open(os.path.join(self.path, segmento), 'ab') as f:
+                offset = f.tell() + len(cabecalho)
+                f.write(cabecalho + corpo + b'\r\n\r\n')
+            registro = Record(momento, url, segmento, offset, len(corpo), codec, ident)
+            with open(os.path.join(self.path, 'index.tsv'), 'a', encoding='utf-8') as f:
+                f.write('\t'.join(str(campo) for campo in registro) + '\n')
+            if self._indice is not None:
+                self._indice.setdefault(url, []).append(registro)
+        return registro
+
+    def train_dictionary(self, amostras: int = 200) -> Optional[str]:
+        """Treina um dicionário com as versões mais recentes das páginas; devolve o id"""
+        paginas = [self.read(registro).encode('utf-8') for registro in self.latest()[-amostras:]]
+        if len(paginas) < 2:
+            return None
+        codec = 'zstd' if zstandard else 'deflate'
+        if codec == 'zstd':
+            dados = zstandard.train_dictionary(DICT_BYTES[codec], paginas).as_bytes()
+        else:
+            dados = _treinar_deflate(paginas, DICT_BYTES[codec])
+        if not dados:
+            return None
+        ident = hashlib.sha1(dados).hexdigest()[:12]
+        with open(os.path.join(self.path, f'dict-{ident}.bin'), 'wb') as f:
+            f.write(dados)
+        temporario = os.path.join(self.path, 'dictionary.json.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'codec': codec, 'current': ident}, f)
+        os.replace(temporario, os.path.join(self.path, 'dictionary.json'))
+        self._atual = None
+        return ident
+
+    # ---------- leitura ----------
+
+    def _carregar_indice(self) -> Dict[str, List[Record]]:
+        if self._indice is None:
+            indice: Dict[str, List[Record]] = {}
+            caminho = os.path.join(self.path, 'index.tsv')
+            if os.path.exists(caminho):
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    for linha in f:
+                        campos = linha.rstrip('\n').split('\t')
+                        if len(campos) != 7:
+                            continue
+                        registro = Record(float(campos[0]), campos[1], campos[2], int(campos[3]), int(campos[4]),
+                                          campos[5], campos[6])
+                        indice.setdefault(registro.url, []).append(registro)
+            for versoes in indice.values():
+                versoes.sort()
+            self._indice = indice
+        return self._indice
+
+    def _mapa(self, segmento: str, fim: int) -> mmap.mmap:
+        mapa = self._mapas.get(segmento)
+        if mapa is None or len(mapa) < fim:
+            # Segmento cresceu desde o último mapeamento
+            if mapa is not None:
+                mapa.close()
+            with open(os.path.join(self.path, segmento), 'rb') as f:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapas[segmento] = mapa
+        return mapa
+
+    def read(self, registro: Record) -> str:
+        """HTML do registro, descompactado a partir do segmento mapeado"""
+        fim = registro.offset + registro.length
+        with self._lock:
+            corpo = self._mapa(registro.segment, fim)[registro.offset:fim]
+        dicionario = self._dicionario(registro.dictionary) if registro.dictionary != '-' else None
+        if registro.codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("registro compactado com zstd: instale o pacote zstandard")
+            dados = zstandard.ZstdDecompressor(
+                dict_data=zstandard.ZstdCompressionDict(dicionario) if dicionario else None).decompress(corpo)
+        else:
+            descompactador = zlib.decompressobj(-15, zdict=dicionario) if dicionario else zlib.decompressobj(-15)
+            dados = descompactador.decompress(corpo) + descompactador.flush()
+        return dados.decode('utf-8')
+
+    def get(self, url: str, at: Optional[float] = None) -> Optional[Record]:
+        """Versão mais recente da URL (ou a vigente no instante `at`)"""
+        versoes = self._carregar_indice().get(url)
+        if not versoes:
+            return None
+        if at is None:
+            return versoes[-1]
+        posicao = bisect_right([registro.timestamp for registro in versoes], at)
+        return versoes[posicao - 1] if posicao else None
+
+    def history(self, url: str) -> List[Record]:
+        return list(self._carregar_indice().get(url, []))
+
+    def latest(self, since: Optional[float] = None, until: Optional[float] = None,
+               contains: Optional[str] = None) -> List[Record]:
+        """Versão mais recente de cada URL, filtrada por data e trecho da URL, em ordem de data"""
+        registros = []
+        for url, versoes in self._carregar_indice().items():
+            if contains and contains not in url:
+                continue
+            registro = versoes[-1] if until is None else self.get(url, until)
+            if registro is None or (since is not None and registro.timestamp < since):
+                continue
+            registros.append(registro)
+        return sorted(registros)
+
+    def pages(self, registros: List[Record]) -> Iterator[Tuple[Record, str]]:
+        for registro in registros:
+            yield registro, self.read(registro)
+
+    def stats(self) -> Dict[str, int]:
+        indice = self._carregar_indice()
+        segmentos = {r.segment for versoes in indice.values() for r in versoes}
+        return {
+            'urls': len(indice),
+            'records': sum(len(versoes) for versoes in indice.values()),
+            'segments': len(segmentos),
+            'bytes': sum(os.path.getsize(os.path.join(self.path, s)) for s in segmentos),
+        }
+
+    def close(self) -> None:
+        for mapa in self._mapas.values():
+            mapa.close()
+        self._mapas.clear()
+
+archive = PageArchive()
@@ -1,5 +1,6 @@
 import os
 import platform
+import re
 import shutil
 from typing import Optional, Tuple
 from selenium import webdriver
@@ -11,13 +12,25 @@ from webdriver_manager.firefox import GeckoDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from rich.console import Console
 from rich.panel import Panel
+import sys
 import traceback
 
-console = Console()
+# Adiciona o diretório pai ao path para importar os módulos do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def get_chrome_options(headless: bool = False) -> webdriver.ChromeOptions:
+from config.utils import register_console
+
+console = register_console(Console())
+
+# Limite do cache em disco de um perfil persistente (JS, CSS, fontes e imagens da loja)
+DISK_CACHE_BYTES = 256 * 1024 * 1024
+
+def get_chrome_options(headless: bool = False, profile_dir: Optional[str] = None) -> webdriver.ChromeOptions:
     """
     Configura as opções do Chrome para melhor compatibilidade.
+
+    Com profile_dir, usa esse user-data-dir persistente (e o cache em disco
+    dele) em vez de um perfil descartável; ver config.profiles.
     """
     options = webdriver.ChromeOptions()
     
@@ -42,13 +55,18 @@ def get_chrome_options(headless: bool = False) -> webdriver.ChromeOptions:
     options.add_experimental_option('useAutomationExtension', False)
     options.add_experimental_option('prefs', {'profile.default_content_setting_values.notifications': 2})
     
+    # Perfil persistente: recursos estáticos vêm do cache a partir da segunda página
+    if profile_dir:
+        options.add_argument(f'--user-data-dir={os.path.abspath(profile_dir)}')
+        options.add_argument(f'--disk-cache-size={DISK_CACHE_BYTES}')
+    
     # Modo headless se solicitado
     if headless:
         options.add_argument('--headless=new')
     
     return options
 
-def get_firefox_options(headless: bool = False) -> webdriver.FirefoxOptions:
+def get_firefox_options(headless: bool = False, profile_dir: Optional[str] = None) -> webdriver.FirefoxOptions:
     """
     Configura as opções do Firefox para melhor compatibilidade.
     """
@@ -61,6 +79,13 @@ def get_firefox_options(headless: bool = False) -> webdriver.FirefoxOptions:
     # Configurações para simular um navegador normal
     options.set_preference('general.useragent.override', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0')
     
+    # Perfil persistente (o cache de disco fica dentro dele)
+    if profile_dir:
+        options.add_argument('-profile')
+        options.add_argument(os.path.abspath(profile_dir))
+        options.set_preference('browser.cache.disk.enable', True)
+        options.set_preference('browser.cache.disk.capacity', DISK_CACHE_BYTES // 1024)
+    
     # Modo headless se solicitado
     if headless:
         options.add_argument('--headless')
@@ -134,13 +159,15 @@ def detect_browsers() -> list[str]:
     
     return navegadores_encontrados
 
-def setup_driver(browser_preference: Optional[str] = None, headless: bool = False) -> Tuple[webdriver.Remote, str]:
+def setup_driver(browser_preference: Optional[str] = None, headless: bool = False,
+                 profile_dir: Optional[str] = None) -> Tuple[webdriver.Remote, str]:
     """
     Configura e retorna o WebDriver apropriado baseado na preferência ou disponibilidade.
     
     Args:
         browser_preference: Navegador preferido ('chrome', 'firefox' ou 'edge')
         headless: Se True, executa o navegador em modo headless
+        profile_dir: Diretório de perfil persistente (Chrome e Firefox); None = perfil descartável
         
     Returns:
         Tuple contendo o driver configurado e o nome do navegador usado
@@ -158,7 +185,7 @@ def setup_driver(browser_preference: Optional[str] = None, headless: bool = Fals
     try:
         if browser_to_use == "chrome":
             console.print("Configurando Chrome/Chromium...")
-            options = get_chrome_options(headless)
+            options = get_chrome_options(headless, profile_dir)
             
             # Detecta o binário do Chrome/Chromium
             chrome_binary = find_browser_binary(["google-chrome", "chromium", "chromium-browser"])
@@ -194,7 +221,7 @@ def setup_driver(browser_preference: Optional[str] = None, headless: bool = Fals
             
         elif browser_to_use == "firefox":
             console.print("Configurando Firefox...")
-            options = get_firefox_options(headless)
+            options = get_firefox_options(headless, profile_dir)
             
             console.print("Instalando GeckoDriver...")
             service = FirefoxService(GeckoDriverManager().install())
@@ -224,16 +251,18 @@ def setup_driver(browser_preference: Optional[str] = None, headless: bool = Fals
         if browser_preference and len(navegadores_disponiveis) > 1:
             outros_navegadores = [b for b in navegadores_disponiveis if b != browser_preference]
             console.print(f"\n[yellow]Tentando com o próximo navegador disponível: {outros_navegadores[0]}[/yellow]")
-            return setup_driver(outros_navegadores[0], headless)
+            return setup_driver(outros_navegadores[0], headless, profile_dir)
         raise
 
-def get_browser_driver(preferred_browser: Optional[str] = None, headless: bool = False) -> Tuple[webdriver.Remote, str]:
+def get_browser_driver(preferred_browser: Optional[str] = None, headless: bool = False,
+                       profile_dir: Optional[str] = None) -> Tuple[webdriver.Remote, str]:
     """
     Função principal para obter um driver de navegador configurado.
     
     Args:
         preferred_browser: Navegador preferido ('chrome', 'firefox' ou 'edge')
         headless: Se True, executa o navegador em modo headless
+        profile_dir: Diretório de perfil persistente (ver config.profiles)
         
     Returns:
         Tuple contendo o driver configurado e o nome do navegador usado
@@ -246,7 +275,57 @@ def get_browser_driver(preferred_browser: Optional[str] = None, headless: bool =
     
     console.print("Navegadores encontrados:", ", ".join(navegadores))
     
-    return setup_driver(preferred_browser, headless)
+    return setup_driver(preferred_browser, headless, profile_dir)
+
+# Bytes transferidos pela rede na página atual e recursos servidos pelo cache
+# (transferSize 0 com corpo não vazio), pela Navigation/Resource Timing API
+_TRANSFERENCIA_JS = """
+const entradas = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+let bytes = 0, cache = 0;
+for (const e of entradas) {
+    bytes += e.transferSize || 0;
+    if (e.transferSize === 0 && e.decodedBodySize > 0) cache += 1;
+}
+return [bytes, cache];
+"""
+
+def measure_transfer(driver) -> Tuple[int, int]:
+    """(bytes transferidos pela rede, recursos vindos do cache) da página carregada"""
+    try:
+        bytes_rede, do_cache = driver.execute_script(_TRANSFERENCIA_JS)
+        return int(bytes_rede), int(do_cache)
+    except Exception:
+        return 0, 0
+
+# Status HTTP da navegação (Navigation Timing nível 2: Chrome 109+, Firefox 119+)
+_STATUS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav && nav.responseStatus ? nav.responseStatus : 0;
+"""
+# Título das páginas de erro padrão ("503 Service Unavailable", "Error 429"...); exige a
+# frase do status para não confundir com produtos como "500 g Whey"
+_TITULO_ERRO = re.compile(
+    r'^\s*(?:(?:HTTP\s*)?(\d{3})\s*[-:]?\s*(?:Too Many Requests|Internal Server Error|Bad Gateway|'
+    r'Service (?:Temporarily )?Unavailable|Gateway Time-?out|Not Found|Gone)\b|Error\s+(\d{3})\b)',
+    re.IGNORECASE)
+
+def response_status(driver) -> Optional[int]:
+    """
+    Status HTTP da página carregada, que o WebDriver não expõe diretamente.
+    Lido da Navigation Timing API ou, em navegadores sem responseStatus,
+    deduzido do título das páginas de erro; None se não for possível saber.
+    Cabeçalhos como Retry-After continuam inacessíveis por esse caminho.
+    """
+    try:
+        status = int(driver.execute_script(_STATUS_JS) or 0)
+        if status:
+            return status
+        match = _TITULO_ERRO.match(driver.title or '')
+    except Exception:
+        return None
+    if match:
+        return int(match.group(1) or match.group(2))
+    return None
 
 if __name__ == "__main__":
     # Exemplo de uso
@@ -0,0 +1,198 @@
+"""
+Canonicalização de kits para o produto base.
+
+Boa parte do catálogo são kits ("kit-2-un-glutamina-300g-pura-vida",
+"kit-3-unidades-...") com o mesmo bloco nutricional do produto avulso. Pelas
+regras de slug cada kit é associado ao produto base (ou, se o avulso não
+estiver no catálogo, ao menor kit do mesmo produto). A associação só passa a
+valer depois de confirmada pela impressão digital nutricional: na primeira
+vez kit e base são baixados e comparados; com a confirmação, nas coletas
+seguintes o kit não é mais baixado e as suas linhas são derivadas das do
+produto canônico (mesmos valores, nome, URL e categoria do kit).
+
+Se a impressão digital do produto canônico mudar, os kits voltam a ser
+pendentes e são baixados de novo para uma nova comparação.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from .nutrients import NUTRIENT_COLUMNS
+
+# kit-2-un-..., kit-3-unidades-..., kit-2un-..., kit-3unid-...
+KIT = re.compile(r'^kit-?(\d+)-?(?:unidades|unid|un)?-(.+)$')
+# Cópias do mesmo produto na loja ganham um sufixo numérico ("...-pura-vida-1")
+_COPIA = re.compile(r'(-pura-vida)-\d+$')
+
+def slug_of(url: str) -> str:
+    return urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+def product_key(slug: str) -> str:
+    """Slug sem o sufixo de cópia, para comparar kit e produto base"""
+    return _COPIA.sub(r'\1', slug)
+
+def parse_kit(url: str) -> Optional[Tuple[int, str]]:
+    """(quantidade, chave do produto base) para URLs de kit; None para produtos avulsos"""
+    match = KIT.match(slug_of(url))
+    if not match or not re.search(r'[a-z]', match.group(2)):
+        return None
+    return int(match.group(1)), product_key(match.group(2))
+
+def _sufixo(row_url: str, url: str) -> str:
+    """Parte da URL da linha após a URL da página (ex.: '?sabor=neutro')"""
+    return row_url[len(url):] if row_url.startswith(url) else row_url
+
+def nutrition_fingerprint(df, url: str) -> Optional[str]:
+    """
+    Hash da porção e dos nutrientes de cada sabor, sem nome, URL ou categoria
+
+    None se todos os nutrientes forem zero ou vazios: páginas quebradas teriam
+    a mesma impressão digital e um kit e uma base quebrados se confirmariam.
+    """
+    if df is None or df.empty:
+        return None
+    nutrientes = [c for c in NUTRIENT_COLUMNS if c in df.columns]
+    import pandas as pd
+    valores = df[nutrientes].apply(pd.to_numeric, errors='coerce').fillna(0)
+    if not valores.to_numpy().any():
+        return None
+    colunas = ['PORCAO (g)'] + nutrientes
+    linhas = sorted(
+        '\x1f'.join([_sufixo(str(linha['URL']), url)] + [str(linha[c]) for c in colunas])
+        for _, linha in df.iterrows()
+    )
+    return hashlib.sha1('\n'.join(linhas).encode('utf-8')).hexdigest()[:16]
+
+class CanonicalIndex:
+    """Kits confirmados, pendentes ou rejeitados, persistidos em JSON"""
+
+    def __init__(self, path: str = 'dados/canonical_index.json'):
+        self.path = path
+        self.kits: Dict[str, dict] = {}
+        self.fingerprints: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                estado = json.load(f)
+            self.kits = estado.get('kits', {})
+            self.fingerprints = estado.get('fingerprints', {})
+
+    def resolve(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Associa cada kit da lista à URL canônica pelas regras de slug"""
+        urls = list(dict.fromkeys(urls))
+        avulsos: Dict[str, str] = {}
+        kits: Dict[str, List[Tuple[int, str]]] = {}
+        for url in urls:
+            kit = parse_kit(url)
+            if kit is None:
+                avulsos.setdefault(product_key(slug_of(url)), url)
+            else:
+                kits.setdefault(kit[1], []).append((kit[0], url))
+        # Sem o produto avulso no catálogo, o menor kit do mesmo produto é o canônico
+        canonicos = {chave: avulsos.get(chave) or min(grupo)[1] for chave, grupo in kits.items()}
+        mapa = {}
+        for chave, grupo in kits.items():
+            for quantidade, url in grupo:
+                canonico = canonicos[chave]
+                if canonico == url:
+                    continue
+                mapa[url] = canonico
+                entrada = self.kits.get(url)
+                if entrada is None or entrada['canonical'] != canonico:
+                    self.kits[url] = {'canonical': canonico, 'quantity': quantidade, 'status': 'pending',
+                                      'fingerprint': None, 'rows': {}}
+        return mapa
+
+    def plan(self, urls: Iterable[str]) -> Tuple[List[str], Dict[str, List[str]], Set[str]]:
+        """
+        Separa o que precisa ser baixado do que pode ser derivado
+
+        Returns:
+            (URLs a baixar, {canônica: [kits derivados dela]},
+             canônicas incluídas só para derivar kits, fora da lista original)
+        """
+        urls = list(dict.fromkeys(urls))
+        mapa = self.resolve(urls)
+        fila: Dict[str, None] = {}
+        derivados: Dict[str, List[str]] = {}
+        for url in urls:
+            canonico = mapa.get(url)
+            if canonico is not None and self.kits[url]['status'] == 'confirmed':
+                derivados.setdefault(canonico, []).append(url)
+                fila.setdefault(canonico)
+            else:
+                fila.setdefault(url)
+        originais = set(urls)
+        return list(fila), derivados, {url for url in derivados if url not in originais}
+
+    def record(self, url: str, df) -> List[str]:
+        """
+        Registra o resultado de uma página baixada e confirma ou rejeita kits
+
+        Returns:
+            Kits confirmados desta canônica cuja impressão digital deixou de
+            bater (precisam ser baixados de novo)
+        """
+        impressao = nutrition_fingerprint(df, url)
+        if impressao is None:
+            # Sem impressão digital nada é confirmado; a anterior não vale mais para esta página
+            self.fingerprints.pop(url, None)
+            return []
+        self.fingerprints[url] = impressao
+        entrada = self.kits.get(url)
+        if entrada is not None:
+            entrada['rows'] = {_sufixo(str(linha['URL']), url): [linha['NOME_PRODUTO'], linha['CATEGORIA']]
+                               for _, linha in df.iterrows()}
+            self._comparar(url, entrada)
+        invalidados = []
+        for kit, entrada in self.kits.items():
+            if entrada['canonical'] != url:
+                continue
+            if entrada['status'] == 'confirmed' and entrada['fingerprint'] != impressao:
+                entrada['status'] = 'pending'
+                invalidados.append(kit)
+            elif entrada['status'] != 'confirmed':
+                self._comparar(kit, entrada)
+        return invalidados
+
+    def _comparar(self, kit: str, entrada: dict) -> None:
+        do_kit = self.fingerprints.get(kit)
+        da_base = self.fingerprints.get(entrada['canonical'])
+        if do_kit is None or da_base is None:
+            return
+        entrada['status'] = 'confirmed' if do_kit == da_base else 'rejected'
+        entrada['fingerprint'] = da_base
+
+    def derive(self, kit: str, df):
+        """Linhas do kit a partir do DataFrame da canônica (None se não confirmado)"""
+        entrada = self.kits.get(kit)
+        if entrada is None or entrada['status'] != 'confirmed':
+            return None
+        canonico = entrada['canonical']
+        if nutrition_fingerprint(df, canonico) != entrada['fingerprint']:
+            return None
+        derivado = df.copy()
+        for indice, linha in df.iterrows():
+            sufixo = _sufixo(str(linha['URL']), canonico)
+            nome, categoria = entrada['rows'].get(sufixo, [linha['NOME_PRODUTO'], linha['CATEGORIA']])
+            derivado.at[indice, 'NOME_PRODUTO'] = nome
+            derivado.at[indice, 'URL'] = kit + sufixo
+            derivado.at[indice, 'CATEGORIA'] = categoria
+        return derivado
+
+    def stats(self) -> Dict[str, int]:
+        contagem = {'confirmed': 0, 'pending': 0, 'rejected': 0}
+        for entrada in self.kits.values():
+            contagem[entrada['status']] += 1
+        return contagem
+
+    def save(self) -> None:
+        """Grava o índice de forma atômica"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporario = self.path + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'kits': self.kits, 'fingerprints': self.fingerprints}, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.path)
@@ -0,0 +1,130 @@
+"""
+Controle adaptativo de concorrência (AIMD) para o loop de scraping.
+
+O limite de requisições simultâneas sobe de forma aditiva (+1 a cada janela
+de `limite` respostas saudáveis) enquanto a latência fica perto da linha de
+base e cai de forma multiplicativa (x0,5) quando a loja sinaliza sobrecarga:
+429, 5xx, timeouts ou falhas do WebDriver. Um `Retry-After` pausa o envio de
+novas requisições até o prazo indicado. Cortes seguidos dentro da mesma
+janela contam uma vez só, como no controle de congestionamento do TCP. As
+falhas são classificadas por config.retry.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from . import metrics
+from .retry import ScrapeError, classify
+
+class AIMDController:
+    """Limite dinâmico de requisições em andamento"""
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 16,
+                 latency_factor: float = 2.0, decrease: float = 0.5):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_factor = latency_factor
+        self.decrease = decrease
+        self.in_flight = 0
+        self.pause_until = 0.0
+        # Latência de referência: menor média móvel observada
+        self.latency_ewma: Optional[float] = None
+        self.latency_base: Optional[float] = None
+        self._saudaveis = 0
+        self._ultimo_corte = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Bloqueia até haver vaga dentro do limite e fora de pausas de Retry-After"""
+        with self._cond:
+            while True:
+                espera = self.pause_until - time.monotonic()
+                if espera <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self._cond.wait(timeout=espera if espera > 0 else None)
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        """Resposta saudável: atualiza a latência e, ao fim da janela, soma 1 ao limite"""
+        with self._cond:
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            self.latency_base = self.latency_ewma if self.latency_base is None else min(self.latency_base, self.latency_ewma)
+            if self.latency_ewma > self.latency_factor * self.latency_base:
+                # Fila crescendo do lado da loja: segura o limite sem cortar
+                self._saudaveis = 0
+                return
+            self._saudaveis += 1
+            if self._saudaveis >= int(self.limit):
+                self._saudaveis = 0
+                self.limit = min(self.maximum, self.limit + 1)
+                self._cond.notify_all()
+            self._publicar()
+
+    def record_error(self, erro: ScrapeError) -> None:
+        """Reage a uma falha classificada: só as transitórias reduzem o limite"""
+        if erro.transient and not getattr(erro, 'counted', False):
+            erro.counted = True
+            metrics.THROTTLED.inc(reason=erro.category)
+            self.record_throttle(getattr(erro, 'retry_after', None))
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        """429/5xx/timeout/falha do driver: corte multiplicativo e pausa opcional"""
+        with self._cond:
+            agora = time.monotonic()
+            if retry_after:
+                self.pause_until = max(self.pause_until, agora + retry_after)
+            # Um corte por janela: respostas já em voo refletem o limite antigo
+            janela = self.latency_ewma or 1.0
+            if agora - self._ultimo_corte >= janela:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self._ultimo_corte = agora
+            self._saudaveis = 0
+            self._publicar()
+
+    def _publicar(self) -> None:
+        metrics.CONCURRENCY_LIMIT.set(int(self.limit))
+
+def run_adaptive(tarefa: Callable[[Any], Any], itens: Iterable[Any],
+                 controller: AIMDController) -> Iterator[Tuple[Any, Any, Optional[ScrapeError]]]:
+    """
+    Executa `tarefa(item)` em threads respeitando o limite do controlador.
+
+    Gera (item, resultado, erro) na ordem de conclusão. Exceções são
+    classificadas; as transitórias (429/5xx, timeouts, falhas do driver)
+    cortam o limite, usando o Retry-After quando informado.
+    """
+    def executar(item):
+        inicio = time.perf_counter()
+        try:
+            resultado = tarefa(item)
+        except Exception as e:
+            erro = classify(e, str(item))
+            controller.record_error(erro)
+            return item, None, erro
+        finally:
+            controller.release()
+        controller.record_success(time.perf_counter() - inicio)
+        return item, resultado, None
+
+    with ThreadPoolExecutor(max_workers=controller.maximum) as executor:
+        pendentes = set()
+        for item in itens:
+            controller.acquire()
+            pendentes.add(executor.submit(executar, item))
+            # Entrega o que já terminou sem esperar o envio de todos os itens
+            prontos = {f for f in pendentes if f.done()}
+            for futuro in prontos:
+                yield futuro.result()
+            pendentes -= prontos
+        while pendentes:
+            prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                yield futuro.result()
@@ -0,0 +1,104 @@
+"""
+Diferenças entre duas coletas do CSV de nutrientes.
+
+As duas versões são unidas pela chave de deduplicação (NOME_PRODUTO, a mesma
+de save_incremental) com um hash join (merge externo do pandas). Os deltas
+saem de uma única comparação vetorizada entre as matrizes numéricas das
+colunas nutricionais, sem laço por produto, e o relatório fica no formato
+longo, uma linha por produto incluído, removido ou por valor alterado:
+
+    NOME_PRODUTO, STATUS, COLUNA, ANTES, DEPOIS, DELTA, DELTA_PCT
+
+Após uma coleta o CSV novo ainda traz as linhas antigas (save_incremental só
+inclui ou substitui); com a lista de URLs da coleta, as linhas cuja página não
+está nela contam como removidas.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .nutrients import NUTRIENT_COLUMNS
+
+KEY = 'NOME_PRODUTO'
+COLUNAS_COMPARADAS = ['PORCAO (g)'] + NUTRIENT_COLUMNS
+RELATORIO = ['NOME_PRODUTO', 'STATUS', 'URL', 'CATEGORIA', 'COLUNA', 'ANTES', 'DEPOIS', 'DELTA', 'DELTA_PCT']
+# Diferenças menores que isso são ruído de arredondamento do CSV
+TOLERANCIA = 1e-6
+
+def _matriz(df: pd.DataFrame, colunas: List[str]) -> np.ndarray:
+    return df[colunas].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+def _nas_paginas(df: pd.DataFrame, urls: Iterable[str]) -> pd.DataFrame:
+    """Linhas cuja página (URL sem o ?sabor=) está em `urls`; linhas sem URL ficam"""
+    if 'URL' not in df.columns:
+        return df
+    paginas = df['URL'].astype(str).str.split('?', n=1).str[0]
+    return df[df['URL'].isna() | paginas.isin(set(urls))]
+
+def diff_snapshots(antigo: pd.DataFrame, novo: pd.DataFrame, key: str = KEY,
+                   urls: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Relatório de produtos incluídos ('added'), removidos ('removed') e valores alterados ('changed')
+
+    Com `urls` (páginas da coleta que gerou `novo`), as linhas de `novo` de
+    páginas fora da lista são ignoradas e, se estavam em `antigo`, saem como removidas.
+    """
+    if urls is not None:
+        novo = _nas_paginas(novo, urls)
+    antigo = antigo.drop_duplicates(subset=[key], keep='last')
+    novo = novo.drop_duplicates(subset=[key], keep='last')
+    colunas = [c for c in COLUNAS_COMPARADAS if c in antigo.columns and c in novo.columns]
+    juntos = antigo.merge(novo, on=key, how='outer', suffixes=('_antes', ''), indicator=True, sort=False)
+    lado = juntos['_merge'].to_numpy()
+    for coluna in ('URL', 'CATEGORIA'):
+        if coluna in juntos.columns and f'{coluna}_antes' in juntos.columns:
+            juntos[coluna] = juntos[coluna].fillna(juntos[f'{coluna}_antes'])
+
+    partes = []
+    for status, origem in (('added', 'right_only'), ('removed', 'left_only')):
+        linhas = juntos[lado == origem]
+        partes.append(pd.DataFrame({'NOME_PRODUTO': linhas[key], 'STATUS': status,
+                                    'URL': linhas.get('URL'), 'CATEGORIA': linhas.get('CATEGORIA')}))
+
+    ambos = juntos[lado == 'both']
+    antes = _matriz(ambos, [f'{c}_antes' for c in colunas])
+    depois = _matriz(ambos, colunas)
+    delta = depois - antes
+    mudou = (np.abs(delta) > TOLERANCIA) | (np.isnan(antes) != np.isnan(depois))
+    linha, coluna = np.nonzero(mudou)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = np.where(antes[linha, coluna] != 0, delta[linha, coluna] / np.abs(antes[linha, coluna]) * 100, np.nan)
+    partes.append(pd.DataFrame({
+        'NOME_PRODUTO': ambos[key].to_numpy()[linha],
+        'STATUS': 'changed',
+        'URL': ambos['URL'].to_numpy()[linha] if 'URL' in ambos.columns else None,
+        'CATEGORIA': ambos['CATEGORIA'].to_numpy()[linha] if 'CATEGORIA' in ambos.columns else None,
+        'COLUNA': np.asarray(colunas, dtype=object)[coluna],
+        'ANTES': antes[linha, coluna],
+        'DEPOIS': depois[linha, coluna],
+        'DELTA': delta[linha, coluna],
+        'DELTA_PCT': np.round(pct, 1),
+    }))
+    partes = [parte for parte in partes if not parte.empty]
+    if not partes:
+        return pd.DataFrame(columns=RELATORIO)
+    return pd.concat(partes, ignore_index=True).reindex(columns=RELATORIO)
+
+def summarize(relatorio: pd.DataFrame) -> Dict[str, int]:
+    """Produtos incluídos, removidos e alterados, e total de valores alterados"""
+    alterados = relatorio[relatorio['STATUS'] == 'changed']
+    return {
+        'added': int((relatorio['STATUS'] == 'added').sum()),
+        'removed': int((relatorio['STATUS'] == 'removed').sum()),
+        'changed': int(alterados['NOME_PRODUTO'].nunique()),
+        'values_changed': len(alterados),
+    }
+
+def diff_files(antigo: str, novo: str, saida: str,
+               urls: Optional[Iterable[str]] = None) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """Compara dois CSVs e grava o relatório em `saida`"""
+    relatorio = diff_snapshots(pd.read_csv(antigo), pd.read_csv(novo), urls=urls)
+    relatorio.to_csv(saida, index=False)
+    return relatorio, summarize(relatorio)
@@ -0,0 +1,70 @@
+"""
+Download de páginas via HTTP simples (sem navegador).
+
+As páginas de produto da loja são renderizadas no servidor, então o HTML
+obtido por uma requisição GET é suficiente para o parser. Este módulo expõe
+o status HTTP e os cabeçalhos (ex.: Retry-After, ETag), que o Selenium não
+disponibiliza.
+"""
+
+import re
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, NamedTuple, Optional
+
+from .retry import THROTTLE_STATUS, NotFound, ScrapeError, Throttled, parse_retry_after
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36')
+
+# O site declara ISO-8859-1; usado quando o Content-Type não informa o charset
+DEFAULT_CHARSET = 'iso-8859-1'
+
+class PageResponse(NamedTuple):
+    url: str
+    status: int
+    headers: Dict[str, str]
+    html: str
+    elapsed: float
+    size: int
+
+def _charset(content_type: str) -> str:
+    match = re.search(r'charset=([\w-]+)', content_type or '', re.IGNORECASE)
+    return match.group(1) if match else DEFAULT_CHARSET
+
+def fetch_html(url: str, timeout: float = 30.0, etag: Optional[str] = None,
+               last_modified: Optional[str] = None) -> PageResponse:
+    """
+    Faz o GET da página e retorna status, cabeçalhos e HTML decodificado.
+
+    Respostas 304 e de erro HTTP (4xx/5xx) não levantam exceção: retornam
+    PageResponse com o status correspondente e html vazio. Falhas de rede e
+    timeouts propagam a exceção original.
+    """
+    headers = {'User-Agent': USER_AGENT, 'Accept': 'text/html', 'Accept-Language': 'pt-BR,pt;q=0.9'}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    requisicao = urllib.request.Request(url, headers=headers)
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+            corpo = resposta.read()
+            cabecalhos = dict(resposta.headers.items())
+            status = resposta.status
+    except urllib.error.HTTPError as e:
+        cabecalhos = dict(e.headers.items()) if e.headers else {}
+        return PageResponse(url, e.code, cabecalhos, '', time.perf_counter() - inicio, 0)
+    html = corpo.decode(_charset(cabecalhos.get('Content-Type', '')), errors='replace')
+    return PageResponse(url, status, cabecalhos, html, time.perf_counter() - inicio, len(corpo))
+
+def raise_for_status(resposta: PageResponse) -> None:
+    """Converte respostas de erro em falhas classificadas (304 não é erro)"""
+    if resposta.status in THROTTLE_STATUS:
+        raise Throttled(resposta.status, parse_retry_after(resposta.headers.get('Retry-After')), resposta.url)
+    if resposta.status in (404, 410):
+        raise NotFound(f"HTTP {resposta.status}", resposta.url)
+    if resposta.status >= 400:
+        raise ScrapeError(f"HTTP {resposta.status}", resposta.url)
@@ -0,0 +1,163 @@
+"""
+Observabilidade de memória para coletas longas.
+
+A cada N URLs tira um snapshot do tracemalloc, compara com o snapshot inicial
+e lista os pontos de alocação que mais cresceram. Também registra o RSS do
+processo Python e dos processos filhos (navegador e driver), usando psutil
+quando disponível ou /proc no Linux.
+"""
+
+import json
+import os
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .utils import print_step, print_progress
+
+try:
+    import psutil
+except ImportError:  # psutil é opcional
+    psutil = None
+
+def _rss_proc(pid: int) -> int:
+    """RSS em bytes lido de /proc/<pid>/status (Linux)"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for linha in f:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def _filhos_proc(pid: int) -> List[int]:
+    """PIDs descendentes lidos de /proc/<pid>/task/*/children (Linux)"""
+    filhos = []
+    pendentes = [pid]
+    while pendentes:
+        atual = pendentes.pop()
+        try:
+            tarefas = os.listdir(f'/proc/{atual}/task')
+        except OSError:
+            continue
+        for tarefa in tarefas:
+            try:
+                with open(f'/proc/{atual}/task/{tarefa}/children', 'r') as f:
+                    novos = [int(p) for p in f.read().split()]
+            except OSError:
+                continue
+            filhos.extend(novos)
+            pendentes.extend(novos)
+    return filhos
+
+def process_rss() -> Dict[str, float]:
+    """Retorna o RSS (MB) do processo atual e a soma dos processos filhos"""
+    pid = os.getpid()
+    if psutil is not None:
+        processo = psutil.Process(pid)
+        proprio = processo.memory_info().rss
+        descendentes = processo.children(recursive=True)
+        filhos = 0
+        for filho in descendentes:
+            try:
+                filhos += filho.memory_info().rss
+            except psutil.Error:
+                continue
+        n_filhos = len(descendentes)
+    elif os.path.exists(f'/proc/{pid}/status'):
+        proprio = _rss_proc(pid)
+        pids = _filhos_proc(pid)
+        filhos = sum(_rss_proc(p) for p in pids)
+        n_filhos = len(pids)
+    else:
+        import resource
+        # ru_maxrss é o pico (KB no Linux, bytes no macOS); melhor do que nada
+        proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        filhos, n_filhos = 0, 0
+    return {'rss_mb': proprio / 2**20, 'children_rss_mb': filhos / 2**20, 'children': n_filhos}
+
+class MemoryTracker:
+    """Snapshots periódicos do tracemalloc e do RSS durante a coleta"""
+
+    def __init__(self):
+        self.enabled = False
+        self.every = 50
+        self.top = 10
+        self.output_file: Optional[str] = None
+        self.ceiling_mb: Optional[float] = None
+        self._contador = 0
+        self._inicial = None
+        self._rss_inicial: Optional[float] = None
+        self.historico: List[dict] = []
+
+    def enable(self, every: int = 50, top: int = 10, output_file: Optional[str] = 'dados/memory.jsonl',
+               ceiling_mb: Optional[float] = None, frames: int = 5) -> None:
+        self.enabled = True
+        self.every, self.top, self.output_file, self.ceiling_mb = every, top, output_file, ceiling_mb
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._inicial = tracemalloc.take_snapshot()
+        self._rss_inicial = process_rss()['rss_mb']
+
+    def tick(self, url: str = '') -> None:
+        """Chamado após cada URL; a cada `every` URLs registra um snapshot"""
+        if not self.enabled:
+            return
+        self._contador += 1
+        if self._contador % self.every == 0:
+            self.snapshot(url)
+
+    def snapshot(self, url: str = '') -> dict:
+        """Registra RSS e os maiores crescimentos de alocação desde o início"""
+        filtros = [tracemalloc.Filter(False, tracemalloc.__file__),
+                   tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')]
+        atual = tracemalloc.take_snapshot().filter_traces(filtros)
+        diferencas = atual.compare_to(self._inicial.filter_traces(filtros), 'lineno')
+        crescimentos = [d for d in diferencas if d.size_diff > 0][:self.top]
+        rss = process_rss()
+        registro = {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'urls': self._contador,
+            'url': url,
+            'traced_mb': round(tracemalloc.get_traced_memory()[0] / 2**20, 2),
+            'rss_mb': round(rss['rss_mb'], 1),
+            'rss_growth_mb': round(rss['rss_mb'] - (self._rss_inicial or 0), 1),
+            'children_rss_mb': round(rss['children_rss_mb'], 1),
+            'children': rss['children'],
+            'top_growth': [
+                {'site': str(d.traceback[0]), 'size_kb': round(d.size_diff / 1024, 1), 'count': d.count_diff}
+                for d in crescimentos
+            ],
+        }
+        self.historico.append(registro)
+        if self.output_file:
+            os.makedirs(os.path.dirname(self.output_file) or '.', exist_ok=True)
+            with open(self.output_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._imprimir(registro)
+        return registro
+
+    def exceeded(self) -> bool:
+        """True se o crescimento de RSS passou do teto configurado"""
+        if not self.ceiling_mb or not self.historico:
+            return False
+        return self.historico[-1]['rss_growth_mb'] > self.ceiling_mb
+
+    def _imprimir(self, registro: dict) -> None:
+        print_step(f"Memória após {registro['urls']} URLs")
+        print_progress(f"RSS Python: {registro['rss_mb']:.1f} MB (+{registro['rss_growth_mb']:.1f} MB) | "
+                       f"tracemalloc: {registro['traced_mb']:.1f} MB | "
+                       f"navegador/driver: {registro['children_rss_mb']:.1f} MB em {registro['children']} processos")
+        for item in registro['top_growth']:
+            print_progress(f"+{item['size_kb']:>9.1f} KB ({item['count']:+d} blocos)  {item['site']}")
+        if self.exceeded():
+            print_progress(f"⚠ Crescimento de RSS acima do teto de {self.ceiling_mb:.0f} MB")
+
+    def stop(self) -> None:
+        if self.enabled:
+            tracemalloc.stop()
+            self.enabled = False
+
+# Instância global usada pelo main
+memory = MemoryTracker()
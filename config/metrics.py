@@ -0,0 +1,253 @@
+"""
+Métricas da coleta no formato texto do Prometheus.
+
+Contadores, gauges e histogramas simples, sem dependências externas. As
+métricas podem ser expostas em um endpoint HTTP local (`serve`) ou gravadas
+periodicamente em um arquivo para o textfile collector do node_exporter
+(`enable_textfile`).
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .timing import timer
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _formatar_labels(nomes: Tuple[str, ...], valores: Tuple[str, ...], extra: str = '') -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+def _formatar_valor(valor: float) -> str:
+    if valor == float('inf'):
+        return '+Inf'
+    return repr(float(valor)) if isinstance(valor, float) and not valor.is_integer() else str(int(valor))
+
+class _Metric:
+    tipo = ''
+
+    def __init__(self, nome: str, ajuda: str, labels: Tuple[str, ...] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _chave(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f'# HELP {self.nome} {self.ajuda}', f'# TYPE {self.nome} {self.tipo}'] + self._amostras()
+
+    def _amostras(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    tipo = 'counter'
+
+    def __init__(self, nome, ajuda, labels=()):
+        super().__init__(nome, ajuda, labels)
+        self._valores: Dict[Tuple[str, ...], float] = {} if labels else {(): 0.0}
+
+    def inc(self, valor: float = 1, **labels) -> None:
+        chave = self._chave(labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+
+    def value(self, **labels) -> float:
+        return self._valores.get(self._chave(labels), 0.0)
+
+    def _amostras(self):
+        with self._lock:
+            itens = list(self._valores.items())
+        return [f'{self.nome}{_formatar_labels(self.labelnames, k)} {_formatar_valor(v)}' for k, v in itens]
+
+class Gauge(Counter):
+    tipo = 'gauge'
+
+    def set(self, valor: float, **labels) -> None:
+        with self._lock:
+            self._valores[self._chave(labels)] = float(valor)
+
+    def dec(self, valor: float = 1, **labels) -> None:
+        self.inc(-valor, **labels)
+
+class Histogram(_Metric):
+    tipo = 'histogram'
+
+    def __init__(self, nome, ajuda, labels=(), buckets=_LATENCY_BUCKETS):
+        super().__init__(nome, ajuda, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, valor: float, **labels) -> None:
+        chave = self._chave(labels)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                # [contagem por bucket..., soma, total]
+                serie = self._series[chave] = [0.0] * (len(self.buckets) + 2)
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    serie[i] += 1
+                    break
+            serie[-2] += valor
+            serie[-1] += 1
+
+    def _amostras(self):
+        linhas = []
+        with self._lock:
+            itens = [(k, list(v)) for k, v in self._series.items()]
+        for chave, serie in itens:
+            acumulado = 0.0
+            for i, limite in enumerate(self.buckets):
+                acumulado += serie[i]
+                le = _formatar_labels(self.labelnames, chave, f'le="{limite}"')
+                linhas.append(f'{self.nome}_bucket{le} {_formatar_valor(acumulado)}')
+            le = _formatar_labels(self.labelnames, chave, 'le="+Inf"')
+            linhas.append(f'{self.nome}_bucket{le} {_formatar_valor(serie[-1])}')
+            base = _formatar_labels(self.labelnames, chave)
+            linhas.append(f'{self.nome}_sum{base} {_formatar_valor(serie[-2])}')
+            linhas.append(f'{self.nome}_count{base} {_formatar_valor(serie[-1])}')
+        return linhas
+
+class Registry:
+    """Conjunto de métricas renderizável no formato texto do Prometheus"""
+
+    def __init__(self):
+        self._metricas: List[_Metric] = []
+
+    def register(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def render(self) -> str:
+        linhas = []
+        for metrica in self._metricas:
+            linhas.extend(metrica.render())
+        return '\n'.join(linhas) + '\n'
+
+REGISTRY = Registry()
+
+PAGES_FETCHED = REGISTRY.register(Counter(
+    'puravida_pages_fetched_total', 'Páginas carregadas pelo navegador', ('kind',)))
+BYTES_FETCHED = REGISTRY.register(Counter(
+    'puravida_bytes_fetched_total', 'Bytes de HTML lidos via page_source', ('kind',)))
+CACHE_HITS = REGISTRY.register(Counter(
+    'puravida_cache_hits_total', 'Páginas e recursos (JS, CSS, fontes) atendidos pelo cache, sem novo acesso ao site'))
+TRANSFER_BYTES = REGISTRY.register(Counter(
+    'puravida_transfer_bytes_total', 'Bytes transferidos pela rede pelo navegador (página + recursos)', ('kind',)))
+PARSE_FAILURES = REGISTRY.register(Counter(
+    'puravida_parse_failures_total', 'URLs sem dados nutricionais extraídos', ('reason',)))
+DRIVER_STARTS = REGISTRY.register(Counter(
+    'puravida_driver_starts_total', 'Inicializações do WebDriver'))
+DRIVER_RESTARTS = REGISTRY.register(Counter(
+    'puravida_driver_restarts_total', 'Drivers recriados para repetir uma URL após falha do WebDriver'))
+URLS_DISCOVERED = REGISTRY.register(Counter(
+    'puravida_urls_discovered_total', 'URLs de produto encontradas nas páginas de listagem'))
+NEW_URLS = REGISTRY.register(Counter(
+    'puravida_new_urls_total', 'URLs de produto nunca vistas em coletas anteriores'))
+ROWS_SAVED = REGISTRY.register(Counter(
+    'puravida_rows_saved_total', 'Linhas gravadas no CSV por save_incremental'))
+CSV_ROWS = REGISTRY.register(Gauge(
+    'puravida_csv_rows', 'Total de linhas no CSV após a última gravação'))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'puravida_queue_depth', 'URLs ainda não processadas na execução corrente'))
+CONCURRENCY_LIMIT = REGISTRY.register(Gauge(
+    'puravida_concurrency_limit', 'Limite atual de requisições simultâneas (controle AIMD)'))
+THROTTLED = REGISTRY.register(Counter(
+    'puravida_throttled_total', 'Respostas de sobrecarga que reduziram a concorrência', ('reason',)))
+FAILURES = REGISTRY.register(Counter(
+    'puravida_failures_total', 'Falhas classificadas por categoria (timeout, driver, rede...)', ('category',)))
+RETRIES = REGISTRY.register(Counter(
+    'puravida_retries_total', 'Novas tentativas após falhas transitórias', ('category',)))
+CIRCUIT_OPENS = REGISTRY.register(Counter(
+    'puravida_circuit_opens_total', 'Vezes em que o circuit breaker pausou o host'))
+KITS_DERIVED = REGISTRY.register(Counter(
+    'puravida_kits_derived_total', 'Kits gravados a partir do produto canônico, sem baixar a página'))
+SUSPICIOUS_ROWS = REGISTRY.register(Gauge(
+    'puravida_suspicious_rows', 'Linhas do CSV reprovadas na última validação de plausibilidade', ('check',)))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'puravida_stage_seconds', 'Duração de cada etapa do scraping', ('stage',)))
+
+def _observar_etapa(nome: str, duracao_ms: float) -> None:
+    STAGE_SECONDS.observe(duracao_ms / 1000, stage=nome)
+
+def _criar_servidor(host: str, port: int):
+    # http.server é importado aqui para não pesar na inicialização do menu
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            corpo = REGISTRY.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), _Handler)
+
+class MetricsExporter:
+    """Controla a exposição das métricas (HTTP e/ou textfile)"""
+
+    def __init__(self):
+        self.server = None
+        self.textfile: Optional[str] = None
+        self.intervalo = 5.0
+        self._ultimo_flush = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.server is not None or self.textfile is not None
+
+    def _ativar_latencias(self) -> None:
+        # As latências por etapa vêm do StageTimer, como observador: sem --timing
+        # nada é acumulado para o resumo nem gravado em timings.jsonl
+        timer.observe(_observar_etapa)
+
+    def serve(self, port: int = 9108, host: str = '127.0.0.1') -> None:
+        """Expõe /metrics em uma thread daemon"""
+        self.server = _criar_servidor(host, port)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self._ativar_latencias()
+
+    def enable_textfile(self, caminho: str, intervalo: float = 5.0) -> None:
+        """Grava as métricas em `caminho` a cada `intervalo` segundos (via flush)"""
+        self.textfile = caminho
+        self.intervalo = intervalo
+        self._ativar_latencias()
+
+    def flush(self, force: bool = False) -> None:
+        """Atualiza o arquivo do textfile collector, respeitando o intervalo mínimo"""
+        if not self.textfile:
+            return
+        agora = time.monotonic()
+        if not force and agora - self._ultimo_flush < self.intervalo:
+            return
+        self._ultimo_flush = agora
+        os.makedirs(os.path.dirname(self.textfile) or '.', exist_ok=True)
+        temporario = f'{self.textfile}.{os.getpid()}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write(REGISTRY.render())
+        os.replace(temporario, self.textfile)
+
+    def shutdown(self) -> None:
+        self.flush(force=True)
+        if self.server:
+            self.server.shutdown()
+            self.server = None
+
+exporter = MetricsExporter()
@@ -0,0 +1,145 @@
+"""
+Regras declarativas dos nutrientes e classificador de rótulos.
+
+As regras ficam em config/nutrients.json: para cada nutriente, a coluna do
+CSV, a unidade e os sinônimos do rótulo. Na importação todos os sinônimos
+(sem acentos e em minúsculas) são compilados em um único autômato de
+Aho-Corasick, de modo que classificar um rótulo ou varrer o texto do bloco de
+informações custa O(tamanho do texto), independente de quantos nutrientes
+são acompanhados. Incluir vitaminas ou minerais é só acrescentar uma regra
+ao arquivo; uma regra com "column": null reconhece o rótulo e o descarta
+(ex.: "gorduras trans" não deve cair em "gorduras").
+
+Entre sinônimos sobrepostos vence o que começa antes e, empatando, o mais
+longo: "Gorduras Saturadas" é gorduras_saturadas, e não gorduras_totais.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nutrients.json')
+
+class NutrientRule(NamedTuple):
+    nutrient: str
+    column: Optional[str]
+    unit: str
+    synonyms: Tuple[str, ...]
+
+def fold(texto: str) -> str:
+    """Minúsculas, sem acentos e com espaços normalizados"""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.lower().split())
+
+def load_rules(path: str = RULES_FILE) -> List[NutrientRule]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [NutrientRule(item['nutrient'], item.get('column'), item['unit'], tuple(item['synonyms']))
+                for item in json.load(f)]
+
+class LabelMatcher:
+    """Autômato de Aho-Corasick sobre os sinônimos (já normalizados) das regras"""
+
+    CACHE_SIZE = 4096
+
+    def __init__(self, rules: List[NutrientRule]):
+        self.rules = rules
+        self._cache: Dict[str, Optional[NutrientRule]] = {}
+        # Nó 0 é a raiz; cada nó tem transições, link de falha e saídas (tamanho, regra)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._falha: List[int] = [0]
+        self._saidas: List[List[Tuple[int, int]]] = [[]]
+        for indice, regra in enumerate(rules):
+            for sinonimo in regra.synonyms:
+                self._inserir(fold(sinonimo), indice)
+        self._ligar_falhas()
+
+    def _inserir(self, padrao: str, regra: int) -> None:
+        no = 0
+        for c in padrao:
+            proximo = self._goto[no].get(c)
+            if proximo is None:
+                proximo = len(self._goto)
+                self._goto[no][c] = proximo
+                self._goto.append({})
+                self._falha.append(0)
+                self._saidas.append([])
+            no = proximo
+        self._saidas[no].append((len(padrao), regra))
+
+    def _ligar_falhas(self) -> None:
+        # Busca em largura: os filhos da raiz falham para a raiz
+        fila = deque(self._goto[0].values())
+        while fila:
+            no = fila.popleft()
+            for c, filho in self._goto[no].items():
+                fila.append(filho)
+                falha = self._falha[no]
+                while falha and c not in self._goto[falha]:
+                    falha = self._falha[falha]
+                self._falha[filho] = self._goto[falha].get(c, 0)
+                self._saidas[filho] = self._saidas[filho] + self._saidas[self._falha[filho]]
+
+    def _ocorrencias(self, texto: str) -> Iterator[Tuple[int, int, int]]:
+        """(início, fim, regra) de cada sinônimo encontrado no texto já normalizado"""
+        no = 0
+        for posicao, c in enumerate(texto):
+            while no and c not in self._goto[no]:
+                no = self._falha[no]
+            no = self._goto[no].get(c, 0)
+            for tamanho, regra in self._saidas[no]:
+                yield posicao + 1 - tamanho, posicao + 1, regra
+
+    def find_all(self, texto: str) -> List[Tuple[int, int, NutrientRule]]:
+        """Ocorrências sem sobreposição (a mais à esquerda e, depois, a mais longa) no texto normalizado"""
+        ocorrencias = sorted(self._ocorrencias(texto), key=lambda o: (o[0], -o[1], o[2]))
+        resultado, fim_anterior = [], 0
+        for inicio, fim, regra in ocorrencias:
+            if inicio >= fim_anterior:
+                resultado.append((inicio, fim, self.rules[regra]))
+                fim_anterior = fim
+        return resultado
+
+    def classify(self, label: str) -> Optional[NutrientRule]:
+        """Regra do rótulo (ex.: 'Gorduras Saturadas ' -> gorduras_saturadas) ou None"""
+        # Os mesmos rótulos se repetem em todas as tabelas; o resultado fica em cache
+        if label in self._cache:
+            return self._cache[label]
+        melhor = None
+        for inicio, fim, regra in self._ocorrencias(fold(label)):
+            chave = (inicio, -(fim - inicio), regra)
+            if melhor is None or chave < melhor:
+                melhor = chave
+        resultado = self.rules[melhor[2]] if melhor else None
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[label] = resultado
+        return resultado
+
+RULES = load_rules()
+NUTRIENT_COLUMNS = [regra.column for regra in RULES if regra.column]
+# Coluna do CSV de cada nutriente (ex.: COLUMN['sodio'] == 'SODIO (mg)')
+COLUMN = {regra.nutrient: regra.column for regra in RULES if regra.column}
+matcher = LabelMatcher(RULES)
+
+# Número logo após o rótulo, seguido da unidade da regra ("Sódio: 104 mg")
+_VALOR_APOS_ROTULO = {unidade: re.compile(rf'[:\s]*(\d+(?:[.,]\d+)?)\s*{unidade}\b')
+                      for unidade in {regra.unit for regra in RULES}}
+
+def scan_text(texto: str) -> Dict[str, str]:
+    """
+    Valores por coluna encontrados em texto corrido ou parágrafos, na forma
+    "rótulo[:] número unidade". Vale a primeira ocorrência de cada coluna.
+    """
+    normalizado = fold(texto)
+    valores: Dict[str, str] = {}
+    for _, fim, regra in matcher.find_all(normalizado):
+        if not regra.column or regra.column in valores:
+            continue
+        match = _VALOR_APOS_ROTULO[regra.unit].match(normalizado, fim)
+        if match:
+            valores[regra.column] = match.group(1).replace(',', '.')
+    return valores
@@ -0,0 +1,154 @@
+"""
+Pipeline em estágios ligados por filas limitadas.
+
+    descoberta ──▶ [fila] ──▶ download (N threads) ──▶ [fila] ──▶ parsing (M threads) ──▶ [fila] ──▶ gravação (1)
+
+Cada estágio tem a própria quantidade de workers e uma fila de entrada com
+tamanho máximo: quando um estágio fica para trás, a fila enche e o estágio
+anterior bloqueia (backpressure), em vez de acumular páginas na memória. O
+scraping dos produtos começa assim que a primeira página da busca gera URLs,
+e o tempo total tende ao do estágio mais lento, não à soma de todos.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .utils import log_error, print_step, print_progress
+
+# Marca de fim de fluxo passada de um estágio para o seguinte
+_FIM = object()
+
+class Stage:
+    """
+    Estágio do pipeline: `funcao(item)` roda em `workers` threads.
+    O retorno segue para o próximo estágio; None descarta o item.
+    """
+
+    def __init__(self, nome: str, funcao: Callable[[Any], Any], workers: int = 1, maxsize: int = 16):
+        self.nome = nome
+        self.funcao = funcao
+        self.workers = max(1, workers)
+        self.entrada: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.processados = 0
+        self.falhas = 0
+        self.ocupado = 0.0
+        self.pico_fila = 0
+        self._lock = threading.Lock()
+        self._ativos = self.workers
+
+    def stats(self) -> Dict[str, Any]:
+        return {'stage': self.nome, 'workers': self.workers, 'items': self.processados,
+                'failures': self.falhas, 'busy_s': round(self.ocupado, 3), 'max_queue': self.pico_fila}
+
+class Pipeline:
+    """Liga uma fonte de itens a uma sequência de estágios"""
+
+    def __init__(self, source: Callable[[], Iterable[Any]], stages: List[Stage],
+                 on_error: Optional[Callable[[Stage, Any, BaseException], None]] = None):
+        self.source = source
+        self.stages = stages
+        self.on_error = on_error
+        self.source_items = 0
+        self.source_s = 0.0
+        self.elapsed = 0.0
+        self._erro_fonte: Optional[BaseException] = None
+
+    def _produzir(self) -> None:
+        primeiro = self.stages[0]
+        inicio = time.perf_counter()
+        try:
+            for item in self.source():
+                self.source_items += 1
+                self._enviar(primeiro, item)
+        except Exception as e:
+            self._erro_fonte = e
+            log_error(f"Pipeline: erro na descoberta: {e}")
+        finally:
+            self.source_s = time.perf_counter() - inicio
+            for _ in range(primeiro.workers):
+                primeiro.entrada.put(_FIM)
+
+    @staticmethod
+    def _enviar(estagio: Stage, item: Any) -> None:
+        estagio.entrada.put(item)
+        tamanho = estagio.entrada.qsize()
+        if tamanho > estagio.pico_fila:
+            estagio.pico_fila = tamanho
+
+    def _trabalhar(self, indice: int) -> None:
+        estagio = self.stages[indice]
+        seguinte = self.stages[indice + 1] if indice + 1 < len(self.stages) else None
+        try:
+            while True:
+                item = estagio.entrada.get()
+                if item is _FIM:
+                    break
+                inicio = time.perf_counter()
+                try:
+                    resultado = estagio.funcao(item)
+                except Exception as e:
+                    resultado = None
+                    with estagio._lock:
+                        estagio.falhas += 1
+                    self._reportar_erro(estagio, item, e)
+                with estagio._lock:
+                    estagio.processados += 1
+                    estagio.ocupado += time.perf_counter() - inicio
+                if resultado is not None and seguinte is not None:
+                    self._enviar(seguinte, resultado)
+        finally:
+            # O último worker a sair avisa todos os workers do estágio seguinte,
+            # mesmo que este tenha terminado com erro (senão eles esperariam para sempre)
+            with estagio._lock:
+                estagio._ativos -= 1
+                ultimo = estagio._ativos == 0
+            if ultimo and seguinte is not None:
+                for _ in range(seguinte.workers):
+                    seguinte.entrada.put(_FIM)
+
+    def _reportar_erro(self, estagio: Stage, item: Any, erro: Exception) -> None:
+        if self.on_error is None:
+            log_error(f"Pipeline: erro no estágio {estagio.nome}: {erro}")
+            return
+        try:
+            self.on_error(estagio, item, erro)
+        except Exception as e:
+            log_error(f"Pipeline: erro no tratamento de falha do estágio {estagio.nome}: {e} "
+                      f"(falha original: {erro})")
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Executa até a fonte esgotar e todas as filas esvaziarem; retorna as estatísticas"""
+        inicio = time.perf_counter()
+        threads = [threading.Thread(target=self._produzir, name='pipeline-fonte', daemon=True)]
+        for indice, estagio in enumerate(self.stages):
+            threads += [threading.Thread(target=self._trabalhar, args=(indice,), daemon=True,
+                                         name=f"pipeline-{estagio.nome}-{n}") for n in range(estagio.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - inicio
+        if self._erro_fonte is not None:
+            raise self._erro_fonte
+        return self.stats()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        fonte = {'stage': 'descoberta', 'workers': 1, 'items': self.source_items, 'failures': 0,
+                 'busy_s': round(self.source_s, 3), 'max_queue': 0}
+        return [fonte] + [estagio.stats() for estagio in self.stages]
+
+    def print_summary(self) -> None:
+        """Tempo ocupado por estágio (por worker) e o gargalo da execução"""
+        print_step(f"Pipeline: {self.elapsed:.1f}s no total")
+        gargalo, maior = '', 0.0
+        for linha in self.stats():
+            por_worker = linha['busy_s'] / linha['workers']
+            if por_worker > maior:
+                gargalo, maior = linha['stage'], por_worker
+            print_progress(f"{linha['stage']:<12} {linha['workers']:>2} workers | {linha['items']:>5} itens | "
+                           f"{linha['failures']:>3} falhas | ocupado {por_worker:7.1f}s/worker | "
+                           f"fila máx. {linha['max_queue']}")
+        soma = sum(linha['busy_s'] / linha['workers'] for linha in self.stats())
+        print_progress(f"Gargalo: {gargalo} ({maior:.1f}s); soma dos estágios: {soma:.1f}s")
@@ -0,0 +1,155 @@
+"""
+Perfis persistentes do navegador compartilhados entre inicializações do driver.
+
+Sem perfil, cada get_browser_driver abre o Chrome com um perfil descartável
+e o JS, o CSS e as fontes estáticas da loja são baixados de novo a cada
+produto. Com o pool ativo (--browser-profile), cada driver recebe um
+user-data-dir persistente, e com ele o cache em disco:
+
+    - drivers sequenciais reutilizam o perfil modelo (dados/browser_profile),
+      que fica "quente" a partir da primeira página;
+    - drivers em paralelo não podem abrir o mesmo user-data-dir (o Chrome
+      trava o diretório), então cada um recebe uma cópia própria
+      (browser_profile.worker-N), semeada a partir do modelo e reaproveitada
+      nas execuções seguintes.
+
+A posse de cada diretório é marcada por um arquivo de trava criado com
+O_EXCL contendo o PID, o que vale também entre processos (--worker, --shard);
+travas de processos que já terminaram são descartadas (psutil quando
+instalado, senão os.kill no POSIX e OpenProcess no Windows). Uma cópia nova
+é reservada com os.mkdir, atômico entre processos, e travada antes de ser
+semeada; se a cópia falhar, o driver usa um perfil descartável.
+"""
+
+import glob
+import os
+import shutil
+import threading
+from typing import Optional
+
+from .utils import log_error
+
+try:
+    import psutil
+except ImportError:  # psutil é opcional
+    psutil = None
+
+TRAVA = '.puravida-lock'
+# Arquivos de trava do Chrome/Firefox que não devem ser copiados para as cópias
+_NAO_COPIAR = shutil.ignore_patterns(TRAVA, 'Singleton*', 'lockfile', 'parent.lock', '.parentlock', '*.tmp')
+
+def _processo_vivo(pid: int) -> bool:
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name == 'posix':
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+    # Windows sem psutil (os.kill ali encerraria o processo)
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    processo = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+    if not processo:
+        return kernel32.GetLastError() == 5  # acesso negado: existe, mas é de outro usuário
+    try:
+        codigo = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(processo, ctypes.byref(codigo))
+        return codigo.value == 259  # STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(processo)
+
+def _copiar_arquivo(origem: str, destino: str) -> None:
+    try:
+        shutil.copy2(origem, destino)
+    except FileNotFoundError:
+        pass  # arquivo temporário/journal apagado pelo navegador durante a cópia
+
+class ProfilePool:
+    """Perfil modelo para drivers sequenciais + cópias por worker em paralelo"""
+
+    def __init__(self, template: str = 'dados/browser_profile'):
+        self.template = template
+        self.enabled = False
+        self._lock = threading.Lock()
+
+    def enable(self, template: Optional[str] = None) -> None:
+        self.template = template or self.template
+        self.enabled = True
+
+    def _travar(self, pasta: str) -> bool:
+        trava = os.path.join(pasta, TRAVA)
+        for _ in range(2):
+            try:
+                descritor = os.open(trava, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    with open(trava, 'r') as f:
+                        pid = int(f.read().strip() or 0)
+                except (OSError, ValueError):
+                    return False
+                if pid and _processo_vivo(pid):
+                    return False
+                # Trava de um processo que já terminou
+                try:
+                    os.remove(trava)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(descritor, 'w') as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    def _copias(self):
+        return sorted(glob.glob(f"{glob.escape(self.template)}.worker-*"),
+                      key=lambda pasta: int(pasta.rsplit('-', 1)[-1]))
+
+    def acquire(self) -> Optional[str]:
+        """Diretório de perfil livre para um novo driver (None com o pool desativado)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            os.makedirs(self.template, exist_ok=True)
+            for pasta in [self.template] + self._copias():
+                if self._travar(pasta):
+                    return pasta
+            return self._nova_copia()
+
+    def _nova_copia(self) -> Optional[str]:
+        """Reserva, trava e semeia uma cópia nova do modelo; None se a cópia falhar"""
+        indice = len(self._copias()) + 1
+        while True:
+            pasta = f"{self.template}.worker-{indice}"
+            indice += 1
+            try:
+                # mkdir é atômico: dois processos não reservam o mesmo índice
+                os.mkdir(pasta)
+            except FileExistsError:
+                continue
+            # Outro processo pode travar a pasta vazia antes de nós: segue para o próximo índice
+            if self._travar(pasta):
+                break
+        try:
+            # O modelo está em uso por um navegador vivo: arquivos que somem no meio são ignorados
+            shutil.copytree(self.template, pasta, ignore=_NAO_COPIAR, ignore_dangling_symlinks=True,
+                            copy_function=_copiar_arquivo, dirs_exist_ok=True)
+        except (OSError, shutil.Error) as e:
+            log_error(f"Falha ao copiar o perfil {self.template} para {pasta}, usando perfil descartável: {e}")
+            shutil.rmtree(pasta, ignore_errors=True)
+            return None
+        return pasta
+
+    def release(self, pasta: Optional[str]) -> None:
+        """Devolve o diretório ao pool (o conteúdo, e com ele o cache, é mantido)"""
+        if pasta is None:
+            return
+        try:
+            os.remove(os.path.join(pasta, TRAVA))
+        except FileNotFoundError:
+            pass
+
+profiles = ProfilePool()
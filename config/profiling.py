@@ -0,0 +1,294 @@
+"""
+Profiling opcional do scraping (ativado com `python main.py --profile`).
+
+Dois escopos:
+    - run:      um único perfil cobrindo toda a coleta
+    - slowest:  um perfil por URL, mantendo apenas as N URLs mais lentas
+
+Dois motores:
+    - cprofile: gera `.pstats` (abrir com `python -m pstats` ou snakeviz) e um
+                `.collapsed` aproximado, derivado do grafo de chamadas
+    - sampling: amostra a pilha da thread a cada poucos milissegundos, com
+                overhead bem menor, e gera apenas o `.collapsed`
+
+Os arquivos `.collapsed` seguem o formato "f1;f2;f3 contagem", aceito pelo
+flamegraph.pl e pelo speedscope.
+
+O escopo `run` cobre também as threads de trabalho (--concurrency, pipeline):
+o amostrador lê a pilha de todas as threads, e com o cProfile cada thread
+iniciada durante a coleta ganha um perfil próprio, somado ao final com
+pstats.Stats.add. A partir do Python 3.12 o cProfile só admite um perfil ativo
+por vez (sys.monitoring); aí as threads ficam só no perfil principal e, no
+escopo `slowest` com URLs em paralelo, as URLs que não conseguem iniciar o
+próprio perfil ficam de fora.
+"""
+
+import heapq
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .utils import print_step, print_progress
+
+PROFILES_DIR = 'dados/profiles'
+
+_NULL = nullcontext()
+
+def _nome_funcao(arquivo: str, linha: int, funcao: str) -> str:
+    modulo = os.path.splitext(os.path.basename(arquivo))[0] if arquivo and arquivo != '~' else ''
+    return f"{modulo}:{funcao}:{linha}" if modulo else funcao
+
+def _slug(url: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9]+', '-', url.rstrip('/').rsplit('/', 1)[-1])[:80].strip('-') or 'pagina'
+
+class StackSampler:
+    """Amostrador de pilha simples baseado em sys._current_frames()"""
+
+    def __init__(self, intervalo: float = 0.005, todas_as_threads: bool = False):
+        self.intervalo = intervalo
+        self.todas_as_threads = todas_as_threads
+        self.amostras: Counter = Counter()
+        self._alvo: Optional[int] = None
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._alvo = threading.get_ident()
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        proprio = threading.get_ident()
+        while not self._parar.wait(self.intervalo):
+            frames = sys._current_frames()
+            if self.todas_as_threads:
+                alvos = [frame for ident, frame in frames.items() if ident != proprio]
+            else:
+                alvos = [frames.get(self._alvo)]
+            for frame in alvos:
+                pilha = []
+                while frame is not None:
+                    codigo = frame.f_code
+                    pilha.append(_nome_funcao(codigo.co_filename, codigo.co_firstlineno, codigo.co_name))
+                    frame = frame.f_back
+                if pilha:
+                    self.amostras[';'.join(reversed(pilha))] += 1
+
+    def collapsed(self) -> Dict[str, int]:
+        return dict(self.amostras)
+
+def collapsed_from_stats(stats: 'pstats.Stats', escala: float = 1e6, max_profundidade: int = 64) -> Dict[str, int]:
+    """
+    Converte um perfil cProfile em pilhas colapsadas (aproximação).
+
+    O cProfile só guarda arestas chamador→chamado; o tempo de cada função é
+    distribuído entre seus chamadores proporcionalmente ao tempo cumulativo de
+    cada aresta. Valores em microssegundos.
+    """
+    dados = stats.stats  # type: ignore[attr-defined]
+    filhos: Dict[tuple, List[Tuple[tuple, float]]] = {}
+    raizes = []
+    for func, (_, _, _, _, callers) in dados.items():
+        if not callers:
+            raizes.append(func)
+        for chamador, valores in callers.items():
+            filhos.setdefault(chamador, []).append((func, valores[3]))
+
+    resultado: Dict[str, int] = {}
+
+    def descer(func, pilha: List[str], fracao: float, visitados: set):
+        tottime = dados[func][2]
+        nome = _nome_funcao(*func)
+        pilha = pilha + [nome]
+        proprio = int(tottime * fracao * escala)
+        if proprio > 0:
+            chave = ';'.join(pilha)
+            resultado[chave] = resultado.get(chave, 0) + proprio
+        if len(pilha) >= max_profundidade:
+            return
+        for filho, cum_aresta in filhos.get(func, []):
+            cum_filho = dados[filho][3]
+            if filho in visitados or cum_filho <= 0 or cum_aresta <= 0:
+                continue
+            descer(filho, pilha, fracao * cum_aresta / cum_filho, visitados | {filho})
+
+    for raiz in raizes:
+        descer(raiz, [], 1.0, {raiz})
+    return resultado
+
+def write_collapsed(amostras: Dict[str, int], caminho: str) -> None:
+    with open(caminho, 'w', encoding='utf-8') as f:
+        for pilha, contagem in sorted(amostras.items()):
+            if contagem > 0:
+                f.write(f"{pilha} {contagem}\n")
+
+class _Sessao:
+    """Um perfil em andamento (cProfile ou amostrador)"""
+
+    def __init__(self, engine: str, threads: bool = False):
+        # cProfile/pstats só são importados quando o profiling está ativo
+        import cProfile
+        self.engine = engine
+        self.threads = threads
+        self.profile = cProfile.Profile() if engine == 'cprofile' else None
+        self.sampler = StackSampler(todas_as_threads=threads) if engine == 'sampling' else None
+        # Perfis das threads iniciadas durante a sessão (cProfile com threads=True)
+        self._das_threads: List['cProfile.Profile'] = []
+        self.active = False
+
+    def start(self) -> bool:
+        """Inicia a sessão; False se outro cProfile já estiver ativo (Python 3.12+)"""
+        if self.profile:
+            try:
+                self.profile.enable()
+            except ValueError:
+                return False
+            if self.threads:
+                threading.setprofile(self._iniciar_thread)
+        else:
+            self.sampler.start()
+        self.active = True
+        return True
+
+    def _iniciar_thread(self, *_) -> None:
+        # Chamado no primeiro evento de cada thread nova: troca o gancho pelo cProfile
+        import cProfile
+        sys.setprofile(None)
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            return
+        self._das_threads.append(perfil)
+
+    def stop(self) -> None:
+        if not self.active:
+            return
+        if self.profile:
+            threading.setprofile(None)
+            self.profile.disable()
+        else:
+            self.sampler.stop()
+
+    def dump(self, base: str) -> List[str]:
+        """Grava os arquivos com o prefixo `base` e retorna seus caminhos"""
+        import pstats
+        gerados = []
+        if self.profile:
+            stats = pstats.Stats(self.profile)
+            for perfil in self._das_threads:
+                stats.add(perfil)
+            stats.dump_stats(base + '.pstats')
+            gerados.append(base + '.pstats')
+            write_collapsed(collapsed_from_stats(stats), base + '.collapsed')
+        else:
+            write_collapsed(self.sampler.collapsed(), base + '.collapsed')
+        gerados.append(base + '.collapsed')
+        return gerados
+
+class Profiler:
+    """Controla o profiling de uma execução do scraping"""
+
+    def __init__(self):
+        self.enabled = False
+        self.scope = 'slowest'
+        self.engine = 'cprofile'
+        self.top = 5
+        self.output_dir = PROFILES_DIR
+        self._sessao_run: Optional[_Sessao] = None
+        self._lentas: List[Tuple[float, int, str, _Sessao]] = []
+        self._seq = 0
+        self._sem_perfil = 0
+        self._lock = threading.Lock()
+
+    def enable(self, scope: str = 'slowest', engine: str = 'cprofile', top: int = 5,
+               output_dir: str = PROFILES_DIR) -> None:
+        if scope not in ('run', 'slowest'):
+            raise ValueError(f"Escopo de profiling inválido: {scope}")
+        if engine not in ('cprofile', 'sampling'):
+            raise ValueError(f"Motor de profiling inválido: {engine}")
+        if top < 1:
+            raise ValueError(f"Quantidade de URLs mais lentas deve ser >= 1: {top}")
+        self.enabled = True
+        self.scope, self.engine, self.top, self.output_dir = scope, engine, top, output_dir
+
+    def run(self):
+        """Context manager que envolve a coleta inteira"""
+        if not self.enabled:
+            return _NULL
+        return self._run()
+
+    def url(self, url: str):
+        """Context manager que envolve o processamento de uma URL"""
+        if not self.enabled or self.scope != 'slowest':
+            return _NULL
+        return self._url(url)
+
+    @contextmanager
+    def _run(self):
+        self._lentas = []
+        self._sem_perfil = 0
+        if self.scope == 'run':
+            self._sessao_run = _Sessao(self.engine, threads=True)
+            self._sessao_run.start()
+        try:
+            yield
+        finally:
+            if self._sessao_run:
+                self._sessao_run.stop()
+            self._gravar()
+
+    @contextmanager
+    def _url(self, url: str):
+        sessao = _Sessao(self.engine)
+        inicio = time.perf_counter()
+        iniciada = sessao.start()
+        try:
+            yield
+        finally:
+            sessao.stop()
+            duracao = time.perf_counter() - inicio
+            with self._lock:
+                self._seq += 1
+                item = (duracao, self._seq, url, sessao)
+                if not iniciada:
+                    self._sem_perfil += 1
+                # Min-heap limitado: descarta o perfil da URL mais rápida
+                elif len(self._lentas) < self.top:
+                    heapq.heappush(self._lentas, item)
+                elif duracao > self._lentas[0][0]:
+                    heapq.heapreplace(self._lentas, item)
+
+    def _gravar(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        carimbo = datetime.now().strftime('%Y%m%d_%H%M%S')
+        print_step("Profiling")
+        if self._sessao_run:
+            for caminho in self._sessao_run.dump(os.path.join(self.output_dir, f"{carimbo}_run")):
+                print_progress(f"Gerado: {caminho}")
+            self._sessao_run = None
+        for posicao, (duracao, _, url, sessao) in enumerate(sorted(self._lentas, reverse=True), 1):
+            base = os.path.join(self.output_dir, f"{carimbo}_{posicao:02d}_{_slug(url)}")
+            print_progress(f"{duracao:.2f}s  {url}")
+            for caminho in sessao.dump(base):
+                print_progress(f"Gerado: {caminho}")
+        if self._sem_perfil:
+            print_progress(f"{self._sem_perfil} URLs sem perfil: outro cProfile já estava ativo "
+                           f"(Python 3.12+ com URLs em paralelo); use --profile-engine sampling")
+        self._lentas = []
+
+# Instância global usada pelo main
+profiler = Profiler()
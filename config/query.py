@@ -0,0 +1,123 @@
+"""
+Índice colunar em memória para consultas sobre o CSV de nutrientes.
+
+O CSV é lido uma única vez para arrays NumPy tipados: um array float por
+nutriente, já normalizado por 100 g a partir de PORCAO (g) (linhas sem
+porção ficam NaN nessa base), mais o valor por porção. A categoria vira um
+código inteiro, com um índice categoria -> linhas. Para cada nutriente e base
+há um índice ordenado (argsort sem os NaN), montado na carga para o
+catálogo inteiro e sob demanda para cada categoria:
+
+    - faixa ("sódio abaixo de N mg"): duas buscas binárias no índice ordenado
+    - top-k ("mais proteína por 100 g na categoria X"): fatia do fim do índice
+
+Ambas custam microssegundos, sem reler nem reinterpretar o CSV.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .nutrients import COLUMN, NUTRIENT_COLUMNS, fold
+
+PORCAO = 'PORCAO (g)'
+
+class NutrientIndex:
+    """Colunas tipadas do CSV com índices por categoria e por nutriente"""
+
+    def __init__(self, df):
+        import pandas as pd
+        self.names = df['NOME_PRODUTO'].astype(str).to_numpy(dtype=object)
+        self.urls = df['URL'].astype(str).to_numpy(dtype=object)
+        self.columns = [c for c in NUTRIENT_COLUMNS if c in df.columns]
+        self.portion = pd.to_numeric(df[PORCAO], errors='coerce').to_numpy(dtype=np.float64)
+        fator = np.full(len(df), np.nan)
+        np.divide(100.0, self.portion, out=fator, where=self.portion > 0)
+        self.per_portion: Dict[str, np.ndarray] = {}
+        self.per_100g: Dict[str, np.ndarray] = {}
+        for coluna in self.columns:
+            valores = pd.to_numeric(df[coluna], errors='coerce').to_numpy(dtype=np.float64)
+            self.per_portion[coluna] = valores
+            self.per_100g[coluna] = valores * fator
+
+        categorias = df['CATEGORIA'].fillna('').astype(str)
+        nomes, codigos = np.unique(categorias.to_numpy(dtype=str), return_inverse=True)
+        self.category_codes = codigos.astype(np.int32)
+        self.categories = list(nomes)
+        self._codigo = {fold(nome): codigo for codigo, nome in enumerate(nomes)}
+        ordem = np.argsort(self.category_codes, kind='stable')
+        limites = np.searchsorted(self.category_codes[ordem], np.arange(len(nomes) + 1))
+        self.by_category = {codigo: ordem[limites[codigo]:limites[codigo + 1]] for codigo in range(len(nomes))}
+
+        # (coluna, por 100 g, código da categoria ou None) -> (linhas ordenadas, valores ordenados)
+        self._ordenados: Dict[Tuple[str, bool, Optional[int]], Tuple[np.ndarray, np.ndarray]] = {}
+        for coluna in self.columns:
+            for por_100g in (True, False):
+                self._ordenado(coluna, por_100g, None)
+
+    @classmethod
+    def load(cls, csv_file: str = 'dados/produtos.csv') -> 'NutrientIndex':
+        import pandas as pd
+        return cls(pd.read_csv(csv_file))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def column(self, nome: str) -> str:
+        """Coluna do CSV a partir do nutriente ('proteinas'), da coluna ou de um sinônimo"""
+        if nome in self.per_portion:
+            return nome
+        if nome in COLUMN:
+            return COLUMN[nome]
+        from .nutrients import matcher
+        regra = matcher.classify(nome)
+        if regra is None or regra.column not in self.per_portion:
+            raise KeyError(f"nutriente desconhecido: {nome!r}")
+        return regra.column
+
+    def category(self, nome: str) -> int:
+        """Código da categoria (sem diferenciar acentos e maiúsculas)"""
+        codigo = self._codigo.get(fold(nome))
+        if codigo is None:
+            raise KeyError(f"categoria desconhecida: {nome!r}")
+        return codigo
+
+    def values(self, coluna: str, per_100g: bool = True) -> np.ndarray:
+        return (self.per_100g if per_100g else self.per_portion)[coluna]
+
+    def _ordenado(self, coluna: str, per_100g: bool, categoria: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        chave = (coluna, per_100g, categoria)
+        if chave not in self._ordenados:
+            valores = self.values(coluna, per_100g)
+            linhas = np.arange(len(self)) if categoria is None else self.by_category[categoria]
+            linhas = linhas[~np.isnan(valores[linhas])]
+            linhas = linhas[np.argsort(valores[linhas], kind='stable')]
+            self._ordenados[chave] = (linhas, valores[linhas])
+        return self._ordenados[chave]
+
+    def range(self, nutriente: str, low: Optional[float] = None, high: Optional[float] = None,
+              category: Optional[str] = None, per_100g: bool = True) -> np.ndarray:
+        """Linhas com low <= valor <= high, em ordem crescente de valor"""
+        codigo = None if category is None else self.category(category)
+        linhas, valores = self._ordenado(self.column(nutriente), per_100g, codigo)
+        inicio = 0 if low is None else np.searchsorted(valores, low, side='left')
+        fim = len(valores) if high is None else np.searchsorted(valores, high, side='right')
+        return linhas[inicio:fim]
+
+    def top(self, nutriente: str, k: int = 10, category: Optional[str] = None,
+            per_100g: bool = True, ascending: bool = False) -> np.ndarray:
+        """As k linhas de maior (ou menor, com ascending) valor"""
+        if k < 1:
+            # Um k negativo no fatiamento devolveria quase todas as linhas
+            raise ValueError(f"k deve ser >= 1: {k}")
+        codigo = None if category is None else self.category(category)
+        linhas, _ = self._ordenado(self.column(nutriente), per_100g, codigo)
+        return linhas[:k] if ascending else linhas[::-1][:k]
+
+    def rows(self, linhas: np.ndarray, nutriente: str, per_100g: bool = True) -> List[dict]:
+        """Nome, categoria, porção e valor do nutriente de cada linha, para exibição"""
+        coluna = self.column(nutriente)
+        valores = self.values(coluna, per_100g)
+        return [{'NOME_PRODUTO': self.names[i], 'CATEGORIA': self.categories[self.category_codes[i]],
+                 PORCAO: float(self.portion[i]), coluna: round(float(valores[i]), 2), 'URL': self.urls[i]}
+                for i in linhas]
@@ -0,0 +1,234 @@
+"""
+Falhas classificadas, novas tentativas com backoff e circuit breaker.
+
+Toda exceção do scraping é convertida em uma categoria de `ScrapeError`:
+
+    - PageTimeout:  a página não carregou a tempo            (transitória)
+    - DriverError:  o navegador/WebDriver caiu ou recusou    (transitória)
+    - NetworkError: conexão recusada, DNS, reset             (transitória)
+    - Throttled:    429/5xx, com Retry-After opcional        (transitória)
+    - NotFound:     404/410                                   (permanente)
+    - ParseError:   página carregou, mas sem os dados        (permanente)
+
+Falhas transitórias são repetidas com backoff exponencial com jitter
+("full jitter": espera aleatória entre 0 e base * 2^tentativa, limitada a
+`cap`). Um circuit breaker por host abre quando as falhas se acumulam em uma
+janela de tempo e pausa as requisições para aquele host até o fim do período
+de resfriamento; depois deixa passar uma requisição de teste.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+from urllib.parse import urlparse
+
+from . import metrics
+from .utils import log_error
+
+T = TypeVar('T')
+
+class ScrapeError(Exception):
+    """Falha classificada do scraping"""
+    category = 'erro'
+    transient = False
+
+    def __init__(self, message: str = '', url: str = ''):
+        super().__init__(message)
+        self.url = url
+
+class PageTimeout(ScrapeError):
+    category = 'timeout'
+    transient = True
+
+class DriverError(ScrapeError):
+    category = 'driver'
+    transient = True
+
+class NetworkError(ScrapeError):
+    category = 'rede'
+    transient = True
+
+class Throttled(ScrapeError):
+    """Resposta de sobrecarga (429/5xx); `retry_after` em segundos, se informado"""
+    category = 'sobrecarga'
+    transient = True
+
+    def __init__(self, status: int, retry_after: Optional[float] = None, url: str = ''):
+        super().__init__(f"HTTP {status}" + (f" (Retry-After {retry_after:.0f}s)" if retry_after else ''), url)
+        self.status = status
+        self.retry_after = retry_after
+
+class NotFound(ScrapeError):
+    category = 'nao_encontrado'
+
+class ParseError(ScrapeError):
+    category = 'parse'
+
+# Status HTTP que indicam sobrecarga/limitação do lado da loja
+THROTTLE_STATUS = {429, 500, 502, 503, 504}
+
+def parse_retry_after(valor: Optional[str]) -> Optional[float]:
+    """Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos"""
+    if not valor:
+        return None
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Nomes das classes do selenium/urllib, verificados pela hierarquia da exceção
+# para não importar o selenium só para classificar erros
+_TIMEOUTS = {'TimeoutException', 'TimeoutError', 'timeout'}
+_DRIVER = {'WebDriverException', 'InvalidSessionIdException', 'NoSuchWindowException', 'SessionNotCreatedException'}
+_REDE = {'URLError', 'ConnectionError', 'RemoteDisconnected', 'IncompleteRead'}
+
+def classify(exc: BaseException, url: str = '') -> ScrapeError:
+    """Converte qualquer exceção em uma categoria de ScrapeError"""
+    if isinstance(exc, ScrapeError):
+        return exc
+    nomes = {classe.__name__ for classe in type(exc).__mro__}
+    mensagem = f"{type(exc).__name__}: {exc}"
+    # TimeoutException herda de WebDriverException; timeouts são verificados primeiro
+    if nomes & _TIMEOUTS:
+        erro = PageTimeout(mensagem, url)
+    elif nomes & _DRIVER:
+        erro = DriverError(mensagem, url)
+    elif nomes & _REDE:
+        erro = NetworkError(mensagem, url)
+    else:
+        erro = ScrapeError(mensagem, url)
+    erro.__cause__ = exc
+    return erro
+
+class RetryPolicy:
+    """Quantidade de tentativas e espera entre elas (backoff exponencial com jitter)"""
+
+    def __init__(self, max_attempts: int = 3, base: float = 1.0, cap: float = 30.0):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+
+    def delay(self, tentativa: int, retry_after: Optional[float] = None) -> float:
+        """Espera antes da tentativa seguinte à `tentativa` (1, 2, ...)"""
+        espera = random.uniform(0, min(self.cap, self.base * 2 ** tentativa))
+        return max(espera, retry_after or 0.0)
+
+    def call(self, funcao: Callable[[], T], url: str = '',
+             breaker: Optional['CircuitBreaker'] = None,
+             on_failure: Optional[Callable[[ScrapeError], None]] = None) -> T:
+        """
+        Executa `funcao()` repetindo falhas transitórias.
+
+        Levanta o ScrapeError da última tentativa (ou o primeiro permanente).
+        `on_failure` é chamado a cada falha (ex.: para reduzir a concorrência).
+        """
+        for tentativa in range(1, self.max_attempts + 1):
+            if breaker is not None:
+                breaker.wait()
+            try:
+                resultado = funcao()
+            except Exception as e:
+                erro = classify(e, url)
+                metrics.FAILURES.inc(category=erro.category)
+                if on_failure is not None:
+                    on_failure(erro)
+                if breaker is not None and erro.transient:
+                    breaker.record_failure()
+                elif breaker is not None:
+                    # Falha permanente (404, sem dados) ainda prova que o host responde
+                    breaker.record_success()
+                if not erro.transient or tentativa == self.max_attempts:
+                    raise erro
+                espera = self.delay(tentativa, getattr(erro, 'retry_after', None))
+                log_error(f"{erro.category} em {url} (tentativa {tentativa}/{self.max_attempts}), "
+                          f"nova tentativa em {espera:.1f}s: {erro}")
+                metrics.RETRIES.inc(category=erro.category)
+                time.sleep(espera)
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return resultado
+        raise AssertionError('inalcançável')
+
+class CircuitBreaker:
+    """
+    Abre depois de `threshold` falhas transitórias em `window` segundos e
+    bloqueia novas requisições por `cooldown` segundos. Depois disso uma
+    requisição de teste passa (meio-aberto): sucesso fecha o circuito, falha
+    reabre com o dobro do resfriamento (até `max_cooldown`).
+    """
+
+    def __init__(self, host: str = '', threshold: int = 5, window: float = 60.0,
+                 cooldown: float = 30.0, max_cooldown: float = 600.0):
+        self.host = host
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = 'closed'
+        self.open_until = 0.0
+        self._falhas = []
+        self._teste_em_andamento = False
+        self._cond = threading.Condition()
+
+    def wait(self) -> None:
+        """Bloqueia enquanto o circuito estiver aberto"""
+        with self._cond:
+            while True:
+                agora = time.monotonic()
+                if self.state == 'closed':
+                    return
+                if self.state == 'open' and agora >= self.open_until:
+                    self.state = 'half_open'
+                if self.state == 'half_open' and not self._teste_em_andamento:
+                    self._teste_em_andamento = True
+                    return
+                espera = self.open_until - agora if self.state == 'open' else 1.0
+                self._cond.wait(timeout=max(0.05, espera))
+
+    def record_success(self) -> None:
+        with self._cond:
+            if self.state != 'closed':
+                log_error(f"Circuito de {self.host} fechado: requisição de teste bem-sucedida")
+            self.state = 'closed'
+            self.cooldown = self.base_cooldown
+            self._falhas = []
+            self._teste_em_andamento = False
+            self._cond.notify_all()
+
+    def record_failure(self) -> None:
+        with self._cond:
+            agora = time.monotonic()
+            if self.state == 'half_open':
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._abrir(agora)
+                return
+            self._falhas = [t for t in self._falhas if agora - t < self.window] + [agora]
+            if self.state == 'closed' and len(self._falhas) >= self.threshold:
+                self._abrir(agora)
+
+    def _abrir(self, agora: float) -> None:
+        self.state = 'open'
+        self.open_until = agora + self.cooldown
+        self._falhas = []
+        self._teste_em_andamento = False
+        metrics.CIRCUIT_OPENS.inc()
+        log_error(f"Circuito de {self.host} aberto por {self.cooldown:.0f}s após falhas seguidas")
+        self._cond.notify_all()
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """Circuit breaker compartilhado por host"""
+    host = urlparse(url).netloc
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
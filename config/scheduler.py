@@ -0,0 +1,111 @@
+"""
+Agendamento adaptativo de recoleta por produto.
+
+Para cada URL guardamos quando ela foi verificada, quando o conteúdo extraído
+mudou pela última vez e um hash desse conteúdo. A taxa de mudança de cada
+produto é estimada como um processo de Poisson (mudanças observadas / tempo
+observado, com uma suavização para produtos com poucas verificações), e a
+probabilidade de a página ter mudado desde a última visita é
+
+    P = 1 - exp(-taxa * tempo_desde_a_verificação)
+
+A cada rodada só o topo dessa fila de prioridade é processado, dentro de um
+orçamento de requisições e/ou de tempo: produtos editados com frequência são
+revisitados logo, produtos estáveis raramente. URLs nunca visitadas vêm primeiro.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Suavização: equivale a ter observado uma mudança em PRIOR_DIAS dias
+PRIOR_DIAS = 30.0
+# Intervalo máximo entre duas verificações do mesmo produto
+INTERVALO_MAXIMO_DIAS = 60.0
+DIA = 86400.0
+
+def content_hash(df) -> Optional[str]:
+    """Hash estável do conteúdo extraído (None quando não houve dados)"""
+    if df is None or df.empty:
+        return None
+    return hashlib.sha1(df.to_csv(index=False).encode('utf-8')).hexdigest()
+
+class RecrawlScheduler:
+    """Fila de prioridade de URLs pela probabilidade estimada de mudança"""
+
+    def __init__(self, state_file: str = 'dados/recrawl_state.json'):
+        self.state_file = state_file
+        self.estado: Dict[str, dict] = {}
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                self.estado = json.load(f)
+
+    def change_rate(self, url: str) -> float:
+        """Mudanças por segundo estimadas para a URL"""
+        item = self.estado.get(url)
+        if not item:
+            return 0.0
+        observado = max(0.0, item['last_checked'] - item['first_seen'])
+        return (item['changes'] + 1) / (observado + PRIOR_DIAS * DIA)
+
+    def change_probability(self, url: str, agora: Optional[float] = None) -> float:
+        """Probabilidade de a URL ter mudado desde a última verificação"""
+        item = self.estado.get(url)
+        if not item:
+            return 1.0
+        decorrido = (agora or time.time()) - item['last_checked']
+        if decorrido >= INTERVALO_MAXIMO_DIAS * DIA:
+            return 1.0
+        return 1.0 - math.exp(-self.change_rate(url) * max(0.0, decorrido))
+
+    def plan(self, urls: Iterable[str], max_requests: Optional[int] = None,
+             min_probability: float = 0.0) -> List[Tuple[str, float]]:
+        """
+        Seleciona as URLs mais prováveis de terem mudado
+
+        Returns:
+            Lista de (url, probabilidade) em ordem decrescente de prioridade
+        """
+        agora = time.time()
+        fila = [(-self.change_probability(url, agora), url) for url in dict.fromkeys(urls)]
+        fila = [(p, url) for p, url in fila if -p >= min_probability]
+        if max_requests is None:
+            escolhidas = sorted(fila)
+        else:
+            escolhidas = heapq.nsmallest(max_requests, fila)
+        return [(url, -p) for p, url in escolhidas]
+
+    def record(self, url: str, df, agora: Optional[float] = None) -> bool:
+        """Registra o resultado de uma verificação; retorna True se o conteúdo mudou"""
+        agora = agora or time.time()
+        novo_hash = content_hash(df)
+        # Falha de extração não é uma verificação: a página continua na posição
+        # da fila e a taxa de mudança não cai por uma visita sem conteúdo
+        if novo_hash is None:
+            return False
+        item = self.estado.get(url)
+        if item is None:
+            self.estado[url] = {'first_seen': agora, 'last_checked': agora, 'last_changed': agora,
+                                'checks': 1, 'changes': 0, 'hash': novo_hash}
+            return True
+        item['checks'] += 1
+        item['last_checked'] = agora
+        mudou = novo_hash != item['hash']
+        if mudou:
+            if item['hash'] is not None:
+                item['changes'] += 1
+            item['last_changed'] = agora
+            item['hash'] = novo_hash
+        return mudou
+
+    def save(self) -> None:
+        """Grava o estado de forma atômica"""
+        os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+        temporario = self.state_file + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.estado, f, ensure_ascii=False)
+        os.replace(temporario, self.state_file)
@@ -12,291 +12,250 @@ from bs4 import BeautifulSoup, Tag
 from rich.console import Console
 from rich.panel import Panel
 import re
+import threading
 from typing import List, Optional, Dict, Any
 
 # Adiciona o diretório pai ao path para importar os módulos do projeto
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.browser import get_browser_driver
+from config.browser import get_browser_driver, measure_transfer, response_status
+from config.timing import timer
+from config.archive import archive
+from config.profiles import profiles
+from config import metrics
+from config.utils import register_console, log_error, set_log_level
+from config.retry import THROTTLE_STATUS, DriverError, NotFound, ParseError, Throttled, classify
+from config.structured_data import extract_structured_data
+from config.nutrients import NUTRIENT_COLUMNS, matcher, scan_text
 
-console = Console()
+console = register_console(Console())
 
-def extract_nutritional_info_liberal(soup: BeautifulSoup, nome: str, categoria: str, url: str) -> Optional[pd.DataFrame]:
-    """
-    Extrai informações nutricionais de forma mais liberal, procurando por dados
-    em qualquer formato dentro do bloco de informações nutricionais.
-    """
-    df = pd.DataFrame(columns=[
-        'NOME_PRODUTO', 'URL', 'CATEGORIA', 'PORCAO (g)', 'CALORIAS (kcal)', 'CARBOIDRATOS (g)',
-        'PROTEINAS (g)', 'GORDURAS_TOTAIS (g)', 'GORDURAS_SATURADAS (g)', 'FIBRAS (g)', 'ACUCARES (g)', 'SODIO (mg)'
-    ])
-    
-    # Encontra o bloco de informações nutricionais
-    info_div = soup.find('div', {'class': 'bloco_texto', 'id': 'informacoes'})
-    if not info_div:
-        console.print("[bold red]❌ Não foi possível encontrar o bloco de informações nutricionais")
-        return None
-    
-    # Procura por qualquer texto que contenha "INFORMAÇÃO NUTRICIONAL"
-    info_text = info_div.get_text()
-    
-    # Extrai porção se disponível
-    porcao_match = re.search(r'Porção de ([\d,]+\s*g)', info_text)
-    porcao = porcao_match.group(1) if porcao_match else "0g"
-    
-    # Dicionário para armazenar valores nutricionais
-    valores = {
-        'CALORIAS (kcal)': '0',
-        'CARBOIDRATOS (g)': '0',
-        'PROTEINAS (g)': '0',
-        'GORDURAS_TOTAIS (g)': '0',
-        'GORDURAS_SATURADAS (g)': '0',
-        'FIBRAS (g)': '0',
-        'ACUCARES (g)': '0',
-        'SODIO (mg)': '0'
-    }
-    
-    # Procura por dados nutricionais em diferentes formatos
-    # 1. Em tabelas HTML
-    if isinstance(info_div, Tag):
-        tabelas = info_div.find_all('table')
-        for tabela in tabelas:
-            for row in tabela.find_all('tr'):
-                cols = row.find_all(['td', 'th'])
-                if len(cols) >= 2:
-                    label = cols[0].get_text(strip=True).lower()
-                    value = cols[1].get_text(strip=True)
-                    
-                    # Mapeia diferentes variações de nomes
-                    if any(termo in label for termo in ['valor energético', 'calorias', 'energia']):
-                        calorias_match = re.search(r'(\d+[\.,]?\d*)', value)
-                        if calorias_match and calorias_match.group(1):
-                            valores['CALORIAS (kcal)'] = calorias_match.group(1).replace(',', '.')
-                    elif any(termo in label for termo in ['carboidratos', 'carboidrato']):
-                        carb_match = re.search(r'([\d]+[\.,]?[\d]*)', value)
-                        if carb_match and carb_match.group(1):
-                            valores['CARBOIDRATOS (g)'] = carb_match.group(1).replace(',', '.')
-                    elif any(termo in label for termo in ['proteínas', 'proteína', 'proteinas']):
-                        prot_match = re.search(r'([\d]+[\.,]?[\d]*)', value)
-                        if prot_match and prot_match.group(1):
-                            valores['PROTEINAS (g)'] = prot_match.group(1).replace(',', '.')
-                    elif any(termo in label for termo in ['gorduras totais', 'gorduras', 'gorduras totais']):
-                        gord_match = re.search(r'([\d]+[\.,]?[\d]*)', value)
-                        if gord_match and gord_match.group(1):
-                            valores['GORDURAS_TOTAIS (g)'] = gord_match.group(1).replace(',', '.')
-                    elif any(termo in label for termo in ['gorduras saturadas', 'gorduras saturadas']):
-                        gord_sat_match = re.search(r'([\d]+[\.,]?[\d]*)', value)
-                        if gord_sat_match and gord_sat_match.group(1):
-                            valores['GORDURAS_SATURADAS (g)'] = gord_sat_match.group(1).replace(',', '.')
-                    elif any(termo in label for termo in ['fibra alimentar', 'fibra']):
-                        fibra_match = re.search(r'([\d]+[\.,]?[\d]*)', value)
-                        if fibra_match and fibra_match.group(1):
-                            valores['FIBRAS (g)'] = fibra_match.group(1).replace(',', '.')
-                    elif any(termo in label for termo in ['açúcares', 'açucares', 'açúcar', 'açucar']):
-                        acucar_match = re.search(r'([\d]+[\.,]?[\d]*)', value)
-                        if acucar_match and acucar_match.group(1):
-                            valores['ACUCARES (g)'] = acucar_match.group(1).replace(',', '.')
-                    elif any(termo in label for termo in ['sódio', 'sodio']):
-                        sodio_match = re.search(r'([\d]+[\.,]?[\d]*)', value)
-                        if sodio_match and sodio_match.group(1):
-                            valores['SODIO (mg)'] = sodio_match.group(1).replace(',', '.')
-    
-    # 2. Em parágrafos e elementos de texto
-    if isinstance(info_div, Tag):
-        for elem in info_div.find_all(['p', 'strong', 'span', 'div']):
-            texto = elem.get_text(strip=True)
-            padroes = [
-                (r'valor energético[:\s]*([\d]+[\.,]?[\d]*)\s*kcal', 'CALORIAS (kcal)', 'kcal'),
-                (r'carboidratos[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'CARBOIDRATOS (g)', 'g'),
-                (r'proteínas[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'PROTEINAS (g)', 'g'),
-                (r'gorduras totais[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'GORDURAS_TOTAIS (g)', 'g'),
-                (r'gorduras saturadas[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'GORDURAS_SATURADAS (g)', 'g'),
-                (r'fibra alimentar[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'FIBRAS (g)', 'g'),
-                (r'açúcares[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'ACUCARES (g)', 'g'),
-                (r'sódio[:\s]*([\d]+[\.,]?[\d]*)\s*mg', 'SODIO (mg)', 'mg')
-            ]
-            for padrao, campo, unidade in padroes:
-                match = re.search(padrao, texto, re.IGNORECASE)
-                if match and match.group(1) and (valores[campo] == f'0 {unidade}' or valores[campo] == f'0{unidade}'):
-                    valores[campo] = match.group(1).replace(',', '.') + ' ' + unidade
-    
-    # 3. Procura por dados em formato de lista ou texto corrido
-    texto_completo = info_div.get_text()
-    padroes_texto = [
-        (r'valor energético[:\s]*([\d]+[\.,]?[\d]*)\s*kcal', 'CALORIAS (kcal)', 'kcal'),
-        (r'carboidratos[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'CARBOIDRATOS (g)', 'g'),
-        (r'proteínas[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'PROTEINAS (g)', 'g'),
-        (r'gorduras totais[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'GORDURAS_TOTAIS (g)', 'g'),
-        (r'gorduras saturadas[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'GORDURAS_SATURADAS (g)', 'g'),
-        (r'fibra alimentar[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'FIBRAS (g)', 'g'),
-        (r'açúcares[:\s]*([\d]+[\.,]?[\d]*)\s*g', 'ACUCARES (g)', 'g'),
-        (r'sódio[:\s]*([\d]+[\.,]?[\d]*)\s*mg', 'SODIO (mg)', 'mg')
-    ]
-    for padrao, campo, unidade in padroes_texto:
-        match = re.search(padrao, texto_completo, re.IGNORECASE)
-        if match and match.group(1) and (valores[campo] == f'0 {unidade}' or valores[campo] == f'0{unidade}'):
-            valores[campo] = match.group(1).replace(',', '.') + ' ' + unidade
-    # Garante que nenhum campo fique com vírgula, ponto ou espaço isolado
-    for campo, unidade in [('CALORIAS (kcal)', 'kcal'), ('CARBOIDRATOS (g)', 'g'), ('PROTEINAS (g)', 'g'), ('GORDURAS_TOTAIS (g)', 'g'), ('GORDURAS_SATURADAS (g)', 'g'), ('FIBRAS (g)', 'g'), ('ACUCARES (g)', 'g'), ('SODIO (mg)', 'mg')]:
-        valor = valores[campo].replace(' ', '')
-        if valor in [',', '.', ',g', '.g', ',mg', '.mg', 'g', 'mg', 'kcal', '']:  # Se ficou só unidade ou símbolo
-            valores[campo] = f'0{unidade}'
-    
-    # Cria o registro com os dados encontrados
-    dados = {
-        'NOME_PRODUTO': nome,
-        'URL': url,
-        'CATEGORIA': categoria,
-        'PORCAO (g)': porcao.replace('g','').replace(',','.') if porcao else '0',
-        'CALORIAS (kcal)': valores['CALORIAS (kcal)'],
-        'CARBOIDRATOS (g)': valores['CARBOIDRATOS (g)'],
-        'PROTEINAS (g)': valores['PROTEINAS (g)'],
-        'GORDURAS_TOTAIS (g)': valores['GORDURAS_TOTAIS (g)'],
-        'GORDURAS_SATURADAS (g)': valores['GORDURAS_SATURADAS (g)'],
-        'FIBRAS (g)': valores['FIBRAS (g)'],
-        'ACUCARES (g)': valores['ACUCARES (g)'],
-        'SODIO (mg)': valores['SODIO (mg)']
-    }
-    
-    df = pd.concat([df, pd.DataFrame([dados])], ignore_index=True)
-    console.print(f"[bold green]✅ Informações extraídas para {nome}")
-    
-    return df
+COLUNAS = ['NOME_PRODUTO', 'URL', 'CATEGORIA', 'PORCAO (g)'] + NUTRIENT_COLUMNS
+
+_TITULO_SABOR = re.compile(r'INFORMAÇÃO NUTRICIONAL\s*[–-]?\s*(.*)', re.IGNORECASE)
+_PORCAO = re.compile(r'Porção de ([\d,]+)\s*g')
+_NUMERO = re.compile(r'(\d+[\.,]?\d*)')
+_KCAL = re.compile(r'(\d+[\.,]?\d*)\s*kcal', re.IGNORECASE)
+
+# URL cujo driver falhou por último em cada thread: o próximo driver aberto
+# para ela (nova tentativa do RetryPolicy) conta como reinicialização
+_falha_driver = threading.local()
+
+class _Secao:
+    """Trecho do bloco de informações: antes do primeiro título ou de um título "INFORMAÇÃO NUTRICIONAL" até o próximo"""
 
-def extract_nutritional_info(url: str) -> Optional[pd.DataFrame]:
+    def __init__(self, sabor: Optional[str] = None):
+        self.sabor = sabor
+        self.porcao: Optional[str] = None
+        self.valores: Dict[str, str] = {}
+        self.textos: List[str] = []
+
+    def ler_tabela(self, tabela: Tag) -> None:
+        # Rótulo na primeira coluna, valor na segunda; vale a primeira linha de cada nutriente
+        for row in tabela.find_all('tr'):
+            cols = row.find_all(['td', 'th'])
+            if len(cols) < 2:
+                continue
+            regra = matcher.classify(cols[0].get_text(strip=True))
+            if regra is None or not regra.column or regra.column in self.valores:
+                continue
+            valor = cols[1].get_text(strip=True)
+            # Calorias: o número antes de "kcal" (a célula também traz os kJ)
+            valor_match = (regra.unit == 'kcal' and _KCAL.search(valor)) or _NUMERO.search(valor)
+            if valor_match:
+                self.valores[regra.column] = valor_match.group(1).replace(',', '.')
+
+    def concluir(self) -> Dict[str, str]:
+        # Parágrafos e texto corrido ("Sódio: 104 mg") completam o que a tabela não trouxe
+        if self.textos:
+            for campo, valor in scan_text(' '.join(self.textos)).items():
+                self.valores.setdefault(campo, valor)
+        return self.valores
+
+def extract_nutritional_info_flavors(info_div: Tag, nome: str, categoria: str, url: str) -> Optional[pd.DataFrame]:
     """
-    Extrai informações nutricionais do produto usando abordagem liberal.
-    Retorna um DataFrame com os dados.
+    Percorre `info_div.contents` uma única vez e gera uma linha por sabor.
+
+    Cada título "INFORMAÇÃO NUTRICIONAL – <sabor>" abre uma seção com a própria
+    porção e os próprios valores, lidos de tabelas, parágrafos ou texto
+    corrido. Sem títulos (ou sem valores sob eles), o bloco inteiro vira uma
+    única linha, como na abordagem liberal de antes; sem nenhum valor no
+    bloco, retorna None.
     """
-    try:
-        driver, browser_name = get_browser_driver(headless=True)
-        console.print(Panel(f"[bold blue]🔍 Acessando página do produto com {browser_name}"))
-        driver.get(url)
-        driver.execute_script("document.body.style.zoom='50%'")
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
+    # A primeira seção é o trecho antes de qualquer título
+    secoes = [_Secao()]
+    for elem in info_div.contents:
+        atual = secoes[-1]
+        if not isinstance(elem, Tag):
+            texto = str(elem).strip()
+            if texto:
+                atual.textos.append(texto)
+            continue
+        if elem.name == 'table':
+            atual.ler_tabela(elem)
+            continue
+        texto = elem.get_text(' ', strip=True)
+        match_sabor = _TITULO_SABOR.match(texto)
+        if match_sabor:
+            atual = _Secao(match_sabor.group(1).strip())
+            secoes.append(atual)
+        for tabela in elem.find_all('table'):
+            atual.ler_tabela(tabela)
+        if not atual.porcao:
+            match_porcao = _PORCAO.search(texto)
+            if match_porcao:
+                atual.porcao = match_porcao.group(1)
+        atual.textos.append(texto)
 
-        nome_element = soup.find('h1', {'itemprop': 'name'})
-        nome = nome_element.text.strip() if nome_element else ''
-        categoria_element = soup.find('div', {'itemprop': 'category'})
-        categoria = categoria_element.text.strip() if categoria_element else ''
+    def linha(secao: _Secao) -> Dict[str, str]:
+        sabor = secao.sabor
+        return {
+            'NOME_PRODUTO': f"{nome} - {sabor}" if sabor else nome,
+            'URL': f"{url}?sabor={sabor.lower().replace(' ', '-').replace('–','-')}" if sabor else url,
+            'CATEGORIA': categoria,
+            'PORCAO (g)': (secao.porcao or '0').replace(',', '.'),
+            **{campo: secao.valores.get(campo, '0') for campo in NUTRIENT_COLUMNS}
+        }
 
-        if not nome:
-            console.print("[bold red]❌ Não foi possível encontrar o nome do produto")
+    linhas = [linha(secao) for secao in secoes[1:] if secao.concluir()]
+    if not linhas:
+        # Sem sabores identificados: uma linha com o que houver no bloco inteiro
+        geral = _Secao()
+        for secao in secoes:
+            for campo, valor in secao.concluir().items():
+                geral.valores.setdefault(campo, valor)
+            geral.porcao = geral.porcao or secao.porcao
+        if not geral.valores:
+            # Bloco sem tabela (ex.: página renderizada pela metade): falha, não uma linha zerada
+            console.print("[bold yellow]⚠️ Nenhum valor nutricional encontrado no bloco de informações")
+            metrics.PARSE_FAILURES.inc(reason='sem_tabela')
             return None
+        linhas = [linha(geral)]
+    for registro in linhas:
+        console.print(f"[bold green]✅ Informações extraídas para {registro['NOME_PRODUTO']}")
+    return pd.DataFrame(linhas, columns=COLUNAS, dtype=object)
+
+def extract_from_html(html: str, url: str) -> Optional[pd.DataFrame]:
+    """
+    Extrai informações nutricionais a partir do HTML já carregado da página.
+    Não depende do navegador, então serve para reprocessar páginas salvas.
+    """
+    # Nome e categoria vêm do microdata/JSON-LD, sem montar a árvore; uma
+    # página sem nome de produto é descartada antes do parsing completo
+    with timer.stage('metadata'):
+        metadados = extract_structured_data(html)
+    nome = metadados['name']
+    categoria = metadados['category']
+    if not nome:
+        console.print("[bold red]❌ Não foi possível encontrar o nome do produto")
+        metrics.PARSE_FAILURES.inc(reason='sem_nome')
+        return None
 
-        # Tenta primeiro a abordagem liberal
-        df = extract_nutritional_info_liberal(soup, nome, categoria, url)
-        
-        if df is not None and not df.empty:
-            console.print(f"[bold green]✅ Total de {len(df)} produtos processados!")
-            return df
-        
-        # Se não encontrou dados, tenta a abordagem original como fallback
-        console.print("[bold yellow]⚠️ Tentando abordagem alternativa...")
-        
+    with timer.stage('parse'):
+        soup = BeautifulSoup(html, 'html.parser')
+    try:
         info_div = soup.find('div', {'class': 'bloco_texto', 'id': 'informacoes'})
-        if not info_div:
+        if not isinstance(info_div, Tag):
             console.print("[bold red]❌ Não foi possível encontrar o bloco de informações nutricionais")
+            metrics.PARSE_FAILURES.inc(reason='sem_bloco')
             return None
 
-        df = pd.DataFrame([])
-        colunas = [
-            'NOME_PRODUTO', 'URL', 'CATEGORIA', 'PORCAO (g)', 'CALORIAS (kcal)', 'CARBOIDRATOS (g)',
-            'PROTEINAS (g)', 'GORDURAS_TOTAIS (g)', 'GORDURAS_SATURADAS (g)', 'FIBRAS (g)', 'ACUCARES (g)', 'SODIO (mg)'
-        ]
-        df = df.reindex(columns=colunas)
-        sabor_atual = None
-        porcao_atual = None
-        if not isinstance(info_div, Tag):
-            return None
-        for elem in info_div.contents:
-            if not isinstance(elem, Tag):
-                continue
-            texto = elem.get_text(strip=True)
-            match_sabor = re.match(r'INFORMAÇÃO NUTRICIONAL\s*[–-]?\s*(.*)', texto, re.IGNORECASE)
-            if match_sabor:
-                sabor_atual = match_sabor.group(1).strip()
-                if not sabor_atual:
-                    sabor_atual = None  # Produto sem sabor
-                porcao_atual = None
-            if sabor_atual is not None and not porcao_atual:
-                match_porcao = re.search(r'Porção de ([\d,]+\s*g)', texto)
-                if match_porcao:
-                    porcao_atual = match_porcao.group(1)
-            if sabor_atual is not None and elem.name == 'table':
-                valores = {}
-                for row in elem.find_all('tr'):
-                    if not isinstance(row, Tag):
-                        continue
-                    cols = row.find_all('td')
-                    if len(cols) >= 2:
-                        label = cols[0].text.strip()
-                        value = cols[1].text.strip()
-                        if 'Valor Energético' in label:
-                            calorias_match = re.search(r'(\d+)\s*kcal', value)
-                            if calorias_match:
-                                valores['CALORIAS (kcal)'] = calorias_match.group(1)
-                        elif 'Carboidratos' in label:
-                            carb_match = re.search(r'([\d,]+)', value)
-                            if carb_match:
-                                valores['CARBOIDRATOS (g)'] = carb_match.group(1)
-                        elif 'Proteínas' in label:
-                            prot_match = re.search(r'([\d,]+)', value)
-                            if prot_match:
-                                valores['PROTEINAS (g)'] = prot_match.group(1)
-                        elif 'Gorduras Totais' in label:
-                            gord_match = re.search(r'([\d,]+)', value)
-                            if gord_match:
-                                valores['GORDURAS_TOTAIS (g)'] = gord_match.group(1)
-                        elif 'Gorduras Saturadas' in label:
-                            gord_sat_match = re.search(r'([\d,]+)', value)
-                            if gord_sat_match:
-                                valores['GORDURAS_SATURADAS (g)'] = gord_sat_match.group(1)
-                        elif 'Fibra Alimentar' in label:
-                            fibra_match = re.search(r'([\d,]+)', value)
-                            if fibra_match:
-                                valores['FIBRAS (g)'] = fibra_match.group(1)
-                        elif 'Açúcares' in label or 'Açucares' in label:
-                            acucar_match = re.search(r'([\d,]+)', value)
-                            if acucar_match:
-                                valores['ACUCARES (g)'] = acucar_match.group(1)
-                        elif 'Sódio' in label:
-                            sodio_match = re.search(r'([\d,]+)', value)
-                            if sodio_match:
-                                valores['SODIO (mg)'] = sodio_match.group(1)
-                if sabor_atual:
-                    nome_produto = f"{nome} - {sabor_atual}"
-                else:
-                    nome_produto = nome
-                dados = {
-                    'NOME_PRODUTO': nome_produto,
-                    'URL': f"{url}?sabor={sabor_atual.lower().replace(' ', '-').replace('–','-')}" if sabor_atual else url,
-                    'CATEGORIA': categoria,
-                    'PORCAO (g)': porcao_atual or "0g",
-                    'CALORIAS (kcal)': valores.get('CALORIAS (kcal)', '0'),
-                    'CARBOIDRATOS (g)': valores.get('CARBOIDRATOS (g)', '0'),
-                    'PROTEINAS (g)': valores.get('PROTEINAS (g)', '0'),
-                    'GORDURAS_TOTAIS (g)': valores.get('GORDURAS_TOTAIS (g)', '0'),
-                    'GORDURAS_SATURADAS (g)': valores.get('GORDURAS_SATURADAS (g)', '0'),
-                    'FIBRAS (g)': valores.get('FIBRAS (g)', '0'),
-                    'ACUCARES (g)': valores.get('ACUCARES (g)', '0'),
-                    'SODIO (mg)': valores.get('SODIO (mg)', '0')
-                }
-                df = pd.concat([df, pd.DataFrame([dados])], ignore_index=True)
-                console.print(f"[bold green]✅ Informações extraídas para {nome_produto}")
-                sabor_atual = None
-        if df.empty:
-            console.print("[bold red]❌ Nenhum sabor/tabela encontrado!")
+        with timer.stage('extract'):
+            df = extract_nutritional_info_flavors(info_div, nome, categoria, url)
+        if df is None:
             return None
-        console.print(f"[bold green]✅ Total de {len(df)} sabores processados!")
+        console.print(f"[bold green]✅ Total de {len(df)} produtos processados!")
         return df
+    finally:
+        # Desfaz os laços entre os nós; o que sobrar em ciclo fica para o coletor de lixo
+        soup.decompose()
+
+def init_parse_worker() -> None:
+    """Inicializa um processo de parsing: sem saída no terminal"""
+    console.quiet = True
+    set_log_level('error')
+
+def parse_to_records(html: bytes, url: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parsing para uso em um pool de processos: recebe o HTML bruto (UTF-8) e
+    devolve registros compactos (lista de dicts), mais baratos de serializar
+    de volta ao processo principal do que um DataFrame.
+    """
+    df = extract_from_html(html.decode('utf-8', errors='replace'), url)
+    return None if df is None else df.to_dict('records')
+
+def fetch_product_html(url: str) -> str:
+    """
+    Abre a página do produto no navegador e retorna o HTML renderizado.
+    Exceções do navegador são propagadas sem tratamento; páginas de erro da
+    loja (429/5xx, 404/410) levantam Throttled/NotFound, para que o controle
+    de concorrência e as novas tentativas reajam como no download HTTP.
+    """
+    # Perfil persistente do pool (None = perfil descartável)
+    perfil = profiles.acquire()
+    try:
+        with timer.stage('driver_start'):
+            driver, browser_name = get_browser_driver(headless=True, profile_dir=perfil)
+        metrics.DRIVER_STARTS.inc()
+        if getattr(_falha_driver, 'url', None) == url:
+            metrics.DRIVER_RESTARTS.inc()
+        _falha_driver.url = None
+        console.print(Panel(f"[bold blue]🔍 Acessando página do produto com {browser_name}"))
+        with timer.stage('driver_get'):
+            driver.get(url)
+            driver.execute_script("document.body.style.zoom='50%'")
+        status = response_status(driver)
+        if status in THROTTLE_STATUS:
+            # O navegador não expõe o Retry-After: a espera fica com o backoff
+            raise Throttled(status, None, url)
+        if status in (404, 410):
+            raise NotFound(f"HTTP {status}", url)
+        with timer.stage('page_source'):
+            html = driver.page_source
+        metrics.PAGES_FETCHED.inc(kind='product')
+        metrics.BYTES_FETCHED.inc(len(html.encode('utf-8')), kind='product')
+        transferidos, do_cache = measure_transfer(driver)
+        metrics.TRANSFER_BYTES.inc(transferidos, kind='product')
+        metrics.CACHE_HITS.inc(do_cache)
+        archive.add(url, html)
+        return html
     except Exception as e:
-        console.print(f"[bold red]❌ Erro ao extrair informações: {str(e)}")
-        return None
+        if isinstance(classify(e, url), DriverError):
+            _falha_driver.url = url
+        raise
     finally:
         if 'driver' in locals():
-            driver.quit()
+            with timer.stage('driver_quit'):
+                driver.quit()
+        profiles.release(perfil)
+
+def extract_nutritional_info(url: str, raise_errors: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Extrai informações nutricionais do produto usando abordagem liberal.
+    Retorna um DataFrame com os dados.
+
+    Com raise_errors=True, falhas do navegador são propagadas já
+    classificadas (PageTimeout, DriverError...; ver config.retry), para que
+    possam ser repetidas e para o controle de concorrência reagir, e uma
+    página carregada sem dados nutricionais levanta ParseError (permanente,
+    não repetida). Sem raise_errors, qualquer falha retorna None.
+    """
+    try:
+        html = fetch_product_html(url)
+        df = extract_from_html(html, url)
+    except Exception as e:
+        erro = classify(e, url)
+        console.print(f"[bold red]❌ Erro ao extrair informações ({erro.category}): {str(e)}")
+        log_error(f"Erro ao extrair informações de {url} ({erro.category}): {e}")
+        timer.mark_failed(f"{erro.category}: {e}")
+        metrics.PARSE_FAILURES.inc(reason=erro.category)
+        if raise_errors:
+            raise erro from e
+        return None
+    if df is None and raise_errors:
+        timer.mark_failed('sem dados')
+        raise ParseError("página carregada sem dados nutricionais", url)
+    return df
 
 def save_to_csv(df: pd.DataFrame) -> None:
     """
@@ -0,0 +1,116 @@
+"""
+Conjunto persistente e compacto das URLs de produto já vistas.
+
+Cada URL vira um hash de 64 bits (blake2b). Os hashes ficam ordenados em um
+arquivo binário (dados/seen_urls.bin, 8 bytes por URL) aberto com mmap: a
+carga não lê o arquivo e "já conhecida?" é uma busca binária sobre as páginas
+mapeadas, sem montar um set com as strings. A chance de colisão é
+desprezível no tamanho de uma loja (~3e-8 com um milhão de URLs).
+
+As URLs em si ficam em um log apenas de acréscimo (dados/seen_urls.log), a
+fonte exata a partir da qual o arquivo de hashes pode ser refeito (rebuild).
+As URLs novas de uma execução ficam em memória até save(), que intercala os
+hashes novos com os do arquivo e o substitui de forma atômica.
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Optional, Set
+
+def url_hash(url: str) -> int:
+    """Hash de 64 bits da URL (sem espaços nas pontas e sem o fragmento #...)"""
+    normalizada = url.strip().split('#', 1)[0]
+    return int.from_bytes(hashlib.blake2b(normalizada.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class SeenURLs:
+    """Hashes ordenados via mmap + log exato das URLs"""
+
+    def __init__(self, path: str = 'dados/seen_urls.bin'):
+        self.path = path
+        self.log_path = os.path.splitext(path)[0] + '.log'
+        self._novos: Set[int] = set()
+        self._novas_urls = []
+        self._arquivo = None
+        self._mapa: Optional[mmap.mmap] = None
+        self._hashes = memoryview(b'').cast('Q')
+        self._abrir()
+
+    def _abrir(self) -> None:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        self._arquivo = open(self.path, 'rb')
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._hashes = memoryview(self._mapa).cast('Q')
+
+    def close(self) -> None:
+        self._hashes.release()
+        self._hashes = memoryview(b'').cast('Q')
+        if self._mapa is not None:
+            self._mapa.close()
+            self._arquivo.close()
+            self._mapa = self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.save()
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._novos)
+
+    def _no_arquivo(self, valor: int) -> bool:
+        posicao = bisect_left(self._hashes, valor)
+        return posicao < len(self._hashes) and self._hashes[posicao] == valor
+
+    def __contains__(self, url: str) -> bool:
+        valor = url_hash(url)
+        return valor in self._novos or self._no_arquivo(valor)
+
+    def add(self, url: str) -> bool:
+        """Marca a URL como vista; True se ela ainda não era conhecida"""
+        valor = url_hash(url)
+        if valor in self._novos or self._no_arquivo(valor):
+            return False
+        self._novos.add(valor)
+        self._novas_urls.append(url)
+        return True
+
+    def update(self, urls: Iterable[str]) -> int:
+        """Marca várias URLs; devolve quantas eram novas"""
+        return sum(self.add(url) for url in urls)
+
+    def save(self) -> None:
+        """Acrescenta as URLs novas ao log e regrava o arquivo de hashes"""
+        if not self._novos:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.writelines(url + '\n' for url in self._novas_urls)
+        self._gravar(heapq.merge(self._hashes, sorted(self._novos)))
+        self._novos.clear()
+        self._novas_urls.clear()
+
+    def _gravar(self, hashes: Iterable[int]) -> None:
+        temporario = self.path + '.tmp'
+        with open(temporario, 'wb') as f:
+            array('Q', hashes).tofile(f)
+        self.close()
+        os.replace(temporario, self.path)
+        self._abrir()
+
+    def rebuild(self) -> int:
+        """Refaz o arquivo de hashes a partir do log; devolve o número de URLs"""
+        self._novos.clear()
+        self._novas_urls.clear()
+        hashes = set()
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                hashes = {url_hash(linha) for linha in f if linha.strip()}
+        self._gravar(sorted(hashes))
+        return len(hashes)
@@ -0,0 +1,95 @@
+"""
+Divisão determinística da lista de URLs em shards independentes.
+
+Cada URL pertence ao shard `hash(url) % n`, com um hash estável (md5), de
+modo que qualquer máquina ou runner de CI calcula a mesma divisão sem
+coordenação e a mesma URL cai sempre no mesmo shard entre execuções. Cada
+shard grava o próprio CSV (`produtos.shard-2-of-4.csv`) e `merge_shards`
+junta os arquivos usando a mesma chave de deduplicação do save_incremental.
+"""
+
+import glob
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+DEDUPE_KEY = 'NOME_PRODUTO'
+
+def parse_shard(valor: str) -> Tuple[int, int]:
+    """Converte 'i/n' (1 <= i <= n) em (i, n)"""
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', valor or '')
+    if not match:
+        raise ValueError(f"Shard inválido: {valor!r} (use i/n, ex.: 2/4)")
+    indice, total = int(match.group(1)), int(match.group(2))
+    if not 1 <= indice <= total:
+        raise ValueError(f"Shard inválido: {valor!r} (i deve estar entre 1 e n)")
+    return indice, total
+
+def shard_of(url: str, total: int) -> int:
+    """Shard (1..total) da URL"""
+    digest = hashlib.md5(url.strip().encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % total + 1
+
+def select_shard(urls: List[str], indice: int, total: int) -> List[str]:
+    """URLs do shard, na ordem original"""
+    return [url for url in urls if shard_of(url, total) == indice]
+
+def shard_path(caminho: str, indice: int, total: int) -> str:
+    """dados/produtos.csv -> dados/produtos.shard-2-of-4.csv"""
+    base, extensao = os.path.splitext(caminho)
+    return f"{base}.shard-{indice}-of-{total}{extensao}"
+
+def _agrupar_shards(output_file: str) -> Dict[int, Dict[int, str]]:
+    """N -> {i -> arquivo} dos shards de `output_file` encontrados no disco"""
+    base, extensao = os.path.splitext(output_file)
+    nome = re.compile(re.escape(os.path.basename(base)) + r'\.shard-(\d+)-of-(\d+)' + re.escape(extensao) + '$')
+    grupos: Dict[int, Dict[int, str]] = {}
+    for arquivo in glob.glob(f"{glob.escape(base)}.shard-*-of-*{extensao}"):
+        match = nome.match(os.path.basename(arquivo))
+        if match:
+            grupos.setdefault(int(match.group(2)), {})[int(match.group(1))] = arquivo
+    return grupos
+
+def merge_shards(output_file: str = 'dados/produtos.csv', total: Optional[int] = None) -> Tuple[int, List[str]]:
+    """
+    Junta os CSVs dos shards em `output_file`
+
+    Só junta um conjunto completo de um mesmo N (`shard-1-of-N` .. `shard-N-of-N`):
+    sobras de uma execução anterior com outro N cobririam URLs repetidas ou
+    faltantes. Com vários N no disco, `total` escolhe qual juntar.
+
+    Os shards são disjuntos por URL; a deduplicação por NOME_PRODUTO cobre
+    produtos repetidos com URLs diferentes (mantém o shard de maior índice,
+    para o resultado não depender da ordem de término dos runners).
+
+    Returns:
+        (linhas gravadas, arquivos lidos); (0, []) sem arquivos de shard
+
+    Raises:
+        ValueError: vários N sem `total`, ou conjunto incompleto
+    """
+    import pandas as pd
+    grupos = _agrupar_shards(output_file)
+    if total is None:
+        if not grupos:
+            return 0, []
+        if len(grupos) > 1:
+            encontrados = ', '.join(f"{len(grupos[n])} de {n}" for n in sorted(grupos))
+            raise ValueError(f"shards de execuções com N diferentes ({encontrados}); informe qual N juntar")
+        total = next(iter(grupos))
+    presentes = grupos.get(total, {})
+    faltando = [i for i in range(1, total + 1) if i not in presentes]
+    if faltando:
+        raise ValueError(f"conjunto de {total} shards incompleto, faltam: "
+                         + ', '.join(shard_path(output_file, i, total) for i in faltando))
+    arquivos = [presentes[i] for i in range(1, total + 1)]
+    partes = [pd.read_csv(arquivo) for arquivo in arquivos]
+    df = pd.concat(partes, ignore_index=True)
+    if DEDUPE_KEY in df.columns:
+        df = df.drop_duplicates(subset=[DEDUPE_KEY], keep='last').sort_values(DEDUPE_KEY, kind='stable')
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    temporario = output_file + '.tmp'
+    df.to_csv(temporario, index=False)
+    os.replace(temporario, output_file)
+    return len(df), arquivos
@@ -0,0 +1,173 @@
+"""
+Extração rápida de metadados estruturados do produto (microdata e JSON-LD).
+
+Uma única varredura do HTML bruto com expressões regulares, sem montar a
+árvore do BeautifulSoup, recolhe:
+
+    - microdata: elementos com itemprop (name, category, price, availability, sku...)
+    - JSON-LD: blocos <script type="application/ld+json"> com @type Product
+
+e devolve nome, categoria, preço, disponibilidade e SKU, além de uma
+impressão digital (`fingerprint`) desses campos, útil como sinal barato de
+"o produto mudou?" antes do parsing completo da tabela nutricional.
+"""
+
+import hashlib
+import html as html_lib
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+# Propriedades de microdata recolhidas (as demais, como a descrição longa, são ignoradas)
+PROPRIEDADES = {'name', 'category', 'price', 'priceCurrency', 'currency', 'availability',
+                'sku', 'productID', 'brand', 'gtin13'}
+# Elementos sem tag de fechamento
+_VAZIOS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+           'source', 'track', 'wbr'}
+CAMPOS = ('name', 'category', 'category_path', 'price', 'currency', 'availability', 'sku', 'brand')
+# Nome e categoria só valem nestas tags (as do soup.find usado antes): um itemprop="name"
+# aninhado em marca, oferta ou breadcrumb não pode renomear o produto, pois NOME_PRODUTO
+# é a chave de deduplicação do CSV e do relatório de mudanças
+_TAG_DA_PROPRIEDADE = {'name': 'h1', 'category': 'div'}
+
+# Uma passada procurando só os marcadores; a tag em volta de cada um é lida depois.
+# Sem IGNORECASE: o padrão literal é várias vezes mais rápido e a loja usa minúsculas
+_MARCADOR = re.compile(r'itemprop\s*=|data-sku\s*=|application/ld\+json')
+_TAG = re.compile(r'<(?P<tag>[a-zA-Z][\w-]*)(?P<attrs>(?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+_FIM_SCRIPT = re.compile(r'</script\s*>', re.IGNORECASE)
+_ATRIBUTO = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+_TAGS = re.compile(r'<[^>]+>')
+
+def _atributos(texto: str) -> Dict[str, str]:
+    return {m.group(1).lower(): html_lib.unescape(m.group(2) or m.group(3) or m.group(4) or '')
+            for m in _ATRIBUTO.finditer(texto)}
+
+def _texto_do_elemento(html: str, tag: str, inicio: int) -> str:
+    """Texto entre a tag de abertura (terminada em `inicio`) e o fechamento correspondente"""
+    padrao = re.compile(rf'<(/?){re.escape(tag)}\b[^>]*>', re.IGNORECASE)
+    profundidade = 1
+    for m in padrao.finditer(html, inicio):
+        profundidade += -1 if m.group(1) else 1
+        if profundidade == 0:
+            fragmento = html[inicio:m.start()]
+            return html_lib.unescape(_TAGS.sub('', fragmento)).strip()
+    return ''
+
+def _varrer(html: str) -> Tuple[Dict[str, Dict[str, str]], List[str], str]:
+    microdata: Dict[str, Dict[str, str]] = {}
+    json_ld: List[str] = []
+    data_sku = ''
+    posicao = 0
+    for marcador in _MARCADOR.finditer(html):
+        if marcador.start() < posicao:
+            continue
+        m = _TAG.match(html, html.rfind('<', 0, marcador.start()))
+        if not m or m.end() <= marcador.start():
+            continue
+        posicao = m.end()
+        tag = m.group('tag').lower()
+        atributos = _atributos(m.group('attrs'))
+        if tag == 'script':
+            if atributos.get('type', '').lower() == 'application/ld+json':
+                fim = _FIM_SCRIPT.search(html, m.end())
+                if fim:
+                    json_ld.append(html[m.end():fim.start()])
+                    posicao = fim.end()
+            continue
+        if not data_sku and atributos.get('data-sku'):
+            data_sku = atributos['data-sku']
+        propriedade = atributos.get('itemprop')
+        if propriedade not in PROPRIEDADES or propriedade in microdata:
+            continue
+        if _TAG_DA_PROPRIEDADE.get(propriedade, tag) != tag:
+            continue
+        valor = atributos.get('content') or atributos.get('href') or atributos.get('value') or ''
+        texto = ''
+        if tag not in _VAZIOS and not m.group(0).endswith('/>'):
+            texto = _texto_do_elemento(html, tag, m.end())
+        microdata[propriedade] = {'content': valor.strip(), 'text': texto}
+    return microdata, json_ld, data_sku
+
+def _produtos_json_ld(bloco: str) -> List[dict]:
+    try:
+        dados = json.loads(bloco)
+    except ValueError:
+        return []
+    pendentes, produtos = [dados], []
+    while pendentes:
+        item = pendentes.pop()
+        if isinstance(item, list):
+            pendentes.extend(item)
+        elif isinstance(item, dict):
+            tipo = item.get('@type')
+            tipos = tipo if isinstance(tipo, list) else [tipo]
+            if 'Product' in tipos:
+                produtos.append(item)
+            pendentes.extend(v for k, v in item.items() if k == '@graph')
+    return produtos
+
+def _texto(valor: Any) -> str:
+    if isinstance(valor, dict):
+        valor = valor.get('name') or valor.get('@id') or ''
+    if isinstance(valor, list):
+        valor = valor[0] if valor else ''
+    return ' '.join(str(valor).split()) if valor is not None else ''
+
+def extract_structured_data(html: str) -> Dict[str, str]:
+    """
+    Retorna os metadados do produto (chaves em CAMPOS + 'source' e 'fingerprint').
+    Campos ausentes vêm como string vazia. Nome e categoria vêm do microdata
+    (h1 e div, como antes) e o JSON-LD só os completa; nos demais campos o
+    JSON-LD tem precedência e o microdata completa o que faltar.
+    """
+    md, json_ld, data_sku = _varrer(html)
+    dados = dict.fromkeys(CAMPOS, '')
+    fontes = []
+
+    for bloco in json_ld:
+        for produto in _produtos_json_ld(bloco):
+            ofertas = produto.get('offers') or {}
+            if isinstance(ofertas, list):
+                ofertas = ofertas[0] if ofertas else {}
+            candidatos = {
+                'name': _texto(produto.get('name')),
+                'category': _texto(produto.get('category')),
+                'price': _texto(ofertas.get('price') or ofertas.get('lowPrice')),
+                'currency': _texto(ofertas.get('priceCurrency')),
+                'availability': _texto(ofertas.get('availability')).rsplit('/', 1)[-1],
+                'sku': _texto(produto.get('sku') or produto.get('productID') or produto.get('gtin13')),
+                'brand': _texto(produto.get('brand')),
+            }
+            for campo, valor in candidatos.items():
+                if valor and not dados[campo]:
+                    dados[campo] = valor
+            fontes.append('json-ld')
+            break
+
+    if md:
+        fontes.append('microdata')
+    texto = lambda p: md.get(p, {}).get('text', '')
+    conteudo = lambda p: md.get(p, {}).get('content', '')
+    # Nome e categoria pelo texto visível (como o soup.find(...).text usado antes)
+    microdados = {
+        'name': texto('name') or conteudo('name'),
+        'category': texto('category') or conteudo('category'),
+        'category_path': conteudo('category'),
+        'price': conteudo('price') or texto('price'),
+        'currency': conteudo('priceCurrency') or conteudo('currency'),
+        'availability': (conteudo('availability') or texto('availability')).rsplit('/', 1)[-1],
+        'sku': conteudo('sku') or texto('sku') or conteudo('productID') or texto('productID') or data_sku,
+        'brand': texto('brand') or conteudo('brand'),
+    }
+    for campo, valor in microdados.items():
+        if valor and (not dados[campo] or campo in _TAG_DA_PROPRIEDADE):
+            dados[campo] = valor
+
+    dados['source'] = '+'.join(fontes)
+    dados['fingerprint'] = metadata_fingerprint(dados)
+    return dados
+
+def metadata_fingerprint(dados: Dict[str, str]) -> str:
+    """Hash dos campos do produto: muda quando nome, preço, disponibilidade... mudam"""
+    chave = '\x1f'.join(dados.get(campo, '') for campo in CAMPOS)
+    return hashlib.sha1(chave.encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,174 @@
+"""
+Instrumentação leve de tempo por etapa do scraping.
+
+Cada URL processada vira um evento JSON-lines com a duração (em ms) de cada
+etapa (inicialização do driver, driver.get, page_source, parsing, extração,
+gravação do CSV). Ao final da coleta é possível imprimir p50/p95/p99 por etapa.
+
+Quando desabilitada, `stage()` e `url()` devolvem um context manager vazio
+compartilhado, de modo que o custo é apenas uma checagem de atributo.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .utils import print_step, print_progress
+
+_NULL = nullcontext()
+
+def percentile(valores: List[float], p: float) -> float:
+    """Percentil pelo método nearest-rank (valores não precisam estar ordenados)"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, math.ceil(p * len(ordenados) / 100) - 1))
+    return ordenados[indice]
+
+class StageTimer:
+    """
+    Coleta a duração de cada etapa por URL e grava eventos em JSON-lines.
+    Seguro para uso com várias threads: cada thread tem sua URL corrente.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events_file: Optional[str] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._duracoes: Dict[str, List[float]] = {}
+        self._fh = None
+        # Funções chamadas com (etapa, duração_ms) a cada etapa medida
+        self.observers: List[Callable[[str, float], None]] = []
+
+    @property
+    def measuring(self) -> bool:
+        """Etapas são medidas com a instrumentação ativa ou com algum observador registrado"""
+        return self.enabled or bool(self.observers)
+
+    def observe(self, observer: Callable[[str, float], None]) -> None:
+        """
+        Registra um observador das etapas (ex.: o exportador de métricas). Só
+        com observadores as etapas são medidas, mas nada é acumulado para o
+        resumo nem gravado: `enabled` (--timing) continua desligado.
+        """
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def enable(self, events_file: Optional[str] = 'dados/timings.jsonl') -> None:
+        """Ativa a instrumentação; eventos são anexados em `events_file` (None para não gravar)"""
+        self.enabled = True
+        self.events_file = events_file
+        if events_file:
+            os.makedirs(os.path.dirname(events_file) or '.', exist_ok=True)
+            self._fh = open(events_file, 'a', encoding='utf-8')
+
+    def disable(self) -> None:
+        """Desativa a instrumentação e fecha o arquivo de eventos"""
+        self.enabled = False
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+    def reset(self) -> None:
+        """Descarta as durações acumuladas para o resumo"""
+        with self._lock:
+            self._duracoes = {}
+
+    def url(self, url: str):
+        """Context manager que delimita o processamento de uma URL"""
+        if not self.measuring:
+            return _NULL
+        return self._url(url)
+
+    def stage(self, nome: str):
+        """Context manager que mede uma etapa dentro da URL corrente"""
+        if not self.measuring:
+            return _NULL
+        return self._stage(nome)
+
+    def mark_failed(self, motivo: str = '') -> None:
+        """Marca a URL corrente como falha (o evento é gravado com ok=false)"""
+        registro = getattr(self._local, 'registro', None) if self.measuring else None
+        if registro is not None:
+            registro['ok'] = False
+            if motivo:
+                registro['erro'] = motivo
+
+    @contextmanager
+    def _url(self, url: str):
+        registro = {'ts': datetime.now().isoformat(timespec='seconds'), 'url': url, 'ok': True, 'stages': {}}
+        anterior = getattr(self._local, 'registro', None)
+        self._local.registro = registro
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        except BaseException:
+            registro['ok'] = False
+            raise
+        finally:
+            registro['total_ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+            self._local.registro = anterior
+            self._registrar(registro)
+
+    @contextmanager
+    def _stage(self, nome: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = (time.perf_counter() - inicio) * 1000
+            for observer in self.observers:
+                observer(nome, duracao)
+            registro = getattr(self._local, 'registro', None)
+            if registro is not None:
+                registro['stages'][nome] = round(registro['stages'].get(nome, 0.0) + duracao, 3)
+            elif self.enabled:
+                with self._lock:
+                    self._duracoes.setdefault(nome, []).append(duracao)
+
+    def _registrar(self, registro: dict) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            for nome, duracao in registro['stages'].items():
+                self._duracoes.setdefault(nome, []).append(duracao)
+            self._duracoes.setdefault('total', []).append(registro['total_ms'])
+            if self._fh:
+                self._fh.write(json.dumps(registro, ensure_ascii=False) + '\n')
+                self._fh.flush()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Retorna {etapa: {n, p50, p95, p99, max}} em milissegundos"""
+        with self._lock:
+            duracoes = {k: list(v) for k, v in self._duracoes.items()}
+        return {
+            nome: {
+                'n': len(valores),
+                'p50': percentile(valores, 50),
+                'p95': percentile(valores, 95),
+                'p99': percentile(valores, 99),
+                'max': max(valores),
+            }
+            for nome, valores in duracoes.items() if valores
+        }
+
+    def print_summary(self) -> None:
+        """Imprime a tabela de percentis por etapa"""
+        resumo = self.summary()
+        if not resumo:
+            return
+        print_step("Tempo por etapa (ms)")
+        print_progress(f"{'etapa':<16}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+        for nome, s in resumo.items():
+            print_progress(f"{nome:<16}{s['n']:>6}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}{s['max']:>10.1f}")
+        if self.events_file:
+            print_progress(f"Eventos por URL em: {self.events_file}")
+
+# Instância global usada pelo scraper e pelo main
+timer = StageTimer()
@@ -1,18 +1,27 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 import json
 import time
 import os
-from .browser import get_browser_driver
-from .utils import print_step, print_progress, print_collection_status, log_error
+from .browser import get_browser_driver, measure_transfer
+from .utils import print_step, print_progress, print_collection_status, log_error, flush_error_log, progress
+from . import metrics
+from .retry import RetryPolicy, breaker_for
+from .seen_urls import SeenURLs
+from .profiles import profiles
 
-def setup_driver():
-    """Configura o driver do Chrome com as opções necessárias"""
+BASE_URL = "https://www.corpoevidasuplementos.com.br"
+SEARCH_KEYWORDS = "Pura%20Vida"
+
+def setup_driver(profile_dir=None):
+    """Configura o driver do Chrome com as opções necessárias (profile_dir = perfil persistente)"""
     print_progress("Iniciando configuração do navegador (modo headless)...")
     
     # Obtém o driver do módulo browser.py com modo headless ativado
-    driver, browser_name = get_browser_driver(headless=True)
+    driver, browser_name = get_browser_driver(headless=True, profile_dir=profile_dir)
+    metrics.DRIVER_STARTS.inc()
     print_progress(f"Usando navegador: {browser_name}")
     
     print_progress("Configurando zoom para 50%...")
@@ -27,61 +36,59 @@ def setup_driver():
     print_progress("Navegador configurado com sucesso!")
     return driver
 
-def collect_product_urls():
-    """Coleta as URLs dos produtos da Pura Vida"""
+def iter_product_urls(base_url: str = BASE_URL, show_progress: bool = True):
+    """
+    Percorre a busca paginada e gera, página a página, a lista de URLs de
+    produto encontradas. Permite que o scraping comece antes do fim da
+    descoberta (ver config.pipeline). O navegador é fechado ao final.
+
+    Com show_progress=False a barra compartilhada não é tocada (no pipeline
+    ela mostra os produtos, não as páginas da busca).
+    """
     start_time = time.time()
-    print_step("Iniciando coleta de URLs dos produtos Pura Vida")
-    
-    # Cria o diretório dados se não existir
-    print_step("Verificando diretório de dados")
-    print_progress("Criando diretório 'dados' se não existir...")
-    os.makedirs('dados', exist_ok=True)
-    
-    # Inicializa o arquivo JSON vazio se não existir
-    output_file = 'dados/product_urls.json'
-    if not os.path.exists(output_file):
-        print_progress("Criando arquivo JSON vazio...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump([], f)
-    
-    base_url = "https://www.corpoevidasuplementos.com.br"
-    search_url = f"{base_url}/advanced_search_result.php?keywords=Pura%20Vida"
-    
+    search_url = f"{base_url}/advanced_search_result.php?keywords={SEARCH_KEYWORDS}"
     print_progress(f"URL base: {search_url}")
     
-    driver = setup_driver()
-    all_product_urls = []
+    perfil = profiles.acquire()
+    try:
+        driver = setup_driver(perfil)
+    except Exception:
+        profiles.release(perfil)
+        raise
+    politica = RetryPolicy()
     current_page = 1
-    has_more_pages = True
     
     try:
-        while has_more_pages:
+        while True:
             # Constrói a URL da página atual
             page_url = f"{search_url}&page={current_page}" if current_page > 1 else search_url
             print_step(f"Processando página {current_page}")
             print_progress(f"URL: {page_url}")
             
-            # Acessa a página
-            driver.get(page_url)
+            # Acessa a página (timeouts e falhas do driver são repetidos com backoff)
+            politica.call(lambda: driver.get(page_url), page_url, breaker_for(page_url))
+            metrics.PAGES_FETCHED.inc(kind='listing')
             time.sleep(2)  # Espera o carregamento inicial
             
-            # Espera os produtos carregarem
+            # Espera os produtos carregarem; sem produtos após a espera = fim da listagem
             try:
                 WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "a.produto"))
                 )
-            except:
+            except TimeoutException:
                 print_progress("Nenhum produto encontrado nesta página. Finalizando coleta...")
-                has_more_pages = False
                 break
             
+            transferidos, do_cache = measure_transfer(driver)
+            metrics.TRANSFER_BYTES.inc(transferidos, kind='listing')
+            metrics.CACHE_HITS.inc(do_cache)
+            
             # Coleta os links dos produtos
             product_links = driver.find_elements(By.CSS_SELECTOR, "a.produto")
             
             # Se não encontrou produtos, termina a coleta
             if not product_links:
                 print_progress("Nenhum produto encontrado nesta página. Finalizando coleta...")
-                has_more_pages = False
                 break
             
             # Extrai e formata as URLs
@@ -90,11 +97,13 @@ def collect_product_urls():
                 href = link.get_attribute('href')
                 try:
                     product_name = link.find_element(By.CSS_SELECTOR, "span.nome").text.strip()
-                except:
+                except NoSuchElementException:
                     product_name = "Nome não encontrado"
                 
                 if href and href.startswith(base_url):
                     page_urls.append(href)
+                    if not show_progress:
+                        continue
                     print_collection_status(
                         i, 
                         len(product_links),
@@ -103,26 +112,76 @@ def collect_product_urls():
                         f"Produto: {product_name}"
                     )
             
-            # Adiciona as URLs desta página à lista geral
-            all_product_urls.extend(page_urls)
+            metrics.URLS_DISCOVERED.inc(len(page_urls))
+            metrics.exporter.flush()
             print_progress(f"Coletados {len(page_urls)} produtos na página {current_page}")
+            yield page_urls
             
             # Avança para a próxima página
             current_page += 1
-        
-        # Remove URLs duplicadas
-        all_product_urls = list(set(all_product_urls))
-        
-        # Salva apenas a lista de URLs em um arquivo JSON
-        print_step("Salvando resultados")
-        print_progress(f"Salvando {len(all_product_urls)} URLs únicas no arquivo: {output_file}")
+    finally:
+        if show_progress:
+            progress.finish()
+        print_progress("Fechando navegador...")
+        driver.quit()
+        profiles.release(perfil)
+
+def seen_path(output_file: str = 'dados/product_urls.json') -> str:
+    """Conjunto de URLs já vistas, na mesma pasta da lista de URLs"""
+    return os.path.join(os.path.dirname(output_file) or '.', 'seen_urls.bin')
+
+def collect_product_urls(base_url: str = BASE_URL, output_file: str = 'dados/product_urls.json'):
+    """
+    Coleta as URLs dos produtos da Pura Vida
+
+    O arquivo JSON é regravado com a lista desta coleta (produtos retirados
+    da loja saem dela, os que voltam entram de novo). O conjunto persistente
+    de URLs vistas (config.seen_urls) só conta as URLs nunca vistas antes.
+
+    Args:
+        base_url: Endereço da loja (permite apontar para a loja simulada dos benchmarks)
+        output_file: Arquivo JSON onde a lista de URLs é gravada
+    """
+    start_time = time.time()
+    print_step("Iniciando coleta de URLs dos produtos Pura Vida")
+    
+    # Cria o diretório dados se não existir
+    print_step("Verificando diretório de dados")
+    print_progress("Criando diretório 'dados' se não existir...")
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    
+    # Inicializa o arquivo JSON vazio se não existir
+    if not os.path.exists(output_file):
+        print_progress("Criando arquivo JSON vazio...")
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_product_urls, f, ensure_ascii=False, indent=2)
+            json.dump([], f)
+    
+    pages = 0
+    urls = {}
+    novas = 0
+    # URLs vistas em qualquer coleta anterior (hashes via mmap)
+    seen = open_seen_urls(output_file)
+    
+    try:
+        for page_urls in iter_product_urls(base_url):
+            for url in page_urls:
+                if url not in urls:
+                    urls[url] = None
+                    # add() devolve False para URLs já vistas em coletas anteriores
+                    novas += seen.add(url)
+            pages += 1
+        
+        # Só uma busca completa (e não vazia) substitui a lista; os hashes vêm depois
+        if urls:
+            save_product_urls(list(urls), output_file)
+        seen.save()
+        metrics.NEW_URLS.inc(novas)
             
         print_step("Coleta finalizada com sucesso!")
-        print_progress(f"Total de páginas processadas: {current_page - 1}")
-        print_progress(f"Total de URLs únicas coletadas: {len(all_product_urls)}")
-        print_progress(f"Arquivo salvo em: {output_file}")
+        print_progress(f"Total de páginas processadas: {pages}")
+        print_progress(f"URLs encontradas na busca: {len(urls)}")
+        print_progress(f"URLs nunca vistas antes: {novas} ({len(seen)} conhecidas no total)")
+        print_progress(f"Arquivo atualizado: {output_file}")
         print_progress(f"Tempo total de execução: {time.time() - start_time:.1f} segundos")
         print('='*80)
         
@@ -132,8 +191,31 @@ def collect_product_urls():
         log_error(error_msg)
     
     finally:
-        print_progress("Fechando navegador...")
-        driver.quit()
+        seen.close()
+        flush_error_log()
+
+def open_seen_urls(output_file: str = 'dados/product_urls.json') -> SeenURLs:
+    """
+    Conjunto de URLs vistas da lista `output_file`. Na primeira vez (sem o
+    arquivo de hashes), é semeado com a lista já existente, para que as URLs
+    dela não sejam contadas como nunca vistas.
+    """
+    seen = SeenURLs(seen_path(output_file))
+    if len(seen) == 0 and os.path.exists(output_file):
+        with open(output_file, 'r', encoding='utf-8') as f:
+            seen.update(json.load(f))
+        seen.save()
+    return seen
+
+def save_product_urls(urls, output_file: str = 'dados/product_urls.json'):
+    """Grava a lista de URLs no arquivo JSON (de forma atômica)"""
+    print_step("Salvando resultados")
+    print_progress(f"Salvando {len(urls)} URLs únicas no arquivo: {output_file}")
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    temporario = output_file + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(urls, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, output_file)
 
 if __name__ == "__main__":
     collect_product_urls() 
\ No newline at end of file
@@ -1,15 +1,47 @@
 import sys
+import os
 import time
-from datetime import datetime
+import threading
+
+# Níveis de log: 'quiet' não imprime nada, 'error' só erros, 'info' etapas e
+# uma barra de progresso compartilhada, 'debug' o detalhamento por item
+LOG_LEVELS = {'quiet': 0, 'error': 1, 'info': 2, 'debug': 3}
+_log_level = LOG_LEVELS['info']
+_consoles = []
+
+def set_log_level(nivel):
+    """Define o nível de log global e silencia os consoles rich abaixo de 'debug'"""
+    global _log_level
+    if nivel not in LOG_LEVELS:
+        raise ValueError(f"Nível de log inválido: {nivel} (use {', '.join(LOG_LEVELS)})")
+    _log_level = LOG_LEVELS[nivel]
+    for console in _consoles:
+        console.quiet = _log_level < LOG_LEVELS['debug']
+
+def log_enabled(nivel):
+    """True se mensagens do nível informado devem ser exibidas"""
+    return _log_level >= LOG_LEVELS[nivel]
+
+def register_console(console):
+    """Registra um console rich para respeitar o nível de log (retorna o próprio console)"""
+    _consoles.append(console)
+    console.quiet = _log_level < LOG_LEVELS['debug']
+    return console
 
 def print_step(message):
     """Função auxiliar para imprimir mensagens de progresso formatadas"""
+    if not log_enabled('info'):
+        return
+    progress.clear_line()
     print(f"\n{'='*80}")
     print(f">>> {message}")
     print('='*80)
 
 def print_progress(message):
     """Função auxiliar para imprimir mensagens de progresso menores"""
+    if not log_enabled('info'):
+        return
+    progress.clear_line()
     print(f"  → {message}")
 
 def create_progress_bar(total, prefix='', suffix='', decimals=1, length=50, fill='█', print_end="\r"):
@@ -26,6 +58,83 @@ def create_progress_bar(total, prefix='', suffix='', decimals=1, length=50, fill
 
     return update
 
+class ProgressDisplay:
+    """
+    Barra de progresso única, compartilhada entre threads, redesenhada no
+    máximo `max_hz` vezes por segundo na mesma linha do terminal.
+    """
+
+    def __init__(self, max_hz=4.0, length=40, stream=None):
+        self.intervalo = 1.0 / max_hz
+        self.length = length
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+        self._ultimo_desenho = 0.0
+        self._linha_ativa = False
+        self.start(0)
+
+    def start(self, total, label=''):
+        """Reinicia a barra para uma nova etapa"""
+        with self._lock:
+            self.total = total
+            self.current = 0
+            self.label = label
+            self.detail = ''
+            self.falhas = 0
+            self.inicio = time.time()
+
+    def update(self, current=None, advance=0, total=None, label=None, detail=None, failed=False):
+        """Atualiza o estado (barato) e redesenha se o intervalo mínimo tiver passado"""
+        with self._lock:
+            if total is not None:
+                self.total = total
+            if label is not None:
+                self.label = label
+            if detail is not None:
+                self.detail = detail
+            if current is not None:
+                self.current = current
+            self.current += advance
+            self.falhas += 1 if failed else 0
+            agora = time.monotonic()
+            if agora - self._ultimo_desenho < self.intervalo and self.current < self.total:
+                return
+            self._ultimo_desenho = agora
+            self._desenhar()
+
+    def _desenhar(self):
+        if not log_enabled('info') or not self.total:
+            return
+        fracao = min(1.0, self.current / self.total)
+        preenchido = int(self.length * fracao)
+        barra = '█' * preenchido + '-' * (self.length - preenchido)
+        restante = estimate_time_remaining(self.current, self.total, time.time() - self.inicio)
+        falhas = f" | falhas: {self.falhas}" if self.falhas else ''
+        detalhe = f" | {self.detail[:40]}" if self.detail else ''
+        self.stream.write(f"\r\033[K{self.label} |{barra}| {self.current}/{self.total} "
+                          f"({fracao * 100:.1f}%) | restante: {restante}{falhas}{detalhe}")
+        self.stream.flush()
+        self._linha_ativa = True
+
+    def clear_line(self):
+        """Apaga a linha da barra para que outra mensagem possa ser impressa"""
+        if self._linha_ativa:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+            self._linha_ativa = False
+
+    def finish(self):
+        """Desenha o estado final e quebra a linha"""
+        with self._lock:
+            self._desenhar()
+            if self._linha_ativa:
+                self.stream.write("\n")
+                self.stream.flush()
+                self._linha_ativa = False
+
+# Barra compartilhada por todos os workers
+progress = ProgressDisplay()
+
 def format_time_remaining(seconds):
     """Formata o tempo restante em formato legível"""
     if seconds < 60:
@@ -41,36 +150,53 @@ def estimate_time_remaining(current, total, elapsed_time):
     """Estima o tempo restante baseado no progresso atual"""
     if current == 0:
         return "Calculando..."
-    
+
     rate = elapsed_time / current
     remaining_items = total - current
     remaining_time = remaining_items * rate
-    
+
     return format_time_remaining(remaining_time)
 
 def print_collection_status(current, total, item_name, start_time, url=""):
-    """Imprime status detalhado da coleta"""
-    elapsed = time.time() - start_time
-    remaining = estimate_time_remaining(current, total, elapsed)
-    percent = (current / total) * 100
-    
-    print_progress(f"Progresso: {current}/{total} {item_name} ({percent:.1f}%)")
-    print_progress(f"Tempo decorrido: {format_time_remaining(elapsed)}")
-    print_progress(f"Tempo estimado restante: {remaining}")
-    if url:
-        print_progress(f"URL atual: {url}")
-    
-    # Cria e atualiza a barra de progresso
-    progress_bar = create_progress_bar(
-        total,
-        prefix=f'Processando {item_name}:',
-        suffix='Completo',
-        length=50
-    )
-    progress_bar(current)
+    """Atualiza a barra de progresso compartilhada (detalhes por item só em 'debug')"""
+    if log_enabled('debug'):
+        elapsed = time.time() - start_time
+        remaining = estimate_time_remaining(current, total, elapsed)
+        percent = (current / total) * 100
+        print_progress(f"Progresso: {current}/{total} {item_name} ({percent:.1f}%)")
+        print_progress(f"Tempo decorrido: {format_time_remaining(elapsed)}")
+        print_progress(f"Tempo estimado restante: {remaining}")
+        if url:
+            print_progress(f"URL atual: {url}")
+    progress.update(current=current, total=total, label=f"Processando {item_name}", detail=url)
+
+_error_handler = None
+_error_lock = threading.Lock()
+
+def _get_error_logger(log_file='dados/error_log.txt'):
+    """Cria (uma vez) o logger de erros com buffer em memória e gravação em lote"""
+    global _error_handler
+    import logging
+    import logging.handlers
+    logger = logging.getLogger('scraping_pura_vida.errors')
+    with _error_lock:
+        if _error_handler is None:
+            os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+            arquivo = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+            arquivo.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt="%Y-%m-%d %H:%M:%S"))
+            # Acumula até 50 registros antes de escrever; logging.shutdown() grava o restante na saída
+            _error_handler = logging.handlers.MemoryHandler(
+                capacity=50, flushLevel=logging.CRITICAL, target=arquivo, flushOnClose=True)
+            logger.addHandler(_error_handler)
+            logger.setLevel(logging.ERROR)
+            logger.propagate = False
+    return logger
 
 def log_error(error_msg):
     """Registra erros em um arquivo de log"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open('dados/error_log.txt', 'a', encoding='utf-8') as f:
-        f.write(f"[{timestamp}] {error_msg}\n") 
\ No newline at end of file
+    _get_error_logger().error(error_msg)
+
+def flush_error_log():
+    """Grava imediatamente os erros acumulados no buffer"""
+    if _error_handler is not None:
+        _error_handler.flush()
@@ -0,0 +1,101 @@
+"""
+Verificações de plausibilidade dos dados extraídos e fila de recoleta.
+
+As regras rodam vetorizadas (pandas/NumPy) sobre o CSV inteiro:
+
+    - energia:   calorias declaradas x 4/4/9 kcal por grama de carboidrato,
+                 proteína e gordura (com tolerância para arredondamento,
+                 fibras e polióis)
+    - saturadas: gorduras saturadas acima das gorduras totais
+    - acucares:  açúcares acima dos carboidratos
+    - zerada:    todos os nutrientes iguais a zero
+
+As URLs das linhas suspeitas (sem o ?sabor=) formam a fila de recoleta, em
+vez de uma nova coleta completa. Cada URL guarda quantas vezes já foi
+recoletada; as que continuam suspeitas depois de `max_attempts` recoletas
+(ex.: produtos sem tabela nutricional) seguem registradas, mas fora da fila.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .nutrients import COLUMN, NUTRIENT_COLUMNS
+
+KCAL_POR_GRAMA = {'carboidratos': 4.0, 'proteinas': 4.0, 'gorduras_totais': 9.0}
+# Diferença tolerada entre as calorias declaradas e as calculadas
+TOLERANCIA_KCAL = 10.0
+TOLERANCIA_RELATIVA = 0.3
+CHECKS = ('energia', 'saturadas', 'acucares', 'zerada')
+
+def _numerico(df: pd.DataFrame, coluna: str) -> np.ndarray:
+    if coluna not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[coluna], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+
+def check_plausibility(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uma coluna booleana por verificação (CHECKS), mais 'kcal_calculada' e
+    'suspeita' (alguma verificação falhou), alinhadas ao índice de `df`
+    """
+    kcal = _numerico(df, COLUMN['valor_energetico'])
+    calculada = sum(fator * _numerico(df, COLUMN[nutriente]) for nutriente, fator in KCAL_POR_GRAMA.items())
+    limite = np.maximum(TOLERANCIA_KCAL, TOLERANCIA_RELATIVA * np.maximum(kcal, calculada))
+    colunas = [c for c in NUTRIENT_COLUMNS if c in df.columns]
+    valores = df[colunas].apply(pd.to_numeric, errors='coerce').fillna(0.0).to_numpy(dtype=float)
+
+    resultado = pd.DataFrame({
+        'energia': np.abs(kcal - calculada) > limite,
+        'saturadas': _numerico(df, COLUMN['gorduras_saturadas']) > _numerico(df, COLUMN['gorduras_totais']),
+        'acucares': _numerico(df, COLUMN['acucares']) > _numerico(df, COLUMN['carboidratos']),
+        'zerada': (valores == 0).all(axis=1) if colunas else np.ones(len(df), dtype=bool),
+    }, index=df.index)
+    # Linha zerada já é suspeita por si; a verificação de energia não acrescenta nada
+    resultado['energia'] &= ~resultado['zerada']
+    resultado['kcal_calculada'] = np.round(calculada, 1)
+    resultado['suspeita'] = resultado[list(CHECKS)].any(axis=1)
+    return resultado
+
+def page_url(url: str) -> str:
+    """URL da página do produto (sem o ?sabor= das linhas de cada sabor)"""
+    return str(url).split('?', 1)[0]
+
+def load_queue(path: str) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_queue(fila: List[dict], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporario = path + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(fila, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, path)
+
+def build_rescrape_queue(df: pd.DataFrame, anterior: Optional[List[dict]] = None,
+                         max_attempts: int = 2) -> Tuple[List[dict], List[dict]]:
+    """
+    Agrupa as linhas suspeitas por página
+
+    Returns:
+        (fila de recoleta, páginas que seguem suspeitas após max_attempts recoletas)
+    """
+    verificacoes = check_plausibility(df)
+    suspeitas = verificacoes[verificacoes['suspeita']]
+    tentativas = {item['url']: item.get('attempts', 0) for item in anterior or []}
+    paginas: Dict[str, dict] = {}
+    for indice, linha in suspeitas.iterrows():
+        url = page_url(df.at[indice, 'URL'])
+        item = paginas.setdefault(url, {'url': url, 'reasons': [], 'products': [],
+                                        'attempts': tentativas.get(url, 0)})
+        item['products'].append(df.at[indice, 'NOME_PRODUTO'])
+        for check in CHECKS:
+            if linha[check] and check not in item['reasons']:
+                item['reasons'].append(check)
+    fila = [item for item in paginas.values() if item['attempts'] < max_attempts]
+    persistentes = [item for item in paginas.values() if item['attempts'] >= max_attempts]
+    return fila, persistentes
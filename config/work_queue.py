@@ -0,0 +1,200 @@
+"""
+Fila de trabalho compartilhada (SQLite) para coletas em vários processos/máquinas.
+
+Cada URL de product_urls.json vira uma tarefa. Um worker pega um lote com
+`lease()`, que marca as tarefas como suas até `lease_expires`; enquanto
+trabalha, uma thread de heartbeat renova o prazo. Se o worker morrer, o prazo
+expira e a próxima chamada de `lease()` (de qualquer worker) devolve as
+tarefas para a fila.
+
+O resultado é gravado na mesma transação que conclui a tarefa, e só se o
+worker ainda for o dono da concessão: um worker que perdeu a concessão (por
+exemplo, ficou travado) não sobrescreve o resultado de quem a recebeu depois.
+O CSV final é gerado a partir da tabela de resultados com `export_csv()`.
+
+Para várias máquinas, o arquivo precisa estar em um sistema de arquivos com
+locks confiáveis (disco local com os workers no mesmo host, ou NFS com locks).
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_expires);
+CREATE TABLE IF NOT EXISTS results (
+    url TEXT PRIMARY KEY,
+    worker TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    finished REAL NOT NULL
+);
+"""
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueue:
+    """Fila de URLs com concessões (leases), heartbeats e expiração"""
+
+    def __init__(self, path: str = 'dados/work_queue.db', lease_seconds: float = 300.0,
+                 max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._local = threading.local()
+        self._conexao().executescript(_ESQUEMA)
+
+    def _conexao(self) -> sqlite3.Connection:
+        # Uma conexão por thread (a thread de heartbeat usa a sua)
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexao = conexao
+        return conexao
+
+    def _transacao(self, funcao):
+        """Executa `funcao(conexao)` em uma transação com lock de escrita"""
+        conexao = self._conexao()
+        conexao.execute('BEGIN IMMEDIATE')
+        try:
+            resultado = funcao(conexao)
+        except BaseException:
+            conexao.execute('ROLLBACK')
+            raise
+        conexao.execute('COMMIT')
+        return resultado
+
+    def load(self, urls: Iterable[str]) -> int:
+        """Adiciona URLs novas como pendentes (as existentes não mudam); retorna quantas entraram"""
+        agora = time.time()
+        linhas = [(url, agora) for url in dict.fromkeys(urls)]
+        return self._transacao(lambda c: c.executemany(
+            'INSERT OR IGNORE INTO tasks (url, updated) VALUES (?, ?)', linhas).rowcount)
+
+    def reclaim_expired(self, conexao: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Devolve para a fila as tarefas cuja concessão expirou. As que já
+        esgotaram max_attempts (ex.: URL que derruba o navegador do worker)
+        ficam como 'failed' em vez de voltar à fila indefinidamente.
+        """
+        sql = ("UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+               "worker = NULL, lease_expires = NULL, "
+               "error = CASE WHEN attempts >= ? THEN 'concessão expirada' ELSE error END, updated = ? "
+               "WHERE status = 'leased' AND lease_expires < ?")
+        agora = time.time()
+        parametros = (self.max_attempts, self.max_attempts, agora, agora)
+        if conexao is not None:
+            return conexao.execute(sql, parametros).rowcount
+        return self._transacao(lambda c: c.execute(sql, parametros).rowcount)
+
+    def lease(self, worker: str, n: int = 1) -> List[str]:
+        """Concede até `n` URLs pendentes ao worker"""
+        def conceder(conexao):
+            self.reclaim_expired(conexao)
+            urls = [linha[0] for linha in conexao.execute(
+                "SELECT url FROM tasks WHERE status = 'pending' ORDER BY attempts, rowid LIMIT ?", (n,))]
+            agora = time.time()
+            conexao.executemany(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE url = ?",
+                [(worker, agora + self.lease_seconds, agora, url) for url in urls])
+            return urls
+        return self._transacao(conceder)
+
+    def heartbeat(self, worker: str) -> int:
+        """Renova as concessões ativas do worker; retorna quantas ainda são dele"""
+        agora = time.time()
+        return self._transacao(lambda c: c.execute(
+            "UPDATE tasks SET lease_expires = ? WHERE status = 'leased' AND worker = ?",
+            (agora + self.lease_seconds, worker)).rowcount)
+
+    def complete(self, url: str, worker: str, df) -> bool:
+        """Conclui a tarefa e grava o resultado; False se o worker perdeu a concessão"""
+        linhas = df.to_json(orient='records', force_ascii=False)
+
+        def concluir(conexao):
+            agora = time.time()
+            atualizadas = conexao.execute(
+                "UPDATE tasks SET status = 'done', lease_expires = NULL, error = NULL, updated = ? "
+                "WHERE url = ? AND worker = ? AND status = 'leased'", (agora, url, worker)).rowcount
+            if atualizadas:
+                conexao.execute('INSERT OR REPLACE INTO results (url, worker, rows, finished) VALUES (?, ?, ?, ?)',
+                                (url, worker, linhas, agora))
+            return bool(atualizadas)
+        return self._transacao(concluir)
+
+    def fail(self, url: str, worker: str, error: str = '') -> bool:
+        """Registra a falha: volta para a fila ou, após max_attempts, fica como 'failed'"""
+        return self._transacao(lambda c: bool(c.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "worker = NULL, lease_expires = NULL, error = ?, updated = ? "
+            "WHERE url = ? AND worker = ? AND status = 'leased'",
+            (self.max_attempts, error, time.time(), url, worker)).rowcount))
+
+    def release(self, worker: str) -> int:
+        """Devolve imediatamente as concessões do worker (encerramento limpo)"""
+        return self._transacao(lambda c: c.execute(
+            "UPDATE tasks SET status = 'pending', worker = NULL, lease_expires = NULL, "
+            "attempts = MAX(0, attempts - 1), updated = ? WHERE status = 'leased' AND worker = ?",
+            (time.time(), worker)).rowcount)
+
+    def stats(self) -> Dict[str, int]:
+        contagem = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for status, total in self._conexao().execute('SELECT status, COUNT(*) FROM tasks GROUP BY status'):
+            contagem[status] = total
+        return contagem
+
+    def export_csv(self, csv_file: str = 'dados/produtos.csv') -> int:
+        """Gera o CSV final a partir dos resultados; retorna o número de linhas"""
+        import pandas as pd
+        registros = []
+        for (linhas,) in self._conexao().execute('SELECT rows FROM results ORDER BY url'):
+            registros.extend(json.loads(linhas))
+        df = pd.DataFrame(registros)
+        if not df.empty and 'NOME_PRODUTO' in df.columns:
+            df = df.drop_duplicates(subset=['NOME_PRODUTO'], keep='last')
+        os.makedirs(os.path.dirname(csv_file) or '.', exist_ok=True)
+        temporario = csv_file + '.tmp'
+        df.to_csv(temporario, index=False)
+        os.replace(temporario, csv_file)
+        return len(df)
+
+class Heartbeat:
+    """Thread que renova as concessões do worker a cada terço do prazo"""
+
+    def __init__(self, queue: WorkQueue, worker: str):
+        self.queue = queue
+        self.worker = worker
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while not self._parar.wait(self.queue.lease_seconds / 3):
+            try:
+                self.queue.heartbeat(self.worker)
+            except sqlite3.Error:
+                continue  # banco ocupado: tenta no próximo ciclo, ainda dentro do prazo
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
@@ -10,10 +10,17 @@ import sys
 import time
 import glob
 import json
+import argparse
 from datetime import datetime
-import pandas as pd
-from config.scraper import extract_nutritional_info
-from config.url_collector import collect_product_urls
+from config.timing import timer
+from config import metrics
+from config.profiling import profiler
+from config.memory import memory
+from config.archive import archive
+from config.utils import LOG_LEVELS, set_log_level, log_enabled, log_error, flush_error_log, progress
+
+# pandas, selenium, bs4 e rich são importados sob demanda dentro das funções
+# que os usam, para que o menu e as opções leves abram instantaneamente.
 
 # ================= CORES ANSI =================
 class Cores:
@@ -27,7 +34,42 @@ class Cores:
     MAGENTA = '\033[95m'
     BRANCO = '\033[97m'
 
+# Concorrência do scraping: 1 = sequencial, N = até N URLs em paralelo, 'auto' = AIMD até MAX_CONCORRENCIA
+CONCORRENCIA = '1'
+MAX_CONCORRENCIA = 8
+# Tentativas por URL para falhas transitórias (timeout, driver, rede, 429/5xx)
+TENTATIVAS = 3
+ARQUIVO_FALHAS = 'dados/failed_urls.json'
+# Workers de cada estágio da coleta completa (descoberta → download → parsing → gravação)
+FETCH_WORKERS = 2
+PARSE_WORKERS = 1
+# Download pelo navegador ('selenium') ou HTTP simples ('http'); parsing em threads ou processos
+FETCH_ENGINE = 'selenium'
+PARSE_ENGINE = 'thread'
+# CSV de saída (com --shard cada execução grava o seu)
+ARQUIVO_CSV = 'dados/produtos.csv'
+# Kits ("kit-2-un-...") derivados do produto base já confirmado, sem baixar a página
+CANONICALIZAR_KITS = True
+ARQUIVO_CANONICOS = 'dados/canonical_index.json'
+# Páginas com linhas implausíveis (energia x macros, zeradas...) para --rescrape
+ARQUIVO_RECOLETA = 'dados/rescrape_urls.json'
+MAX_RECOLETAS = 2
+# Segundos entre gravações do estado da recoleta adaptativa (e uma ao final da rodada)
+INTERVALO_ESTADO_RECOLETA = 30
+# Relatório do que mudou entre a coleta anterior e a atual
+ARQUIVO_DIFF = 'dados/diff_report.csv'
+
 # =============== UTILITÁRIAS ================
+def novo_controlador():
+    """Cria o controle de concorrência configurado (None para o modo sequencial)"""
+    if CONCORRENCIA == '1':
+        return None
+    from config.concurrency import AIMDController
+    if CONCORRENCIA == 'auto':
+        return AIMDController(initial=2, maximum=MAX_CONCORRENCIA)
+    limite = int(CONCORRENCIA)
+    return AIMDController(initial=limite, maximum=limite)
+
 def limpar_terminal():
     os.system('clear' if os.name == 'posix' else 'cls')
 
@@ -88,7 +130,9 @@ def obter_escolha() -> str:
         sys.exit(0)
 
 # ========== FUNÇÕES DO PROJETO =============
-def save_incremental(df_novo, csv_file='dados/produtos.csv'):
+def save_incremental(df_novo, csv_file=None):
+    import pandas as pd
+    csv_file = csv_file or ARQUIVO_CSV
     if os.path.exists(csv_file):
         df_existente = pd.read_csv(csv_file)
         df_total = pd.concat([df_existente, df_novo], ignore_index=True)
@@ -96,6 +140,8 @@ def save_incremental(df_novo, csv_file='dados/produtos.csv'):
     else:
         df_total = df_novo
     df_total.to_csv(csv_file, index=False)
+    metrics.ROWS_SAVED.inc(len(df_novo))
+    metrics.CSV_ROWS.set(len(df_total))
     return len(df_novo), len(df_total)
 
 def executar_scraping_incremental():
@@ -113,27 +159,532 @@ def executar_scraping_incremental():
         print(f"{Cores.AMARELO}⏭️  Operação cancelada{Cores.RESET}")
         return
     mostrar_barra_progresso("Preparando scraping", 1.0)
+    anterior = guardar_snapshot()
+    timer.reset()
+    with profiler.run():
+        processar_urls(urls, controller=novo_controlador())
+    if memory.enabled:
+        memory.snapshot()
+    metrics.QUEUE_DEPTH.set(0)
+    validar_saida()
+    relatorio_mudancas(anterior, urls=urls)
+    metrics.exporter.flush(force=True)
+    print(f"\n{Cores.VERDE}🏁 Coleta finalizada!{Cores.RESET}")
+    if timer.enabled:
+        timer.print_summary()
+
+def processar_urls(urls, ao_processar=None, prazo=None, controller=None):
+    """
+    Extrai e salva incrementalmente os dados de cada URL, com feedback visual
+
+    Falhas transitórias (timeout, driver, rede, 429/5xx) são repetidas com
+    backoff; as que persistirem voltam para o fim da fila uma vez. As URLs que
+    ainda assim falharem ficam em dados/failed_urls.json (--retry-failed).
+
+    Args:
+        ao_processar: função chamada com (url, df) após cada URL
+        prazo: instante (time.time()) a partir do qual nenhuma nova URL é iniciada
+        controller: AIMDController para extrair várias URLs em paralelo (None = sequencial)
+    """
+    from config.scraper import extract_nutritional_info
+    from config.retry import RetryPolicy, ScrapeError, breaker_for
+    kits, derivados, so_base = None, {}, set()
+    pedidas = list(urls)
+    if CANONICALIZAR_KITS:
+        from config.canonical import CanonicalIndex
+        kits = CanonicalIndex(ARQUIVO_CANONICOS)
+        urls, derivados, so_base = kits.plan(urls)
+        n_derivados = sum(len(lista) for lista in derivados.values())
+        if n_derivados and log_enabled('info'):
+            print(f"{Cores.AZUL}🧩 {n_derivados} kits derivados do produto base: "
+                  f"{len(urls)} páginas a baixar de {len(pedidas)} URLs{Cores.RESET}")
+    total_urls = len(urls)
     inicio = time.time()
-    for i, url in enumerate(urls, 1):
-        print(f"{Cores.AMARELO}({i}/{total_urls}) {Cores.BRANCO}Processando:{Cores.RESET} {url}")
-        df = extract_nutritional_info(url)
-        nome_produto = df['NOME_PRODUTO'].iloc[0] if df is not None and not df.empty and 'NOME_PRODUTO' in df.columns else 'Desconhecido'
-        if df is not None:
-            novos, total = save_incremental(df)
-            print(f"{Cores.VERDE}✔ {novos} linhas adicionadas. Total no CSV: {total}{Cores.RESET}")
+    detalhado = log_enabled('debug')
+    politica = RetryPolicy(TENTATIVAS)
+    aviso = controller.record_error if controller is not None else None
+    progress.start(total_urls, 'Produtos')
+
+    def dentro_do_prazo(fila):
+        for n, url in enumerate(fila, 1):
+            if prazo is not None and time.time() >= prazo:
+                log_error(f"Orçamento de tempo esgotado após {n - 1}/{len(fila)} URLs")
+                return
+            yield url
+
+    def extrair(url):
+        with timer.url(url):
+            with profiler.url(url):
+                df = politica.call(lambda: extract_nutritional_info(url, raise_errors=True),
+                                   url, breaker_for(url), aviso)
+            if df is None:
+                timer.mark_failed('sem dados')
+        return df
+
+    def sequencial(fila):
+        for n, url in enumerate(dentro_do_prazo(fila), 1):
+            if detalhado:
+                print(f"{Cores.AMARELO}({n}/{len(fila)}) {Cores.BRANCO}Processando:{Cores.RESET} {url}")
+            # A gravação do CSV acontece com o gerador suspenso, ainda dentro do evento da URL
+            with timer.url(url):
+                try:
+                    with profiler.url(url):
+                        df = politica.call(lambda: extract_nutritional_info(url, raise_errors=True),
+                                           url, breaker_for(url))
+                    erro = None
+                except ScrapeError as e:
+                    df, erro = None, e
+                if df is None and erro is None:
+                    timer.mark_failed('sem dados')
+                yield url, df, erro
+            time.sleep(0.1)
+
+    i = 0
+    fila, reenfileiradas, falhas = list(urls), [], {}
+    for rodada in (1, 2):
+        if rodada == 2:
+            if not reenfileiradas:
+                break
+            log_error(f"Reprocessando {len(reenfileiradas)} URLs com falhas transitórias")
+            if detalhado:
+                print(f"{Cores.AMARELO}🔁 Reprocessando {len(reenfileiradas)} URLs com falhas transitórias{Cores.RESET}")
+            fila, reenfileiradas = reenfileiradas, []
+            progress.update(total=progress.total + len(fila))
+        if controller is None:
+            resultados = sequencial(fila)
         else:
-            print(f"{Cores.VERMELHO}⚠ Nenhum dado extraído para: {url}{Cores.RESET}")
-        # Feedback visual
-        perc = (i / total_urls) * 100
-        tempo_decorrido = time.time() - inicio
-        tempo_restante = (tempo_decorrido / i) * (total_urls - i) if i > 0 else 0
-        barra = '█' * int(perc // 2) + '░' * (50 - int(perc // 2))
-        print(f"{Cores.CIANO}[{barra}] {perc:.1f}%{Cores.RESET}")
-        print(f"{Cores.AZUL}Produto: {Cores.BRANCO}{nome_produto}{Cores.RESET}")
-        print(f"{Cores.AMARELO}Restantes: {total_urls - i}{Cores.RESET} | {Cores.VERDE}Tempo decorrido: {tempo_decorrido:.1f}s{Cores.RESET} | {Cores.CIANO}Est. restante: {tempo_restante:.1f}s{Cores.RESET}")
-        print(f"{Cores.AZUL}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Cores.RESET}")
-        time.sleep(0.1)
-    print(f"\n{Cores.VERDE}🏁 Coleta finalizada!{Cores.RESET}")
+            from config.concurrency import run_adaptive
+            resultados = run_adaptive(extrair, dentro_do_prazo(fila), controller)
+
+        for url, df, erro in resultados:
+            i += 1
+            metrics.QUEUE_DEPTH.set(max(0, total_urls - i))
+            if erro is not None and erro.transient and rodada == 1:
+                # Volta para o fim da fila em vez de exigir uma nova coleta completa
+                reenfileiradas.append(url)
+                progress.update(advance=1, detail=url)
+                continue
+            nome_produto = df['NOME_PRODUTO'].iloc[0] if df is not None and not df.empty and 'NOME_PRODUTO' in df.columns else 'Desconhecido'
+            if df is not None:
+                falhas.pop(url, None)
+                linhas = [] if url in so_base else [df]
+                if kits is not None:
+                    # Canônica com impressão digital nova: os kits voltam a ser baixados
+                    refazer = kits.record(url, df)
+                    for kit in derivados.pop(url, []):
+                        df_kit = kits.derive(kit, df)
+                        if df_kit is None:
+                            refazer.append(kit)
+                            continue
+                        linhas.append(df_kit)
+                        metrics.KITS_DERIVED.inc()
+                        if ao_processar is not None:
+                            ao_processar(kit, df_kit)
+                    refazer = [kit for kit in dict.fromkeys(refazer) if kit not in reenfileiradas]
+                    if refazer and rodada == 1:
+                        reenfileiradas.extend(refazer)
+                    elif refazer:
+                        for kit in refazer:
+                            falhas[kit] = {'url': kit, 'category': 'kit_pendente', 'error': ''}
+                if linhas:
+                    import pandas as pd
+                    with timer.stage('save_csv'):
+                        novos, total = save_incremental(pd.concat(linhas, ignore_index=True))
+                    if detalhado:
+                        print(f"{Cores.VERDE}✔ {novos} linhas adicionadas. Total no CSV: {total}{Cores.RESET}")
+            else:
+                categoria = erro.category if erro is not None else 'sem_dados'
+                if url not in so_base:
+                    falhas[url] = {'url': url, 'category': categoria, 'error': str(erro or '')}
+                # Sem a canônica os kits derivados dela também ficam para --retry-failed
+                for kit in derivados.pop(url, []):
+                    falhas[kit] = {'url': kit, 'category': categoria, 'error': f"produto base {url}: {erro or ''}"}
+                motivo = f" ({categoria}: {erro})" if erro else ''
+                log_error(f"Nenhum dado extraído para: {url}{motivo}")
+                if log_enabled('error'):
+                    progress.clear_line()
+                    print(f"{Cores.VERMELHO}⚠ Nenhum dado extraído para: {url}{motivo}{Cores.RESET}")
+            if ao_processar is not None and url not in so_base:
+                ao_processar(url, df)
+            if detalhado:
+                # Feedback visual completo por URL
+                perc = min(100.0, (i / total_urls) * 100)
+                tempo_decorrido = time.time() - inicio
+                tempo_restante = (tempo_decorrido / i) * max(0, total_urls - i) if i > 0 else 0
+                barra = '█' * int(perc // 2) + '░' * (50 - int(perc // 2))
+                print(f"{Cores.CIANO}[{barra}] {perc:.1f}%{Cores.RESET}")
+                print(f"{Cores.AZUL}Produto: {Cores.BRANCO}{nome_produto}{Cores.RESET}")
+                print(f"{Cores.AMARELO}Restantes: {max(0, total_urls - i)}{Cores.RESET} | {Cores.VERDE}Tempo decorrido: {tempo_decorrido:.1f}s{Cores.RESET} | {Cores.CIANO}Est. restante: {tempo_restante:.1f}s{Cores.RESET}")
+                if controller is not None:
+                    print(f"{Cores.AZUL}Concorrência: {Cores.BRANCO}{int(controller.limit)}{Cores.RESET}")
+                print(f"{Cores.AZUL}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Cores.RESET}")
+            else:
+                progress.update(advance=1, detail=nome_produto, failed=df is None)
+            metrics.exporter.flush()
+            memory.tick(url)
+    progress.finish()
+    if kits is not None:
+        kits.save()
+    salvar_falhas(list(falhas.values()), pedidas)
+    flush_error_log()
+
+def salvar_falhas(falhas, processadas=(), arquivo=None):
+    """
+    Grava as URLs que falharam para reprocessamento com --retry-failed
+
+    O arquivo é mesclado, não substituído: as URLs em `processadas` (a fila
+    desta execução) saem dele e dão lugar às `falhas` atuais; as falhas de
+    coletas anteriores fora dessa fila são mantidas (ex.: --recrawl ou
+    --rescrape não apagam o que a última coleta completa registrou).
+    """
+    arquivo = arquivo or ARQUIVO_FALHAS
+    os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+    anteriores = []
+    if os.path.exists(arquivo):
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            anteriores = json.load(f)
+    fora_da_fila = set(processadas) | {falha['url'] for falha in falhas}
+    falhas = [falha for falha in anteriores if falha['url'] not in fora_da_fila] + list(falhas)
+    temporario = arquivo + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(falhas, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, arquivo)
+    if falhas and log_enabled('error'):
+        print(f"{Cores.AMARELO}⚠ {len(falhas)} URLs com falha salvas em {arquivo} "
+              f"(reprocesse com --retry-failed){Cores.RESET}")
+
+def executar_reprocessamento_falhas():
+    """Processa só as URLs que falharam na última coleta"""
+    if not os.path.exists(ARQUIVO_FALHAS):
+        print(f"{Cores.AMARELO}📄 Nenhuma falha registrada em {ARQUIVO_FALHAS}{Cores.RESET}")
+        return
+    with open(ARQUIVO_FALHAS, 'r', encoding='utf-8') as f:
+        urls = [falha['url'] for falha in json.load(f)]
+    if log_enabled('info'):
+        print(f"\n{Cores.CIANO}{Cores.BOLD}🔁 REPROCESSANDO {len(urls)} URLs COM FALHA{Cores.RESET}")
+    timer.reset()
+    with profiler.run():
+        processar_urls(urls, controller=novo_controlador())
+    metrics.QUEUE_DEPTH.set(0)
+    metrics.exporter.flush(force=True)
+    if timer.enabled:
+        timer.print_summary()
+
+def validar_saida(csv_file=None):
+    """Confere a plausibilidade do CSV e grava a fila de recoleta com as páginas suspeitas"""
+    import pandas as pd
+    from config.validation import CHECKS, build_rescrape_queue, check_plausibility, load_queue, save_queue
+    csv_file = csv_file or ARQUIVO_CSV
+    if not os.path.exists(csv_file):
+        print(f"{Cores.AMARELO}📄 CSV não encontrado: {csv_file}{Cores.RESET}")
+        return []
+    df = pd.read_csv(csv_file)
+    with timer.stage('validacao'):
+        verificacoes = check_plausibility(df)
+        fila, persistentes = build_rescrape_queue(df, load_queue(ARQUIVO_RECOLETA), MAX_RECOLETAS)
+    # As persistentes ficam no arquivo para não voltarem à fila com zero recoletas
+    save_queue(fila + persistentes, ARQUIVO_RECOLETA)
+    for check in CHECKS:
+        metrics.SUSPICIOUS_ROWS.set(int(verificacoes[check].sum()), check=check)
+    if log_enabled('info'):
+        print(f"\n{Cores.CIANO}{Cores.BOLD}🔎 VALIDAÇÃO: {int(verificacoes['suspeita'].sum())} de {len(df)} "
+              f"linhas suspeitas{Cores.RESET}")
+        for check in CHECKS:
+            print(f"   • {check:<10} {int(verificacoes[check].sum()):>5}")
+        print(f"{Cores.VERDE}📋 {len(fila)} páginas na fila de recoleta → {ARQUIVO_RECOLETA} "
+              f"(processe com --rescrape){Cores.RESET}")
+        if persistentes:
+            print(f"{Cores.AMARELO}⚠ {len(persistentes)} páginas seguem suspeitas após {MAX_RECOLETAS} "
+                  f"recoletas e ficaram fora da fila{Cores.RESET}")
+    return fila
+
+def executar_recoleta_suspeitas():
+    """Recoleta só as páginas da fila gerada pela validação"""
+    from config.validation import load_queue, save_queue
+    registradas = load_queue(ARQUIVO_RECOLETA)
+    fila = [item for item in registradas if item.get('attempts', 0) < MAX_RECOLETAS]
+    if not fila:
+        print(f"{Cores.AMARELO}📄 Nenhuma página na fila de recoleta ({ARQUIVO_RECOLETA}){Cores.RESET}")
+        return
+    if log_enabled('info'):
+        print(f"\n{Cores.CIANO}{Cores.BOLD}🔁 RECOLETANDO {len(fila)} PÁGINAS SUSPEITAS{Cores.RESET}")
+    for item in fila:
+        item['attempts'] = item.get('attempts', 0) + 1
+    save_queue(registradas, ARQUIVO_RECOLETA)
+    timer.reset()
+    with profiler.run():
+        processar_urls([item['url'] for item in fila], controller=novo_controlador())
+    metrics.QUEUE_DEPTH.set(0)
+    validar_saida()
+    metrics.exporter.flush(force=True)
+    if timer.enabled:
+        timer.print_summary()
+
+def caminho_snapshot(csv_file=None):
+    """Cópia do CSV feita antes da coleta (ex.: dados/produtos.anterior.csv)"""
+    base, extensao = os.path.splitext(csv_file or ARQUIVO_CSV)
+    return f"{base}.anterior{extensao}"
+
+def guardar_snapshot():
+    """Copia o CSV atual antes da coleta, para o relatório de mudanças no final"""
+    import shutil
+    if not os.path.exists(ARQUIVO_CSV):
+        return None
+    destino = caminho_snapshot()
+    shutil.copyfile(ARQUIVO_CSV, destino)
+    return destino
+
+def paginas_ativas(coletadas):
+    """URLs da coleta, sem as que a loja respondeu 404/410 (ficam em ARQUIVO_FALHAS)"""
+    sumidas = set()
+    if os.path.exists(ARQUIVO_FALHAS):
+        with open(ARQUIVO_FALHAS, 'r', encoding='utf-8') as f:
+            sumidas = {falha['url'] for falha in json.load(f) if falha.get('category') == 'nao_encontrado'}
+    return [url for url in coletadas if url not in sumidas]
+
+def relatorio_mudancas(antigo, novo=None, urls=None):
+    """
+    Compara duas versões do CSV e grava o relatório em ARQUIVO_DIFF
+
+    Args:
+        urls: páginas de uma coleta completa; produtos de `antigo` fora delas
+              contam como removidos (o CSV novo ainda os traz, pois
+              save_incremental nunca apaga linhas)
+    """
+    from config.diff import diff_files
+    novo = novo or ARQUIVO_CSV
+    for arquivo in (antigo, novo):
+        if not arquivo or not os.path.exists(arquivo):
+            if log_enabled('info'):
+                print(f"{Cores.AMARELO}📄 Sem versão anterior para comparar ({arquivo}){Cores.RESET}")
+            return
+    with timer.stage('diff'):
+        relatorio, resumo = diff_files(antigo, novo, ARQUIVO_DIFF,
+                                       None if urls is None else paginas_ativas(urls))
+    if not log_enabled('info'):
+        return
+    print(f"\n{Cores.CIANO}{Cores.BOLD}📊 MUDANÇAS: {antigo} → {novo}{Cores.RESET}")
+    print(f"   • {Cores.VERDE}{resumo['added']} incluídos{Cores.RESET}, {Cores.VERMELHO}{resumo['removed']} removidos"
+          f"{Cores.RESET}, {Cores.AMARELO}{resumo['changed']} alterados{Cores.RESET} "
+          f"({resumo['values_changed']} valores)")
+    alterados = relatorio[relatorio['STATUS'] == 'changed']
+    maiores = alterados.reindex(alterados['DELTA'].abs().sort_values(ascending=False).index).head(10)
+    for _, linha in maiores.iterrows():
+        pct = '' if linha['DELTA_PCT'] != linha['DELTA_PCT'] else f" ({linha['DELTA_PCT']:+.1f}%)"
+        print(f"   {linha['COLUNA']:<24} {linha['ANTES']:>8g} → {linha['DEPOIS']:<8g}{pct}  {linha['NOME_PRODUTO']}")
+    print(f"{Cores.VERDE}📋 Relatório completo em {ARQUIVO_DIFF}{Cores.RESET}")
+
+def executar_consulta(args):
+    """Top-k ou faixa de um nutriente sobre o índice colunar do CSV"""
+    from config.query import NutrientIndex, PORCAO
+    if not os.path.exists(ARQUIVO_CSV):
+        print(f"{Cores.VERMELHO}❌ CSV não encontrado: {ARQUIVO_CSV}{Cores.RESET}")
+        return
+    indice = NutrientIndex.load(ARQUIVO_CSV)
+    por_100g = not args.per_serving
+    try:
+        if args.min is None and args.max is None:
+            linhas = indice.top(args.query, args.top, args.category, por_100g, ascending=args.ascending)
+            total = len(linhas)
+        else:
+            linhas = indice.range(args.query, args.min, args.max, args.category, por_100g)
+            total = len(linhas)
+            linhas = linhas[:args.top] if args.ascending else linhas[::-1][:args.top]
+        coluna = indice.column(args.query)
+    except KeyError as e:
+        sys.exit(f"main.py: erro: {e.args[0]}")
+    base = 'por porção' if args.per_serving else 'por 100 g'
+    print(f"\n{Cores.CIANO}{Cores.BOLD}🔎 {coluna} {base}"
+          f"{' em ' + args.category if args.category else ''}: {total} produtos{Cores.RESET}")
+    for linha in indice.rows(linhas, coluna, por_100g):
+        print(f"   {linha[coluna]:>9.2f}  {Cores.AMARELO}{linha['NOME_PRODUTO']}{Cores.RESET} "
+              f"({linha['CATEGORIA']}, porção {linha[PORCAO]:g} g)")
+
+def executar_reextracao(args):
+    """Extrai de novo as páginas arquivadas (versão mais recente de cada URL), sem acessar o site"""
+    from config.scraper import console, extract_from_html
+    import pandas as pd
+    desde = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    ate = datetime.fromisoformat(args.until).timestamp() if args.until else None
+    registros = archive.latest(desde, ate, args.url_contains)
+    if not registros:
+        print(f"{Cores.AMARELO}📄 Nenhuma página arquivada em {archive.path} para os filtros dados{Cores.RESET}")
+        return
+    if log_enabled('info'):
+        print(f"\n{Cores.CIANO}{Cores.BOLD}🗄  REEXTRAINDO {len(registros)} PÁGINAS DO ARQUIVO{Cores.RESET}")
+    console.quiet = not log_enabled('debug')
+    linhas, sem_dados = [], 0
+    timer.reset()
+    progress.start(len(registros), 'Páginas')
+    for registro, html in archive.pages(registros):
+        with timer.url(registro.url):
+            df = extract_from_html(html, registro.url)
+        if df is None:
+            sem_dados += 1
+            timer.mark_failed('sem dados')
+        else:
+            linhas.append(df)
+        progress.update(advance=1, detail=registro.url, failed=df is None)
+    progress.finish()
+    if linhas:
+        novos, total = save_incremental(pd.concat(linhas, ignore_index=True))
+        if log_enabled('info'):
+            print(f"{Cores.VERDE}✅ {novos} linhas reextraídas ({sem_dados} páginas sem dados). "
+                  f"Total no CSV: {total}{Cores.RESET}")
+    metrics.exporter.flush(force=True)
+    if timer.enabled:
+        timer.print_summary()
+
+def treinar_dicionario_arquivo():
+    """Treina o dicionário compartilhado de compactação com as páginas já arquivadas"""
+    ident = archive.train_dictionary()
+    if ident is None:
+        print(f"{Cores.AMARELO}📄 Páginas insuficientes em {archive.path} para treinar um dicionário{Cores.RESET}")
+        return
+    estatisticas = archive.stats()
+    print(f"{Cores.VERDE}✅ Dicionário {ident} treinado com {estatisticas['urls']} páginas; "
+          f"vale para os próximos registros{Cores.RESET}")
+
+def executar_shard(indice, total):
+    """Coleta só as URLs do shard indice/total, gravando em um CSV próprio"""
+    from config.sharding import select_shard
+    if not os.path.exists('dados/product_urls.json'):
+        print(f"{Cores.VERMELHO}❌ Arquivo de URLs não encontrado!{Cores.RESET}")
+        return
+    with open('dados/product_urls.json', 'r', encoding='utf-8') as f:
+        urls = json.load(f)
+    urls_shard = select_shard(urls, indice, total)
+    if log_enabled('info'):
+        print(f"\n{Cores.CIANO}{Cores.BOLD}🧩 SHARD {indice}/{total}: {len(urls_shard)} de {len(urls)} URLs "
+              f"→ {ARQUIVO_CSV}{Cores.RESET}")
+    timer.reset()
+    with profiler.run():
+        processar_urls(urls_shard, controller=novo_controlador())
+    metrics.QUEUE_DEPTH.set(0)
+    metrics.exporter.flush(force=True)
+    if timer.enabled:
+        timer.print_summary()
+
+def juntar_shards(total=None):
+    """Junta os CSVs de um conjunto completo de shards em dados/produtos.csv"""
+    from config.sharding import merge_shards
+    try:
+        linhas, arquivos = merge_shards(ARQUIVO_CSV, total)
+    except ValueError as e:
+        print(f"{Cores.VERMELHO}❌ Shards não combinados: {e}{Cores.RESET}")
+        return
+    if not arquivos:
+        print(f"{Cores.AMARELO}📄 Nenhum arquivo de shard encontrado para {ARQUIVO_CSV}{Cores.RESET}")
+        return
+    for arquivo in arquivos:
+        print(f"   • {Cores.AMARELO}{arquivo}{Cores.RESET}")
+    print(f"{Cores.VERDE}✅ {len(arquivos)} shards combinados: {linhas} linhas em {ARQUIVO_CSV}{Cores.RESET}")
+
+def executar_recrawl(args):
+    """Recoleta só as URLs com maior probabilidade de mudança, dentro do orçamento"""
+    from config.scheduler import RecrawlScheduler
+    if not os.path.exists('dados/product_urls.json'):
+        print(f"{Cores.VERMELHO}❌ Arquivo de URLs não encontrado!{Cores.RESET}")
+        return
+    scheduler = RecrawlScheduler(args.recrawl_state)
+    while True:
+        with open('dados/product_urls.json', 'r', encoding='utf-8') as f:
+            urls = json.load(f)
+        plano = scheduler.plan(urls, args.budget_requests, args.min_change_probability)
+        prazo = time.time() + args.budget_minutes * 60 if args.budget_minutes else None
+        if log_enabled('info'):
+            print(f"\n{Cores.CIANO}{Cores.BOLD}🔁 RECOLETA ADAPTATIVA: {len(plano)} de {len(urls)} URLs{Cores.RESET}")
+        if log_enabled('debug'):
+            for url, probabilidade in plano:
+                print(f"{Cores.AMARELO}{probabilidade:6.1%}{Cores.RESET} {url}")
+        mudancas = []
+        ultima_gravacao = time.monotonic()
+
+        def registrar(url, df):
+            nonlocal ultima_gravacao
+            if scheduler.record(url, df):
+                mudancas.append(url)
+            # O estado é um JSON único: regravá-lo a cada URL custaria O(N²) na rodada
+            if time.monotonic() - ultima_gravacao >= INTERVALO_ESTADO_RECOLETA:
+                scheduler.save()
+                ultima_gravacao = time.monotonic()
+
+        timer.reset()
+        try:
+            with profiler.run():
+                processar_urls([url for url, _ in plano], registrar, prazo, novo_controlador())
+        finally:
+            scheduler.save()
+        metrics.QUEUE_DEPTH.set(0)
+        metrics.exporter.flush(force=True)
+        if log_enabled('info'):
+            print(f"{Cores.VERDE}🏁 Rodada finalizada: {len(mudancas)} produtos com mudança{Cores.RESET}")
+        if timer.enabled:
+            timer.print_summary()
+        if not args.recrawl_interval:
+            break
+        time.sleep(args.recrawl_interval * 60)
+
+def executar_worker(args):
+    """Worker da fila compartilhada: pega lotes de URLs, extrai e grava o resultado na fila"""
+    from config.work_queue import WorkQueue, Heartbeat, default_worker_id
+    from config.scraper import extract_nutritional_info
+    from config.retry import RetryPolicy, ScrapeError, breaker_for
+    politica = RetryPolicy(TENTATIVAS)
+    fila = WorkQueue(args.queue, args.lease_seconds)
+    worker = args.worker_id or default_worker_id()
+    if os.path.exists('dados/product_urls.json'):
+        with open('dados/product_urls.json', 'r', encoding='utf-8') as f:
+            fila.load(json.load(f))
+    if log_enabled('info'):
+        print(f"\n{Cores.CIANO}{Cores.BOLD}👷 WORKER {worker}{Cores.RESET} {fila.stats()}")
+    estatisticas = fila.stats()
+    progress.start(sum(estatisticas.values()) - estatisticas['failed'], f'Worker {worker}')
+    progress.update(current=estatisticas['done'])
+    timer.reset()
+    try:
+        with Heartbeat(fila, worker), profiler.run():
+            while True:
+                lote = fila.lease(worker, args.lease_batch)
+                if not lote:
+                    break
+                for url in lote:
+                    with timer.url(url):
+                        try:
+                            with profiler.url(url):
+                                df = politica.call(lambda: extract_nutritional_info(url, raise_errors=True),
+                                                   url, breaker_for(url))
+                        except ScrapeError as erro:
+                            # Volta para a fila (até o limite de tentativas da fila)
+                            df = None
+                            fila.fail(url, worker, f"{erro.category}: {erro}")
+                            log_error(f"Falha em {url} ({erro.category}): {erro}")
+                        else:
+                            if df is None:
+                                timer.mark_failed('sem dados')
+                                fila.fail(url, worker, 'sem_dados')
+                                log_error(f"Nenhum dado extraído para: {url}")
+                            elif not fila.complete(url, worker, df):
+                                log_error(f"Concessão perdida, resultado descartado: {url}")
+                    metrics.QUEUE_DEPTH.set(fila.stats()['pending'])
+                    metrics.exporter.flush()
+                    memory.tick(url)
+                    progress.update(advance=1, detail=url, failed=df is None)
+    finally:
+        fila.release(worker)
+        progress.finish()
+        flush_error_log()
+    if log_enabled('info'):
+        print(f"{Cores.VERDE}🏁 Fila sem tarefas pendentes: {fila.stats()}{Cores.RESET}")
+    if timer.enabled:
+        timer.print_summary()
+
+def exportar_fila(args):
+    """Gera o CSV final a partir dos resultados gravados na fila"""
+    from config.work_queue import WorkQueue
+    fila = WorkQueue(args.queue, args.lease_seconds)
+    linhas = fila.export_csv(args.queue_export)
+    print(f"{Cores.VERDE}✅ {linhas} linhas exportadas para {args.queue_export}{Cores.RESET} {fila.stats()}")
 
 def listar_arquivos_gerados():
     print(f"\n{Cores.CIANO}{Cores.BOLD}📋 ARQUIVOS GERADOS{Cores.RESET}")
@@ -218,6 +769,7 @@ def executar_coleta_urls():
         print(f"{Cores.AMARELO}⏭️  Operação cancelada{Cores.RESET}")
         return
     mostrar_barra_progresso("Preparando coleta de URLs", 1.0)
+    from config.url_collector import collect_product_urls
     try:
         collect_product_urls()
         print(f"{Cores.VERDE}✅ Coleta de URLs concluída!{Cores.RESET}")
@@ -231,15 +783,167 @@ def executar_coleta_completa():
     if confirmar not in ['s', 'sim', 'y', 'yes']:
         print(f"{Cores.AMARELO}⏭️  Operação cancelada{Cores.RESET}")
         return
-    mostrar_barra_progresso("Coletando URLs", 1.0)
+    mostrar_barra_progresso("Iniciando descoberta e coleta em paralelo", 1.0)
+    executar_pipeline()
+
+def executar_pipeline():
+    """
+    Coleta completa em estágios: a descoberta de URLs alimenta o download e o
+    parsing dos produtos enquanto as próximas páginas da busca são lidas
+    """
+    from config.pipeline import Pipeline, Stage
+    from config.retry import RetryPolicy, breaker_for, classify
+    from config.scraper import fetch_product_html, extract_from_html
+    from config.url_collector import iter_product_urls, open_seen_urls, save_product_urls
+    politica = RetryPolicy(TENTATIVAS)
+    # descobertas: fila desta coleta (todas as URLs da busca), que vira a nova lista de URLs;
+    # nunca_vistas: as que ainda não estavam no conjunto persistente nem no JSON
+    descobertas, falhas, nunca_vistas = {}, {}, []
+    vistas = open_seen_urls()
+    # Kits confirmados não são baixados: as linhas saem da canônica ao final.
+    # Os pendentes são baixados junto com a canônica para a comparação.
+    kits, adiados, canonicas = None, [], {}
+    if CANONICALIZAR_KITS:
+        import threading
+        from config.canonical import CanonicalIndex
+        kits = CanonicalIndex(ARQUIVO_CANONICOS)
+        # resolve() roda na descoberta e record() na gravação, em threads diferentes
+        trava_kits = threading.Lock()
+    progress.start(0, 'Produtos')
+    pool = None
+    if PARSE_ENGINE == 'process':
+        # Parsing (BeautifulSoup + regex) é CPU: processos escapam do GIL.
+        # 'spawn' evita herdar locks das threads do pipeline via fork.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from config.scraper import init_parse_worker, parse_to_records
+        pool = ProcessPoolExecutor(PARSE_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=init_parse_worker)
+    if FETCH_ENGINE == 'http':
+        from config.fetcher import fetch_html, raise_for_status
+
+    def descobrir():
+        for pagina in iter_product_urls(show_progress=False):
+            novas = [url for url in pagina if url not in descobertas]
+            descobertas.update(dict.fromkeys(novas))
+            ineditas = [url for url in novas if vistas.add(url)]
+            nunca_vistas.extend(ineditas)
+            metrics.NEW_URLS.inc(len(ineditas))
+            if kits is not None:
+                with trava_kits:
+                    # Com a lista acumulada, um produto base que aparece numa página
+                    # posterior ainda vira a canônica dos kits já descobertos
+                    mapa = kits.resolve(descobertas)
+                    confirmados = {url for url in novas if url in mapa and kits.kits[url]['status'] == 'confirmed'}
+                adiados.extend(confirmados)
+                novas = [url for url in novas if url not in confirmados]
+            progress.update(total=len(descobertas) - len(adiados))
+            yield from novas
+
+    def baixar_http(url):
+        resposta = fetch_html(url)
+        raise_for_status(resposta)
+        metrics.PAGES_FETCHED.inc(kind='product')
+        metrics.BYTES_FETCHED.inc(resposta.size, kind='product')
+        archive.add(url, resposta.html)
+        return resposta.html
+
+    def baixar(url):
+        funcao = baixar_http if FETCH_ENGINE == 'http' else fetch_product_html
+        return url, politica.call(lambda: funcao(url), url, breaker_for(url))
+
+    def extrair(item):
+        url, html = item
+        if pool is not None:
+            with timer.stage('parse_process'):
+                registros = pool.submit(parse_to_records, html.encode('utf-8'), url).result()
+            import pandas as pd
+            df = pd.DataFrame(registros) if registros else None
+        else:
+            df = extract_from_html(html, url)
+        if df is None:
+            falhas[url] = {'url': url, 'category': 'sem_dados', 'error': ''}
+            log_error(f"Nenhum dado extraído para: {url}")
+            progress.update(advance=1, failed=True)
+            return None
+        return url, df
+
+    def gravar(item):
+        url, df = item
+        with timer.stage('save_csv'):
+            save_incremental(df)
+        if kits is not None:
+            with trava_kits:
+                kits.record(url, df)
+            canonicas[url] = df
+        progress.update(advance=1, detail=df['NOME_PRODUTO'].iloc[0] if 'NOME_PRODUTO' in df.columns else url)
+        metrics.exporter.flush()
+        memory.tick(url)
+
+    def ao_falhar(estagio, item, erro):
+        url = item[0] if isinstance(item, tuple) else item
+        erro = classify(erro, url)
+        falhas[url] = {'url': url, 'category': erro.category, 'error': str(erro)}
+        log_error(f"Falha no estágio {estagio.nome} para {url} ({erro.category}): {erro}")
+        progress.update(advance=1, failed=True)
+
+    pipeline = Pipeline(descobrir, [
+        Stage('download', baixar, workers=FETCH_WORKERS, maxsize=FETCH_WORKERS * 2),
+        Stage('parsing', extrair, workers=PARSE_WORKERS, maxsize=PARSE_WORKERS * 2),
+        Stage('gravacao', gravar, workers=1, maxsize=32),
+    ], on_error=ao_falhar)
+    anterior = guardar_snapshot()
+    timer.reset()
+    # Só uma descoberta completa permite dizer que um produto sumiu da loja
+    completa = False
     try:
-        collect_product_urls()
-        print(f"{Cores.VERDE}✅ URLs coletadas!{Cores.RESET}")
+        with profiler.run():
+            pipeline.run()
+        completa = True
     except Exception as e:
         print(f"{Cores.VERMELHO}❌ Erro ao coletar URLs: {e}{Cores.RESET}")
-        return
-    mostrar_barra_progresso("Coletando dados nutricionais", 1.0)
-    executar_scraping_incremental()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        progress.finish()
+        if kits is not None:
+            derivar_kits(kits, adiados, canonicas, falhas)
+        if completa and descobertas:
+            # Busca interrompida não substitui a lista (perderia as URLs não alcançadas)
+            save_product_urls(list(descobertas))
+        vistas.save()
+        vistas.close()
+        salvar_falhas(list(falhas.values()), descobertas)
+        metrics.exporter.flush(force=True)
+        flush_error_log()
+    pipeline.print_summary()
+    validar_saida()
+    relatorio_mudancas(anterior, urls=list(descobertas) if completa and descobertas else None)
+    if log_enabled('info'):
+        print(f"\n{Cores.VERDE}🏁 Coleta completa finalizada: {len(descobertas)} URLs ({len(nunca_vistas)} nunca vistas), "
+              f"{len(falhas)} falhas{Cores.RESET}")
+    if timer.enabled:
+        timer.print_summary()
+
+def derivar_kits(kits, adiados, canonicas, falhas):
+    """Grava as linhas dos kits não baixados a partir das canônicas coletadas"""
+    linhas = []
+    for kit in adiados:
+        canonica = kits.kits[kit]['canonical']
+        df_kit = kits.derive(kit, canonicas[canonica]) if canonica in canonicas else None
+        if df_kit is None:
+            # Canônica ausente ou com impressão digital nova: o kit precisa ser baixado
+            falhas[kit] = {'url': kit, 'category': 'kit_pendente', 'error': f"produto base {canonica}"}
+            continue
+        linhas.append(df_kit)
+        metrics.KITS_DERIVED.inc()
+    if linhas:
+        import pandas as pd
+        with timer.stage('save_csv'):
+            save_incremental(pd.concat(linhas, ignore_index=True))
+    kits.save()
+    if adiados and log_enabled('info'):
+        print(f"{Cores.AZUL}🧩 {len(linhas)} de {len(adiados)} kits derivados do produto base, sem download{Cores.RESET}")
 
 def coletar_10_urls_primeira_pagina():
     from config.browser import get_browser_driver
@@ -247,7 +951,6 @@ def coletar_10_urls_primeira_pagina():
     search_url = f"{base_url}/advanced_search_result.php?keywords=Pura%20Vida"
     driver, browser_name = get_browser_driver(headless=True)
     driver.get(search_url)
-    import time
     time.sleep(2)
     html = driver.page_source
     from bs4 import BeautifulSoup
@@ -281,6 +984,7 @@ def executar_teste_10_produtos():
         return
     mostrar_barra_progresso("Coletando dados dos 10 produtos", 1.0)
     import pandas as pd
+    from config.scraper import extract_nutritional_info
     df_total = pd.DataFrame()
     for i, url in enumerate(urls_teste, 1):
         print(f"{Cores.AMARELO}({i}/10) {Cores.BRANCO}Processando:{Cores.RESET} {url}")
@@ -321,5 +1025,194 @@ def main():
             print(f"\n{Cores.VERMELHO}❌ Opção inválida! Tente novamente.{Cores.RESET}")
         pausar()
 
+def _concorrencia(valor):
+    if valor == 'auto' or (valor.isdigit() and int(valor) >= 1):
+        return valor.lstrip('0') or valor
+    raise argparse.ArgumentTypeError("use um inteiro >= 1 ou 'auto'")
+
+def _positivo(valor):
+    if valor.isdigit() and int(valor) >= 1:
+        return int(valor)
+    raise argparse.ArgumentTypeError("use um inteiro >= 1")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping Pura Vida - coleta de dados nutricionais")
+    parser.add_argument('--timing', action='store_true',
+                        help='Mede cada etapa por URL e mostra p50/p95/p99 ao final da coleta')
+    parser.add_argument('--timing-file', default='dados/timings.jsonl',
+                        help='Arquivo JSON-lines com os eventos por URL (padrão: dados/timings.jsonl)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Expõe métricas Prometheus em http://127.0.0.1:<porta>/metrics')
+    parser.add_argument('--metrics-file',
+                        help='Grava métricas Prometheus neste arquivo (textfile collector)')
+    parser.add_argument('--profile', nargs='?', const='slowest', choices=['run', 'slowest'],
+                        help='Profiling de extract_nutritional_info: a coleta inteira (run) '
+                             'ou só as N URLs mais lentas (slowest, padrão). Saída em dados/profiles/')
+    parser.add_argument('--profile-top', type=_positivo, default=5,
+                        help='Quantidade de URLs mais lentas mantidas com --profile slowest (padrão: 5)')
+    parser.add_argument('--profile-engine', choices=['cprofile', 'sampling'], default='cprofile',
+                        help='cprofile (.pstats + .collapsed) ou sampling (.collapsed, menor overhead)')
+    parser.add_argument('--memory', type=int, metavar='N',
+                        help='Snapshot de memória (tracemalloc + RSS do processo e do navegador) a cada N URLs')
+    parser.add_argument('--memory-ceiling-mb', type=float,
+                        help='Avisa quando o RSS crescer mais do que este valor durante a coleta')
+    parser.add_argument('--concurrency', default='1', type=_concorrencia,
+                        help="URLs processadas em paralelo: N fixo ou 'auto' (AIMD guiado por latência, 429/5xx, "
+                             "timeouts e falhas do driver; o navegador não expõe o Retry-After)")
+    parser.add_argument('--max-concurrency', type=_positivo, default=MAX_CONCORRENCIA,
+                        help=f'Teto do modo --concurrency auto (padrão: {MAX_CONCORRENCIA})')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Sem menu: coleta completa em estágios (descoberta, download, parsing e gravação em paralelo)')
+    parser.add_argument('--fetch-workers', type=_positivo, default=FETCH_WORKERS,
+                        help=f'Threads de download na coleta completa (padrão: {FETCH_WORKERS})')
+    parser.add_argument('--parse-workers', type=_positivo, default=PARSE_WORKERS,
+                        help=f'Workers de parsing na coleta completa (padrão: {PARSE_WORKERS})')
+    parser.add_argument('--fetch-engine', choices=['selenium', 'http'], default=FETCH_ENGINE,
+                        help='Download na coleta completa: navegador ou HTTP simples (páginas renderizadas no servidor)')
+    parser.add_argument('--parse-engine', choices=['thread', 'process'], default=PARSE_ENGINE,
+                        help='Parsing na coleta completa: threads ou um processo por worker (escala com os núcleos)')
+    parser.add_argument('--shard', metavar='I/N',
+                        help='Sem menu: coleta só o shard I de N (hash estável da URL) em um CSV próprio')
+    parser.add_argument('--merge-shards', nargs='?', const=True, type=_positivo, metavar='N',
+                        help='Junta dados/produtos.shard-*-of-N.csv (conjunto completo) em dados/produtos.csv e sai')
+    parser.add_argument('--no-kit-canonicalization', dest='kit_canonicalization', action='store_false',
+                        help='Baixa todos os kits, sem derivá-los do produto base confirmado')
+    parser.add_argument('--canonical-index', default=ARQUIVO_CANONICOS,
+                        help=f'Índice de kits e produtos canônicos (padrão: {ARQUIVO_CANONICOS})')
+    parser.add_argument('--retries', type=int, default=TENTATIVAS,
+                        help=f'Tentativas por URL em falhas transitórias (padrão: {TENTATIVAS})')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help=f'Sem menu: processa só as URLs que falharam na última coleta ({ARQUIVO_FALHAS})')
+    parser.add_argument('--validate', action='store_true',
+                        help=f'Sem menu: confere a plausibilidade do CSV e gera a fila de recoleta ({ARQUIVO_RECOLETA})')
+    parser.add_argument('--rescrape', action='store_true',
+                        help='Sem menu: recoleta só as páginas suspeitas da fila de recoleta')
+    parser.add_argument('--max-rescrapes', type=int, default=MAX_RECOLETAS,
+                        help=f'Recoletas por página antes de sair da fila (padrão: {MAX_RECOLETAS})')
+    parser.add_argument('--browser-profile', nargs='?', const='dados/browser_profile', metavar='DIR',
+                        help='Perfil persistente do navegador (cache de JS/CSS/fontes entre drivers; '
+                             'drivers em paralelo usam cópias DIR.worker-N). Padrão: dados/browser_profile')
+    parser.add_argument('--archive', nargs='?', const='dados/archive', metavar='DIR',
+                        help='Guarda cada página baixada no arquivo compactado DIR (padrão: dados/archive); '
+                             'com --reextract/--archive-train, o arquivo lido')
+    parser.add_argument('--reextract', action='store_true',
+                        help='Sem menu: extrai de novo as páginas do arquivo para o CSV, sem acessar o site')
+    parser.add_argument('--since', help='--reextract: só páginas arquivadas a partir desta data (ISO, ex.: 2025-01-31)')
+    parser.add_argument('--until', help='--reextract: versão de cada página vigente nesta data (ISO)')
+    parser.add_argument('--url-contains', help='--reextract: só URLs que contenham este trecho')
+    parser.add_argument('--archive-train', action='store_true',
+                        help='Sem menu: treina o dicionário de compactação com as páginas arquivadas')
+    parser.add_argument('--diff', nargs='+', metavar='CSV',
+                        help='Sem menu: compara dois CSVs (ANTIGO [NOVO], padrão NOVO = CSV de saída) '
+                             f'e grava as mudanças em {ARQUIVO_DIFF}')
+    parser.add_argument('--diff-report', default=ARQUIVO_DIFF,
+                        help=f'Relatório de mudanças (padrão: {ARQUIVO_DIFF})')
+    parser.add_argument('--query', metavar='NUTRIENTE',
+                        help='Sem menu: consulta o CSV por nutriente (ex.: proteinas, sodio, "SODIO (mg)")')
+    parser.add_argument('--top', type=_positivo, default=10,
+                        help='Produtos exibidos por --query (padrão: 10)')
+    parser.add_argument('--min', type=float, help='--query: valor mínimo do nutriente')
+    parser.add_argument('--max', type=float, help='--query: valor máximo do nutriente')
+    parser.add_argument('--category', help='--query: só produtos desta categoria')
+    parser.add_argument('--per-serving', action='store_true',
+                        help='--query: valores por porção em vez de por 100 g')
+    parser.add_argument('--ascending', action='store_true',
+                        help='--query: menores valores primeiro')
+    parser.add_argument('--recrawl', action='store_true',
+                        help='Sem menu: recoleta só as URLs com maior probabilidade de mudança')
+    parser.add_argument('--budget-requests', type=int,
+                        help='Máximo de URLs por rodada de --recrawl')
+    parser.add_argument('--budget-minutes', type=float,
+                        help='Tempo máximo por rodada de --recrawl')
+    parser.add_argument('--min-change-probability', type=float, default=0.0,
+                        help='Ignora URLs com probabilidade de mudança abaixo deste valor (0-1)')
+    parser.add_argument('--recrawl-interval', type=float, metavar='MIN',
+                        help='Modo daemon: repete a recoleta a cada MIN minutos')
+    parser.add_argument('--recrawl-state', default='dados/recrawl_state.json',
+                        help='Histórico de mudanças por URL (padrão: dados/recrawl_state.json)')
+    parser.add_argument('--worker', action='store_true',
+                        help='Sem menu: processa URLs da fila compartilhada (vários processos/máquinas)')
+    parser.add_argument('--queue', default='dados/work_queue.db',
+                        help='Arquivo SQLite da fila compartilhada (padrão: dados/work_queue.db)')
+    parser.add_argument('--worker-id', help='Identificador do worker (padrão: <host>-<pid>)')
+    parser.add_argument('--lease-seconds', type=float, default=300.0,
+                        help='Prazo da concessão; URLs de workers sem heartbeat voltam à fila depois disso')
+    parser.add_argument('--lease-batch', type=_positivo, default=5,
+                        help='URLs concedidas por vez a cada worker')
+    parser.add_argument('--queue-export', metavar='CSV',
+                        help='Gera o CSV final a partir dos resultados da fila e sai')
+    parser.add_argument('--log-level', choices=list(LOG_LEVELS), default='info',
+                        help='quiet (nada), error (só erros), info (etapas + barra de progresso, padrão) '
+                             'ou debug (detalhes de cada URL)')
+    parser.add_argument('-q', '--quiet', dest='log_level', action='store_const', const='quiet',
+                        help='Atalho para --log-level quiet')
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = parse_args()
+    set_log_level(args.log_level)
+    CONCORRENCIA, MAX_CONCORRENCIA = args.concurrency, args.max_concurrency
+    TENTATIVAS = max(1, args.retries)
+    FETCH_WORKERS, PARSE_WORKERS = max(1, args.fetch_workers), max(1, args.parse_workers)
+    FETCH_ENGINE, PARSE_ENGINE = args.fetch_engine, args.parse_engine
+    CANONICALIZAR_KITS, ARQUIVO_CANONICOS = args.kit_canonicalization, args.canonical_index
+    MAX_RECOLETAS = max(1, args.max_rescrapes)
+    ARQUIVO_DIFF = args.diff_report
+    if args.diff and len(args.diff) > 2:
+        sys.exit("main.py: erro: --diff recebe no máximo dois CSVs (ANTIGO [NOVO])")
+    if args.shard:
+        from config.sharding import parse_shard, shard_path
+        try:
+            SHARD = parse_shard(args.shard)
+        except ValueError as e:
+            sys.exit(f"main.py: erro: {e}")
+        ARQUIVO_CSV = shard_path(ARQUIVO_CSV, *SHARD)
+        ARQUIVO_FALHAS = shard_path(ARQUIVO_FALHAS, *SHARD)
+        ARQUIVO_CANONICOS = shard_path(ARQUIVO_CANONICOS, *SHARD)
+        ARQUIVO_RECOLETA = shard_path(ARQUIVO_RECOLETA, *SHARD)
+    if args.browser_profile:
+        from config.profiles import profiles
+        profiles.enable(shard_path(args.browser_profile, *SHARD) if args.shard else args.browser_profile)
+    if args.archive:
+        archive.enable(shard_path(args.archive, *SHARD) if args.shard else args.archive)
+    if args.timing:
+        timer.enable(args.timing_file)
+    if args.profile:
+        profiler.enable(args.profile, args.profile_engine, args.profile_top)
+    if args.memory:
+        memory.enable(args.memory, ceiling_mb=args.memory_ceiling_mb)
+    if args.metrics_port:
+        metrics.exporter.serve(args.metrics_port)
+    if args.metrics_file:
+        metrics.exporter.enable_textfile(args.metrics_file)
+    try:
+        if args.merge_shards:
+            juntar_shards(None if args.merge_shards is True else args.merge_shards)
+        elif args.pipeline:
+            executar_pipeline()
+        elif args.shard:
+            executar_shard(*SHARD)
+        elif args.queue_export:
+            exportar_fila(args)
+        elif args.worker:
+            executar_worker(args)
+        elif args.retry_failed:
+            executar_reprocessamento_falhas()
+        elif args.reextract:
+            executar_reextracao(args)
+        elif args.archive_train:
+            treinar_dicionario_arquivo()
+        elif args.diff:
+            relatorio_mudancas(*args.diff)
+        elif args.query:
+            executar_consulta(args)
+        elif args.validate:
+            validar_saida()
+        elif args.rescrape:
+            executar_recoleta_suspeitas()
+        elif args.recrawl:
+            executar_recrawl(args)
+        else:
+            main()
+    finally:
+        metrics.exporter.shutdown() 
\ No newline at end of file